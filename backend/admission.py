@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+
+logger = logging.getLogger("admission")
+
+# Every key shares the {admission} hash tag, so the scripts below, which touch
+# ticket keys they build themselves, stay on one slot of a Redis Cluster.
+ACTIVE_KEY = "{admission}:active"    # ZSET room -> lease expiry (ms, Redis clock)
+QUEUE_KEY = "{admission}:queue"      # LIST of ticket ids, oldest first
+TICKET_PREFIX = "{admission}:ticket:"  # HASH name, room, status; expires unless polled
+RATE_PREFIX = "ratelimit:"           # HASH tokens, ts per identity
+
+
+#----------------------------Lua scripts--------------------------------
+# Shared by the scripts that can free or take a slot: drop expired leases, then
+# admit waiting tickets in FIFO order while there is room. Tickets whose key
+# expired (the candidate stopped polling) are skipped.
+_DISPATCH = """
+local function now_ms()
+    local t = redis.call('TIME')
+    return tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+end
+
+local function dispatch(active, queue, prefix, cap, lease, now)
+    redis.call('ZREMRANGEBYSCORE', active, '-inf', now)
+    while redis.call('ZCARD', active) < cap do
+        local ticket = redis.call('LPOP', queue)
+        if not ticket then break end
+        local room = redis.call('HGET', prefix .. ticket, 'room')
+        if room then
+            redis.call('HSET', prefix .. ticket, 'status', 'admitted')
+            redis.call('ZADD', active, now + lease, room)
+        end
+    end
+end
+"""
+
+# KEYS: bucket. ARGV: rate (tokens/s), burst. Returns {allowed, retry_after}.
+TOKEN_BUCKET = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed, retry = 0, 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(retry)}
+"""
+
+# KEYS: active, queue. ARGV: prefix, cap, lease, rooms... Takes a slot for every
+# room, all or none, and only when nobody is waiting. A room that already holds
+# a slot (a rejoin) needs no new one. Returns 1 when admitted.
+ADMIT = _DISPATCH + """
+local now = now_ms()
+local cap, lease = tonumber(ARGV[2]), tonumber(ARGV[3])
+dispatch(KEYS[1], KEYS[2], ARGV[1], cap, lease, now)
+local new = {}
+for i = 4, #ARGV do
+    if not redis.call('ZSCORE', KEYS[1], ARGV[i]) then table.insert(new, ARGV[i]) end
+end
+if #new == 0 then return 1 end
+if redis.call('LLEN', KEYS[2]) > 0 or redis.call('ZCARD', KEYS[1]) + #new > cap then return 0 end
+for _, room in ipairs(new) do redis.call('ZADD', KEYS[1], now + lease, room) end
+return 1
+"""
+
+# KEYS: active, queue. ARGV: prefix, cap, lease, ticket ttl, ticket, name, room.
+ENQUEUE = _DISPATCH + """
+local key = ARGV[1] .. ARGV[5]
+redis.call('HSET', key, 'name', ARGV[6], 'room', ARGV[7], 'status', 'waiting')
+redis.call('EXPIRE', key, tonumber(ARGV[4]))
+redis.call('RPUSH', KEYS[2], ARGV[5])
+dispatch(KEYS[1], KEYS[2], ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), now_ms())
+"""
+
+# KEYS: active, queue. ARGV: prefix, cap, lease, ticket ttl, ticket. Keeps the
+# ticket alive and returns {status, name, room, position}; {} when it is gone.
+POLL = _DISPATCH + """
+local key = ARGV[1] .. ARGV[5]
+if redis.call('EXISTS', key) == 0 then return {} end
+redis.call('EXPIRE', key, tonumber(ARGV[4]))
+dispatch(KEYS[1], KEYS[2], ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), now_ms())
+local ticket = redis.call('HMGET', key, 'status', 'name', 'room')
+local position = 0
+if ticket[1] == 'waiting' then
+    position = (redis.call('LPOS', KEYS[2], ARGV[5]) or 0) + 1
+end
+return {ticket[1], ticket[2], ticket[3], position}
+"""
+
+# KEYS: active, queue. ARGV: prefix, cap, lease, rooms... Frees the rooms' slots
+# and hands them to the queue.
+RELEASE = _DISPATCH + """
+for i = 4, #ARGV do redis.call('ZREM', KEYS[1], ARGV[i]) end
+dispatch(KEYS[1], KEYS[2], ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), now_ms())
+"""
+
+# KEYS: bucket. ARGV: burst. Gives back the token a request took.
+REFUND = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(tonumber(ARGV[1]), tokens + 1)))
+end
+"""
+
+# KEYS: active, queue. ARGV: prefix, cap, lease, ticket. Drops the ticket; an
+# admitted one frees its slot for the next in line.
+LEAVE = _DISPATCH + """
+local key = ARGV[1] .. ARGV[4]
+local ticket = redis.call('HMGET', key, 'room', 'status')
+redis.call('LREM', KEYS[2], 0, ARGV[4])
+redis.call('DEL', key)
+if ticket[1] and ticket[2] == 'admitted' then redis.call('ZREM', KEYS[1], ticket[1]) end
+dispatch(KEYS[1], KEYS[2], ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), now_ms())
+"""
+
+# KEYS: active. ARGV: lease, rooms... Makes every room hold a slot until at least
+# now + lease, taking one for rooms that have none (even past the cap: they are
+# already in use). Longer leases are kept.
+HOLD = """
+local t = redis.call('TIME')
+local expiry = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000) + tonumber(ARGV[1])
+for i = 2, #ARGV do
+    local current = tonumber(redis.call('ZSCORE', KEYS[1], ARGV[i]))
+    if not current or current < expiry then redis.call('ZADD', KEYS[1], expiry, ARGV[i]) end
+end
+"""
+
+
+@dataclass(frozen=True)
+class RateDecision:
+    allowed: bool
+    retry_after: float
+
+
+@dataclass(frozen=True)
+class Ticket:
+    id: str
+    status: str          # "waiting" or "admitted"
+    name: str
+    room: str
+    position: int = 0    # 1-based place in the queue while waiting
+
+
+class AdmissionController:
+    """
+    Decides who may start an interview, with all state in Redis so every
+    backend process shares it.
+
+    - Each identity has a token bucket of `burst` requests refilled at `rate`
+      per second; an empty bucket means retry later.
+    - At most `max_interviews` rooms hold a slot at once. A slot is a lease
+      of `join_lease` seconds to get the interview going; rooms nobody joins
+      lose it when it runs out. Rooms LiveKit reports in use are kept alive
+      (refer: in_use), a started room holds it for `room_lease` and a
+      finished one frees it (refer: started, release, from LiveKit's webhook).
+    - When every slot is taken candidates wait in a FIFO queue of tickets.
+      Freed slots go to the oldest ticket that is still being polled.
+    """
+
+    def __init__(
+        self,
+        redis,
+        max_interviews: int = 20,
+        rate: float = 0.2,
+        burst: int = 5,
+        join_lease: float = 120.0,
+        room_lease: float = 2 * 60 * 60,
+        ticket_ttl: float = 30.0,
+        poll_interval: float = 0.25,
+    ):
+        self._redis = redis
+        self.max_interviews = max_interviews
+        self._rate = rate
+        self._burst = burst
+        self._join_lease_ms = int(join_lease * 1000)
+        self._room_lease_ms = int(room_lease * 1000)
+        self._ticket_ttl = int(ticket_ttl)
+        self._poll_interval = poll_interval
+        self._token_bucket = redis.register_script(TOKEN_BUCKET)
+        self._admit = redis.register_script(ADMIT)
+        self._enqueue = redis.register_script(ENQUEUE)
+        self._poll = redis.register_script(POLL)
+        self._release = redis.register_script(RELEASE)
+        self._refund = redis.register_script(REFUND)
+        self._leave = redis.register_script(LEAVE)
+        self._hold = redis.register_script(HOLD)
+
+    def _slot_args(self) -> list:
+        return [TICKET_PREFIX, self.max_interviews, self._join_lease_ms]
+
+    async def check_rate(self, identity: str) -> RateDecision:
+        allowed, retry_after = await self._token_bucket(
+            keys=[RATE_PREFIX + identity], args=[self._rate, self._burst]
+        )
+        return RateDecision(bool(int(allowed)), float(retry_after))
+
+    async def refund(self, identity: str) -> None:
+        """Give back the token of a request that was turned away anyway."""
+        await self._refund(keys=[RATE_PREFIX + identity], args=[self._burst])
+
+    async def admit(self, *rooms: str) -> bool:
+        """Take a slot for each room at once, unless that would pass the cap or
+        jump the queue. Rooms that already hold one are let through."""
+        return bool(await self._admit(keys=[ACTIVE_KEY, QUEUE_KEY], args=self._slot_args() + list(rooms)))
+
+    async def enqueue(self, name: str, room: str) -> Ticket:
+        """Queue `name` for `room`; admitted straight away if a slot is free."""
+        ticket = uuid.uuid4().hex
+        await self._enqueue(
+            keys=[ACTIVE_KEY, QUEUE_KEY],
+            args=self._slot_args() + [self._ticket_ttl, ticket, name, room],
+        )
+        return await self.poll(ticket)
+
+    async def poll(self, ticket: str, wait: float = 0.0) -> Ticket | None:
+        """
+        The ticket's state, None once it expired. Polling keeps it in the queue.
+        With `wait`, holds on for up to that many seconds until it is admitted.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while True:
+            state = await self._poll(
+                keys=[ACTIVE_KEY, QUEUE_KEY],
+                args=self._slot_args() + [self._ticket_ttl, ticket],
+            )
+            if not state:
+                return None
+            status, name, room, position = state
+            if status == "admitted" or loop.time() >= deadline:
+                return Ticket(ticket, status, name, room, int(position))
+            await asyncio.sleep(min(self._poll_interval, max(0.0, deadline - loop.time())))
+
+    async def leave(self, ticket: str) -> None:
+        """Give up a ticket; an admitted one frees its slot."""
+        await self._leave(keys=[ACTIVE_KEY, QUEUE_KEY], args=self._slot_args() + [ticket])
+
+    async def started(self, room: str) -> None:
+        """The room is live: hold its slot for the length of an interview."""
+        await self._hold(keys=[ACTIVE_KEY], args=[self._room_lease_ms, room])
+
+    async def in_use(self, *rooms: str) -> None:
+        """Someone is in these rooms: keep their slots for another `join_lease`.
+        Called more often than that, it holds them for as long as they are in use."""
+        if rooms:
+            await self._hold(keys=[ACTIVE_KEY], args=[self._join_lease_ms] + list(rooms))
+
+    async def release(self, *rooms: str) -> None:
+        await self._release(keys=[ACTIVE_KEY, QUEUE_KEY], args=self._slot_args() + list(rooms))
+
+    async def stats(self) -> dict:
+        # Expired leases still count here until the next script drops them
+        active, waiting = await asyncio.gather(self._redis.zcard(ACTIVE_KEY), self._redis.llen(QUEUE_KEY))
+        return {"active": active, "waiting": waiting, "capacity": self.max_interviews}
@@ -0,0 +1,106 @@
+"""
+Tokens/sec for /getToken against a local stub LiveKit server.
+
+"before" replays the old per-request path (new LiveKitAPI client + list_rooms
+on every token), "after" drives the real FastAPI app in-process.
+
+Admission control is off (ADMISSION_ENABLED=false) on this side too, as the
+old path had none; its cost under load is measured by
+benchmarks/load_test_admission.py.
+
+Run from the backend folder (needs httpx on top of the backend requirements):
+    python benchmarks/bench_get_token.py --requests 2000 --concurrency 50 --rooms 500
+
+Pass --repeat-identities N to spread the requests over N (identity, room)
+pairs, which is what refreshing dashboards look like to the token cache.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+import httpx
+from livekit.api import LiveKitAPI, ListRoomsRequest, AccessToken, VideoGrants
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import API_KEY, API_SECRET, start_stub_livekit
+
+
+#----------------------------Old request path----------------------------------
+async def legacy_get_token(url: str, name: str) -> str:
+    api = LiveKitAPI(url, API_KEY, API_SECRET)
+    resp = await api.room.list_rooms(ListRoomsRequest())
+    await api.aclose()
+    existing = {room.name for room in resp.rooms}
+    while True:
+        room = f"room-{uuid.uuid4().hex[:8]}"
+        if room not in existing:
+            break
+    return (
+        AccessToken(API_KEY, API_SECRET)
+        .with_identity(name)
+        .with_name(name)
+        .with_grants(VideoGrants(room_join=True, room=room))
+        .to_jwt()
+    )
+
+
+async def run(total: int, concurrency: int, call) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with sem:
+            await call(f"candidate-{i}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def main(args):
+    runner, url, stats = await start_stub_livekit(args.rooms)
+    os.environ["LIVEKIT_URL"] = url
+    os.environ["LIVEKIT_API_KEY"] = API_KEY
+    os.environ["LIVEKIT_API_SECRET"] = API_SECRET
+    os.environ["ADMISSION_ENABLED"] = "false"
+
+    try:
+        before = await run(args.requests, args.concurrency, lambda n: legacy_get_token(url, n))
+        before_calls = stats["list_rooms"]
+
+        stats["list_rooms"] = 0
+        from server import app
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+                async def call(name: str):
+                    params = {"name": name}
+                    if args.repeat_identities:
+                        slot = int(name.rsplit("-", 1)[1]) % args.repeat_identities
+                        params = {"name": f"candidate-{slot}", "room": f"slot-{slot}"}
+                    resp = await client.get("/getToken", params=params)
+                    resp.raise_for_status()
+
+                after = await run(args.requests, args.concurrency, call)
+        after_calls = stats["list_rooms"]
+    finally:
+        await runner.cleanup()
+
+    print(f"rooms on server : {args.rooms}")
+    print(f"before          : {before:10.1f} tokens/sec  ({before_calls} list_rooms calls)")
+    print(f"after           : {after:10.1f} tokens/sec  ({after_calls} list_rooms calls)")
+    print(f"speedup         : {after / before:10.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--repeat-identities", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
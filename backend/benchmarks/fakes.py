@@ -0,0 +1,42 @@
+"""
+Stand-ins shared by the backend benchmarks: a stub LiveKit server that only
+answers ListRooms, and the Redis the admission controller runs on.
+"""
+from aiohttp import web
+from livekit.protocol.models import Room
+from livekit.protocol.room import ListRoomsResponse
+
+API_KEY = "devkey"
+API_SECRET = "devsecret-devsecret-devsecret-devsecret"
+
+
+async def start_stub_livekit(num_rooms: int) -> tuple[web.AppRunner, str, dict]:
+    """Serves `num_rooms` empty rooms; returns the runner, its URL and call counts."""
+    stats = {"list_rooms": 0}
+    body = ListRoomsResponse(
+        rooms=[Room(name=f"room-{i:08x}") for i in range(num_rooms)]
+    ).SerializeToString()
+
+    async def list_rooms(request: web.Request) -> web.Response:
+        stats["list_rooms"] += 1
+        return web.Response(body=body, content_type="application/protobuf")
+
+    stub = web.Application()
+    stub.router.add_post("/twirp/livekit.RoomService/ListRooms", list_rooms)
+    runner = web.AppRunner(stub)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", stats
+
+
+async def make_redis(url: str | None):
+    """A real Redis at `url` (flushed first), fakeredis without one."""
+    if url:
+        import redis.asyncio as redis
+        client = redis.from_url(url, decode_responses=True)
+        await client.flushdb()
+        return client
+    from fakeredis import FakeAsyncRedis
+    return FakeAsyncRedis(decode_responses=True)
@@ -0,0 +1,252 @@
+"""
+Join latency under overload, with and without admission control.
+
+Candidates arrive faster than the agent workers can interview them. A fake
+agent pool with --capacity slots picks up rooms the way LiveKit dispatch does
+when workers are full: any pending room may get the next free agent, and a
+room nobody picks up within --dispatch-timeout is abandoned; the candidate
+reloads after --reload-delay and asks for a new token. Finished interviews
+are reported back to the backend through its LiveKit webhook.
+
+"no admission" runs the app with an unlimited cap, which is how /getToken
+behaved before: every candidate gets a room at once and waits in it.
+"admission" caps concurrent interviews at --capacity: the rest wait in the
+FIFO queue (POST /queue, long-polled GET /queue/{ticket}) until a slot frees.
+
+Join latency is arrival -> an agent picked up the candidate's room, across
+reloads. A share of the candidates (--refreshers) reload their page
+--refreshes times right after getting a token, which the per-identity token
+bucket answers with 429s.
+
+Run from the backend folder (needs httpx and fakeredis[lua] on top of the
+backend requirements; pass --redis-url to use a real, empty Redis instead):
+    python benchmarks/load_test_admission.py --capacity 20 --arrival-rate 12 --duration 8
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import httpx
+from livekit.api import AccessToken
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import API_KEY, API_SECRET, make_redis, start_stub_livekit
+
+UNLIMITED = 10 ** 9
+
+
+#----------------------------Fake agent workers--------------------------------
+class FakeAgentPool:
+    """`capacity` agents; each free agent takes a random pending room and holds it
+    for `interview_seconds`, then reports the room finished."""
+
+    def __init__(self, capacity: int, interview_seconds: float, on_finished):
+        self.free = capacity
+        self.busy = 0
+        self.peak_pending = 0
+        self._interview_seconds = interview_seconds
+        self._on_finished = on_finished
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    def request(self, room: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((room, future))
+        self._dispatch()
+        self.peak_pending = max(self.peak_pending, len(self._pending))
+        return future
+
+    def cancel(self, future: asyncio.Future):
+        self._pending = [(room, f) for room, f in self._pending if f is not future]
+
+    def _dispatch(self):
+        while self.free and self._pending:
+            room, future = self._pending.pop(random.randrange(len(self._pending)))
+            self.free -= 1
+            self.busy += 1
+            future.set_result(True)
+            task = asyncio.create_task(self._interview(room))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _interview(self, room: str):
+        await asyncio.sleep(self._interview_seconds)
+        self.free += 1
+        self.busy -= 1
+        await self._on_finished(room)
+        self._dispatch()
+
+    async def drain(self):
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+
+def signed_webhook(event: str, room: str) -> tuple[str, dict]:
+    body = json.dumps({"event": event, "room": {"name": room}})
+    digest = base64.b64encode(hashlib.sha256(body.encode()).digest()).decode()
+    token = AccessToken(API_KEY, API_SECRET).with_sha256(digest).to_jwt()
+    return body, {"Authorization": token, "Content-Type": "application/webhook+json"}
+
+
+#----------------------------Candidates--------------------------------
+class Stats:
+    def __init__(self):
+        self.join_latency: list[float] = []
+        self.request_latency: list[float] = []
+        self.abandoned_rooms = 0
+        self.queued = 0
+        self.rate_limited = 0
+        self.refreshes = 0
+
+
+async def get_token(client: httpx.AsyncClient, stats: Stats, name: str, room: str | None = None):
+    """(room, token) through /getToken, falling back to the queue when it is full."""
+    params = {"name": name}
+    if room:
+        params["room"] = room
+    start = time.perf_counter()
+    resp = await client.get("/getToken", params=params)
+    stats.request_latency.append(time.perf_counter() - start)
+    if resp.status_code == 200:
+        return params.get("room"), resp.text
+    if resp.status_code == 429:
+        stats.rate_limited += 1
+        return None, None
+    if resp.status_code != 503:
+        resp.raise_for_status()
+    stats.queued += 1
+    status = (await client.post("/queue", params={"name": name})).json()
+    while status["status"] != "admitted":
+        status = (await client.get(f"/queue/{status['ticket']}", params={"wait": 20})).json()
+    return status["room"], status["token"]
+
+
+def room_of(token: str) -> str:
+    payload = token.split(".")[1]
+    claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    return claims["video"]["room"]
+
+
+async def candidate(index: int, client, pool: FakeAgentPool, stats: Stats, args):
+    name = f"candidate-{index}"
+    arrived = time.perf_counter()
+    while True:
+        room, token = await get_token(client, stats, name)
+        if token is None:
+            await asyncio.sleep(args.reload_delay)
+            continue
+        room = room or room_of(token)
+        if random.random() < args.refreshers:
+            for _ in range(args.refreshes):
+                stats.refreshes += 1
+                await get_token(client, stats, name, room)
+        body, headers = signed_webhook("room_started", room)
+        await client.post("/livekit/webhook", content=body, headers=headers)
+        picked = pool.request(room)
+        try:
+            await asyncio.wait_for(asyncio.shield(picked), args.dispatch_timeout)
+            stats.join_latency.append(time.perf_counter() - arrived)
+            return
+        except asyncio.TimeoutError:
+            pool.cancel(picked)
+            stats.abandoned_rooms += 1
+            # The candidate leaves the empty room; LiveKit closes it
+            body, headers = signed_webhook("room_finished", room)
+            await client.post("/livekit/webhook", content=body, headers=headers)
+            await asyncio.sleep(args.reload_delay)
+
+
+#----------------------------Runs--------------------------------
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+async def run_mode(label: str, max_interviews: int, args) -> Stats:
+    from admission import AdmissionController
+    from server import app
+
+    stats = Stats()
+    async with app.router.lifespan_context(app):
+        app.state.admission = AdmissionController(
+            await make_redis(args.redis_url),
+            max_interviews=max_interviews,
+            rate=args.rate,
+            burst=args.burst,
+            join_lease=args.dispatch_timeout * 4,
+            room_lease=args.interview_seconds * 4,
+            poll_interval=args.poll_interval,
+        )
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=60) as client:
+
+            async def finished(room: str):
+                body, headers = signed_webhook("room_finished", room)
+                await client.post("/livekit/webhook", content=body, headers=headers)
+
+            pool = FakeAgentPool(args.capacity, args.interview_seconds, finished)
+            total = int(args.arrival_rate * args.duration)
+            start = time.perf_counter()
+            tasks = []
+            for i in range(total):
+                tasks.append(asyncio.create_task(candidate(i, client, pool, stats, args)))
+                await asyncio.sleep(random.expovariate(args.arrival_rate))
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - start
+            await pool.drain()
+
+    lat = stats.join_latency
+    print(
+        f"{label:<13} {len(lat):>5} {statistics.median(lat):>7.2f} {percentile(lat, 95):>7.2f} "
+        f"{percentile(lat, 99):>7.2f} {max(lat):>7.2f} {stats.abandoned_rooms:>9} {pool.peak_pending:>8} "
+        f"{stats.queued:>7} {stats.rate_limited:>5}/{stats.refreshes:<5} {percentile(stats.request_latency, 99) * 1e3:>8.1f} {elapsed:>6.1f}"
+    )
+    return stats
+
+
+async def main(args):
+    random.seed(args.seed)
+    runner, url, _ = await start_stub_livekit(100)
+    os.environ["LIVEKIT_URL"] = url
+    os.environ["LIVEKIT_API_KEY"] = API_KEY
+    os.environ["LIVEKIT_API_SECRET"] = API_SECRET
+    offered = args.arrival_rate * args.interview_seconds / args.capacity
+    print(f"capacity {args.capacity} agents, {args.interview_seconds}s interviews, "
+          f"{args.arrival_rate}/s arrivals for {args.duration}s: offered load {offered:.1f}x")
+    print("join latency = arrival -> agent picked up the room (seconds)")
+    print(f"{'mode':<13} {'joins':>5} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'abandoned':>9} "
+          f"{'no-agent':>8} {'queued':>7} {'429/refresh':>11} {'req p99ms':>8} {'secs':>6}")
+    try:
+        await run_mode("no admission", UNLIMITED, args)
+        random.seed(args.seed)
+        await run_mode("admission", args.capacity, args)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--capacity", type=int, default=20, help="interviews the agent workers run at once")
+    parser.add_argument("--interview-seconds", type=float, default=3.0)
+    parser.add_argument("--arrival-rate", type=float, default=12.0, help="candidates per second")
+    parser.add_argument("--duration", type=float, default=8.0, help="seconds of arrivals")
+    parser.add_argument("--dispatch-timeout", type=float, default=4.0, help="seconds a room waits for an agent")
+    parser.add_argument("--reload-delay", type=float, default=1.0)
+    parser.add_argument("--refreshers", type=float, default=0.2, help="share of candidates that reload after joining")
+    parser.add_argument("--refreshes", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=0.2, help="token bucket refill per identity (1/s)")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--poll-interval", type=float, default=0.25)
+    parser.add_argument("--redis-url", help="use this Redis (flushed) instead of fakeredis")
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+import os
+import time
+from contextlib import nullcontext
+
+from fastapi import FastAPI, Request, Response
+
+# Off unless METRICS_ENABLED is set; prometheus_client is only imported when on.
+ENABLED = os.getenv("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_NOOP = nullcontext()
+
+if ENABLED:
+    from prometheus_client import Counter, Histogram
+
+    REQUEST_SECONDS = Histogram(
+        "http_request_seconds", "HTTP request handling time", ["method", "route", "status"], buckets=BUCKETS
+    )
+    STAGE_SECONDS = Histogram(
+        "token_stage_seconds", "Time spent in one stage of a token request", ["stage"], buckets=BUCKETS
+    )
+    ADMISSIONS = Counter(
+        "admission_decisions_total", "Admission outcomes of token and queue requests", ["outcome"]
+    )
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        STAGE_SECONDS.labels(self.stage).observe(time.perf_counter() - self.start)
+        return False
+
+
+def span(stage: str):
+    """Time a block of a request handler; a shared no-op when metrics are off."""
+    return _Span(stage) if ENABLED else _NOOP
+
+
+def count_admission(outcome: str):
+    """One admission decision: admitted, queued, full or rate_limited."""
+    if ENABLED:
+        ADMISSIONS.labels(outcome).inc()
+
+
+def install(app: FastAPI):
+    """
+    Add request timing and the /metrics endpoint. With metrics off nothing is
+    registered, so requests pay nothing for it.
+    """
+    if not ENABLED:
+        return
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, REGISTRY, generate_latest
+
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Several uvicorn workers: aggregate every worker's samples on scrape
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+
+    @app.middleware("http")
+    async def time_request(request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # Label by route template, not raw path, to keep cardinality bounded
+            route = request.scope.get("route")
+            REQUEST_SECONDS.labels(
+                request.method, getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - start)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import time
+import uuid
+
+from livekit.api import LiveKitAPI, ListRoomsRequest
+
+logger = logging.getLogger("room_allocator")
+
+
+class RoomAllocator:
+    """
+    Hands out unique room names without a LiveKit round trip per request.
+
+    The set of active rooms is kept in memory and refreshed in the background
+    once it is older than `ttl` seconds. Names handed out recently are
+    remembered too, so two candidates never get the same room before LiveKit
+    has even seen it.
+    """
+
+    def __init__(self, api: LiveKitAPI, ttl: float = 30.0, issued_ttl: float = 600.0):
+        self._api = api
+        self._ttl = ttl
+        self._issued_ttl = issued_ttl
+        self._active: set[str] = set()
+        self.occupied: set[str] = set()  # rooms with someone in them, as of the last refresh
+        self._issued: dict[str, float] = {}
+        self._refreshed_at = 0.0
+        self._refresh_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """
+        Load the initial snapshot of active rooms. A failure here is logged
+        and not fatal; the next allocation retries the refresh.
+        """
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Initial room refresh failed: {e}")
+
+    async def aclose(self) -> None:
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+
+    async def refresh(self) -> None:
+        """
+        Replace the active-room snapshot with what LiveKit currently reports.
+        """
+        resp = await self._api.room.list_rooms(ListRoomsRequest())
+        self._active = {room.name for room in resp.rooms}
+        self.occupied = {room.name for room in resp.rooms if room.num_participants}
+        self._refreshed_at = time.monotonic()
+
+        # Rooms LiveKit knows about no longer need to be tracked as issued
+        cutoff = self._refreshed_at - self._issued_ttl
+        self._issued = {
+            name: issued_at
+            for name, issued_at in self._issued.items()
+            if issued_at > cutoff and name not in self._active
+        }
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Room refresh failed, serving stale snapshot: {e}")
+
+    def allocate(self) -> str:
+        """
+        Return a room name that is neither active nor recently issued.
+        Never waits on LiveKit; a stale snapshot only triggers a background refresh.
+        """
+        if time.monotonic() - self._refreshed_at > self._ttl:
+            self._schedule_refresh()
+
+        while True:
+            candidate = f"room-{uuid.uuid4().hex[:8]}"
+            if candidate not in self._active and candidate not in self._issued:
+                self._issued[candidate] = time.monotonic()
+                return candidate
@@ -1,75 +1,327 @@
+import asyncio
+import logging
+import math
 import os
-import uuid
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
-from fastapi import FastAPI, Query, HTTPException
+import redis.asyncio as redis
+from fastapi import FastAPI, Query, HTTPException, Request
 from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from livekit.api import LiveKitAPI, ListRoomsRequest, AccessToken, VideoGrants
+from livekit.api import LiveKitAPI, TokenVerifier, WebhookReceiver
+from pydantic import BaseModel, Field
+
+import metrics
+from admission import AdmissionController, Ticket
+from room_allocator import RoomAllocator
+from tokens import LiveKitCredentials, TokenIssuer
 
 load_dotenv()
 
-app = FastAPI()
+logger = logging.getLogger("server")
+
+
+async def sync_rooms(app: FastAPI, interval: float):
+    """
+    Tell admission which rooms are in use, whether or not LiveKit's webhook is
+    configured: every `interval` seconds (well under ADMISSION_JOIN_LEASE) the
+    slots of rooms with participants are renewed. That also counts rooms joined
+    without going through admission, e.g. with a pre-provisioned token.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            allocator = app.state.room_allocator
+            await allocator.refresh()
+            await app.state.admission.in_use(*allocator.occupied)
+        except Exception as e:
+            logger.warning(f"Room sync failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Owns the single LiveKitAPI client (and its HTTP connection pool) for the
+    lifetime of the server, together with the room allocator built on top of it.
+    Credentials are read once here and shared by everything that signs tokens.
+    Admission state lives in Redis, shared with the other backend processes.
+    """
+    credentials = LiveKitCredentials.from_env()
+    api = LiveKitAPI(credentials.url, credentials.api_key, credentials.api_secret)
+    allocator = RoomAllocator(api, ttl=float(os.getenv("ROOM_CACHE_TTL", "30")))
+    await allocator.start()
+    app.state.room_allocator = allocator
+    app.state.token_issuer = TokenIssuer(
+        credentials,
+        ttl=float(os.getenv("TOKEN_TTL", str(6 * 60 * 60))),
+        margin=float(os.getenv("TOKEN_CACHE_MARGIN", str(15 * 60))),
+        cache_size=int(os.getenv("TOKEN_CACHE_SIZE", "10000")),
+    )
+    app.state.webhook_receiver = WebhookReceiver(TokenVerifier(credentials.api_key, credentials.api_secret))
+    # ADMISSION_ENABLED=false: no cap, no rate limit and no Redis
+    app.state.admission = redis_client = sync_task = None
+    if os.getenv("ADMISSION_ENABLED", "true").lower() in ("1", "true", "yes"):
+        redis_client = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"), decode_responses=True)
+        app.state.admission = AdmissionController(
+            redis_client,
+            # Match the interviews the agent workers can run: workers x WORKER_MAX_JOBS
+            max_interviews=int(os.getenv("MAX_CONCURRENT_INTERVIEWS", "20")),
+            rate=float(os.getenv("ADMISSION_RATE", "0.2")),
+            burst=int(os.getenv("ADMISSION_BURST", "5")),
+            join_lease=float(os.getenv("ADMISSION_JOIN_LEASE", "120")),
+            room_lease=float(os.getenv("ADMISSION_ROOM_LEASE", str(2 * 60 * 60))),
+            ticket_ttl=float(os.getenv("ADMISSION_TICKET_TTL", "30")),
+        )
+        sync_task = asyncio.create_task(sync_rooms(app, float(os.getenv("ADMISSION_SYNC_INTERVAL", "30"))))
+    try:
+        yield
+    finally:
+        if sync_task:
+            sync_task.cancel()
+            await asyncio.gather(sync_task, return_exceptions=True)
+        await allocator.aclose()
+        await api.aclose()
+        if redis_client:
+            await redis_client.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow any origin (you can scope this down in production)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
-    allow_methods=["GET", "OPTIONS"],
+    allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["*"],
 )
+metrics.install(app)
 
-async def get_rooms() -> list[str]:
-    """
-    Fetch the list of existing room names from LiveKit.
-    """
-    api = LiveKitAPI(
-        os.getenv("LIVEKIT_URL"),
-        os.getenv("LIVEKIT_API_KEY"),
-        os.getenv("LIVEKIT_API_SECRET"),
-    )
-    resp = await api.room.list_rooms(ListRoomsRequest())
-    await api.aclose()
-    return [room.name for room in resp.rooms]
 
-async def generate_room_name() -> str:
-    """
-    Generate a unique room name not already in use.
-    """
-    existing = set(await get_rooms())
-    while True:
-        candidate = f"room-{uuid.uuid4().hex[:8]}"
-        if candidate not in existing:
-            return candidate
+def get_admission(request: Request) -> AdmissionController:
+    """The admission controller, 404 when ADMISSION_ENABLED is off."""
+    if request.app.state.admission is None:
+        raise HTTPException(status_code=404, detail="Admission control is disabled")
+    return request.app.state.admission
+
+
+async def check_rate(request: Request, name: str):
+    """429 once `name` has used up its token bucket."""
+    if request.app.state.admission is None:
+        return
+    try:
+        with metrics.span("rate_limit"):
+            decision = await request.app.state.admission.check_rate(name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Rate limit check failed: {e}")
+    if not decision.allowed:
+        metrics.count_admission("rate_limited")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests, try again later",
+            headers={"Retry-After": str(math.ceil(decision.retry_after))},
+        )
+
+
+async def admit(request: Request, name: str, room: str):
+    """503 when the room would pass the concurrent-interview cap; the
+    candidate should then wait for a slot through POST /queue. The request
+    does not count against `name`'s rate limit then."""
+    admission = request.app.state.admission
+    if admission is None:
+        return
+    try:
+        with metrics.span("admit"):
+            admitted = await admission.admit(room)
+            if not admitted:
+                await admission.refund(name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Admission check failed: {e}")
+    if not admitted:
+        metrics.count_admission("full")
+        raise HTTPException(
+            status_code=503,
+            detail="All interview slots are taken, join the queue with POST /queue",
+            headers={"Retry-After": "1"},
+        )
+    metrics.count_admission("admitted")
+
 
 @app.get("/getToken", response_class=PlainTextResponse)
 async def get_token(
+    request: Request,
     name: str = Query("my name", description="User identity"),
     room: str | None = Query(None, description="Room name to join"),
 ):
     """
     Returns a JWT access token for the given user and room.
     If no room is provided, allocates a new unique room name.
+    Answers 429 when `name` asks too often and 503 when every interview slot is taken.
     """
+    await check_rate(request, name)
+
     # 1) Pick or create the room
     if not room:
         try:
-            room = await generate_room_name()
+            with metrics.span("allocate_room"):
+                room = request.app.state.room_allocator.allocate()
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Room lookup failed: {e}")
 
-    # 2) Build the token grants
+    # 2) Take an interview slot for it (a rejoin keeps the one it has)
+    await admit(request, name, room)
+
+    # 3) Sign (or reuse) the token
     try:
-        token = (
-            AccessToken(os.getenv("LIVEKIT_API_KEY"), os.getenv("LIVEKIT_API_SECRET"))
-            .with_identity(name)
-            .with_name(name)
-            .with_grants(
-                VideoGrants(room_join=True, room=room)
-            )
-        )
+        with metrics.span("issue_token"):
+            return request.app.state.token_issuer.issue(name, room)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Token generation failed: {e}")
 
-    # 3) Return the raw JWT
-    return token.to_jwt()
+
+MAX_BATCH_TOKENS = int(os.getenv("MAX_BATCH_TOKENS", "500"))
+
+
+class TokenRequest(BaseModel):
+    name: str = Field(description="User identity")
+    room: str | None = Field(None, description="Room name to join")
+
+
+class TokenBatchRequest(BaseModel):
+    requests: list[TokenRequest] = Field(max_length=MAX_BATCH_TOKENS)
+
+
+class IssuedToken(BaseModel):
+    name: str
+    room: str
+    token: str
+
+
+class TokenBatchResponse(BaseModel):
+    tokens: list[IssuedToken]
+
+
+@app.post("/getTokens", response_model=TokenBatchResponse)
+async def get_tokens(request: Request, batch: TokenBatchRequest):
+    """
+    Issues one token per entry in a single call, e.g. to pre-provision a cohort
+    of interview slots. Entries without a room get a freshly allocated one.
+    Every identity in it is rate-limited as if it had asked on its own (429).
+    These tokens take no interview slot now: a room gets one once it is
+    joined (refer: sync_rooms, livekit_webhook) or through /getToken.
+    """
+    for name in dict.fromkeys(entry.name for entry in batch.requests):
+        await check_rate(request, name)
+    allocator = request.app.state.room_allocator
+    issuer = request.app.state.token_issuer
+    try:
+        rooms = [entry.room or allocator.allocate() for entry in batch.requests]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Room lookup failed: {e}")
+    tokens = []
+    try:
+        for entry, room in zip(batch.requests, rooms):
+            tokens.append(IssuedToken(name=entry.name, room=room, token=issuer.issue(entry.name, room)))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Token generation failed: {e}")
+    return TokenBatchResponse(tokens=tokens)
+
+
+#----------------------------Waiting queue--------------------------------
+MAX_QUEUE_WAIT = float(os.getenv("MAX_QUEUE_WAIT", "25"))
+
+
+class QueueStatus(BaseModel):
+    ticket: str
+    status: str = Field(description='"waiting" or "admitted"')
+    position: int = Field(0, description="1-based place in the queue while waiting")
+    room: str | None = None
+    token: str | None = Field(None, description="Set once admitted")
+
+
+def queue_status(request: Request, ticket: Ticket) -> QueueStatus:
+    if ticket.status != "admitted":
+        return QueueStatus(ticket=ticket.id, status=ticket.status, position=ticket.position)
+    try:
+        token = request.app.state.token_issuer.issue(ticket.name, ticket.room)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Token generation failed: {e}")
+    return QueueStatus(ticket=ticket.id, status=ticket.status, room=ticket.room, token=token)
+
+
+@app.post("/queue", response_model=QueueStatus)
+async def join_queue(request: Request, name: str = Query(..., description="User identity")):
+    """
+    Wait for an interview slot. Tickets are admitted in the order they joined;
+    poll GET /queue/{ticket} to keep one, it is dropped after ADMISSION_TICKET_TTL
+    seconds without a poll. Admitted straight away when a slot is free.
+    """
+    admission = get_admission(request)
+    await check_rate(request, name)
+    try:
+        room = request.app.state.room_allocator.allocate()
+        with metrics.span("enqueue"):
+            ticket = await admission.enqueue(name, room)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Could not join the queue: {e}")
+    metrics.count_admission("queued" if ticket.status == "waiting" else "admitted")
+    return queue_status(request, ticket)
+
+
+@app.get("/queue/{ticket}", response_model=QueueStatus)
+async def poll_queue(
+    request: Request,
+    ticket: str,
+    wait: float = Query(0, ge=0, le=MAX_QUEUE_WAIT, description="Seconds to hold the request until admitted"),
+):
+    """The ticket's place in the queue, or its room and token once admitted."""
+    admission = get_admission(request)
+    try:
+        state = await admission.poll(ticket, wait)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Queue lookup failed: {e}")
+    if state is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired ticket, join the queue again")
+    return queue_status(request, state)
+
+
+@app.delete("/queue/{ticket}", status_code=204)
+async def leave_queue(request: Request, ticket: str):
+    admission = get_admission(request)
+    try:
+        await admission.leave(ticket)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Could not leave the queue: {e}")
+
+
+@app.get("/admission")
+async def admission_stats(request: Request):
+    """Slots in use, tickets waiting and the cap."""
+    admission = get_admission(request)
+    try:
+        return await admission.stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Admission stats unavailable: {e}")
+
+
+@app.post("/livekit/webhook", include_in_schema=False)
+async def livekit_webhook(request: Request):
+    """
+    LiveKit room events (configure the server's webhook URL to point here):
+    a started room keeps its slot for a whole interview, a finished one gives
+    it to the next ticket in the queue. Without them slots are still renewed
+    and freed, only later (refer: sync_rooms).
+    """
+    body = (await request.body()).decode()
+    try:
+        event = request.app.state.webhook_receiver.receive(body, request.headers.get("Authorization", ""))
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=f"Invalid webhook: {e}")
+    admission = request.app.state.admission
+    if admission is None:
+        return {"ok": True}
+    if event.event == "room_started":
+        await admission.started(event.room.name)
+    elif event.event == "room_finished":
+        await admission.release(event.room.name)
+    return {"ok": True}
@@ -0,0 +1,98 @@
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from livekit.api import AccessToken, VideoGrants
+
+
+@dataclass(frozen=True)
+class LiveKitCredentials:
+    url: str
+    api_key: str
+    api_secret: str
+
+    @classmethod
+    def from_env(cls) -> "LiveKitCredentials":
+        """
+        Read the LiveKit settings once; missing keys fail at startup instead of
+        on the first token request.
+        """
+        url = os.getenv("LIVEKIT_URL")
+        api_key = os.getenv("LIVEKIT_API_KEY")
+        api_secret = os.getenv("LIVEKIT_API_SECRET")
+        if not (url and api_key and api_secret):
+            raise RuntimeError("LIVEKIT_URL, LIVEKIT_API_KEY and LIVEKIT_API_SECRET must be set")
+        return cls(url=url, api_key=api_key, api_secret=api_secret)
+
+
+class TokenCache:
+    """
+    LRU cache of signed JWTs with a per-entry expiry.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self._maxsize = maxsize
+        self._entries: OrderedDict[tuple, tuple[str, float]] = OrderedDict()
+
+    def get(self, key: tuple) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        jwt, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return jwt
+
+    def put(self, key: tuple, jwt: str, expires_at: float) -> None:
+        self._entries[key] = (jwt, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TokenIssuer:
+    """
+    Signs room-join tokens and reuses them for repeated (identity, room) requests.
+
+    A cached token is only handed out while it still has at least `margin`
+    seconds of validity left, so clients never receive a JWT about to expire.
+    """
+
+    def __init__(
+        self,
+        credentials: LiveKitCredentials,
+        ttl: float = 6 * 60 * 60,
+        margin: float = 15 * 60,
+        cache_size: int = 10_000,
+    ):
+        self._credentials = credentials
+        self._ttl = timedelta(seconds=ttl)
+        self._cache_lifetime = ttl - min(margin, ttl / 2)
+        self._cache = TokenCache(cache_size)
+
+    def _sign(self, name: str, room: str) -> str:
+        return (
+            AccessToken(self._credentials.api_key, self._credentials.api_secret)
+            .with_identity(name)
+            .with_name(name)
+            .with_ttl(self._ttl)
+            .with_grants(VideoGrants(room_join=True, room=room))
+            .to_jwt()
+        )
+
+    def issue(self, name: str, room: str) -> str:
+        # The grants are fixed today; they are part of the key so adding new
+        # grant combinations later can't serve a token with the wrong rights.
+        key = (name, room, "room_join")
+        jwt = self._cache.get(key)
+        if jwt is None:
+            jwt = self._sign(name, room)
+            self._cache.put(key, jwt, time.monotonic() + self._cache_lifetime)
+        return jwt
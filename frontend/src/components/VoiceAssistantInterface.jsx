@@ -498,21 +498,83 @@ const LiveKitModal = ({  }) => {
   const [isSubmittingName, setIsSubmittingName] = useState(true);
   const [name, setName] = useState("");
   const [token, setToken] = useState(null);
+  const [queuePosition, setQueuePosition] = useState(null);
+  const [error, setError] = useState(null);
+
+  const sleep = (seconds) =>
+    new Promise((resolve) => setTimeout(resolve, seconds * 1000));
+
+  // 429: the backend rate-limits each name; wait as long as it asks, then retry
+  const fetchWithRetry = useCallback(async (url, options) => {
+    for (let attempt = 0; attempt < 3; attempt++) {
+      const response = await fetch(url, options);
+      if (response.status !== 429) return response;
+      await sleep(Number(response.headers.get("Retry-After")) || 5);
+    }
+    throw new Error("Too many attempts, please try again in a minute.");
+  }, []);
+
+  // The room this tab was given. Reloads and reconnects rejoin it, so they keep
+  // its interview slot instead of taking a new one.
+  const ROOM_KEY = "interviewRoom";
+  const savedRoom = (userName) => {
+    const saved = JSON.parse(sessionStorage.getItem(ROOM_KEY) || "null");
+    return saved && saved.name === userName ? saved.room : null;
+  };
+  const saveRoom = (userName, token) => {
+    const payload = token.split(".")[1].replace(/-/g, "+").replace(/_/g, "/");
+    const { room } = JSON.parse(atob(payload)).video;
+    sessionStorage.setItem(ROOM_KEY, JSON.stringify({ name: userName, room }));
+  };
+
+  const readJson = async (response) => {
+    if (!response.ok) {
+      const body = await response.json().catch(() => ({}));
+      throw new Error(body.detail || `Request failed (${response.status})`);
+    }
+    return response.json();
+  };
+
+  // Every interview slot is taken: wait in the backend's FIFO queue until one frees up
+  const waitForSlot = useCallback(async (userName) => {
+    let status = await readJson(
+      await fetchWithRetry(`/api/queue?name=${encodeURIComponent(userName)}`, {
+        method: "POST",
+      })
+    );
+    while (status.status !== "admitted") {
+      setQueuePosition(status.position);
+      status = await readJson(await fetch(`/api/queue/${status.ticket}?wait=20`));
+    }
+    setQueuePosition(null);
+    return status.token;
+  }, [fetchWithRetry]);
 
   const getToken = useCallback(async (userName) => {
+    setError(null);
     try {
-      console.log("run");
-      const response = await fetch(
-        `/api/getToken?name=${encodeURIComponent(userName)}`
+      const room = savedRoom(userName);
+      const response = await fetchWithRetry(
+        `/api/getToken?name=${encodeURIComponent(userName)}` +
+          (room ? `&room=${encodeURIComponent(room)}` : "")
       );
-      const token = await response.text();
-      console.log("Token : " + token);
+      let token;
+      if (response.status === 503) {
+        token = await waitForSlot(userName);
+      } else if (response.ok) {
+        token = await response.text();
+      } else {
+        await readJson(response);
+      }
+      saveRoom(userName, token);
       setToken(token);
       setIsSubmittingName(false);
     } catch (error) {
       console.error(error);
+      setQueuePosition(null);
+      setError(error.message);
     }
-  }, []);
+  }, [fetchWithRetry, waitForSlot]);
 
   const handleNameSubmit = (e) => {
     if (e) e.preventDefault();
@@ -562,6 +624,10 @@ const LiveKitModal = ({  }) => {
               }}
             >
               <h2>Enter your name to connect with support</h2>
+              {queuePosition !== null && (
+                <p>All interviewers are busy. You are number {queuePosition} in the queue.</p>
+              )}
+              {error && <p style={{ color: "#f44336" }}>{error}</p>}
               <input
                 type="text"
                 value={name}
@@ -1,10 +1,40 @@
 
 from livekit.agents.llm import function_tool
-from livekit.agents import Agent
-from data_class.interview_data import get_next_question
+from livekit.agents import Agent, stt
+from config.config import AGENT_SWITCH_TIMEOUT, STT_REFINE_LLM_FALLBACK
+from Agent.transcript_refiner import StreamingRefiner
+from telemetry import metrics
+import asyncio
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("agent.py")
+
+#-----------------------------Switchable Agent-------------------------------------
+class SwitchableAgent(Agent):
+    """Agent that signals when the session has actually activated it, so callers
+    of session.update_agent can wait on that instead of sleeping."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._active = asyncio.Event()
+
+    async def on_enter(self):
+        self._active.set()
+
+    async def on_exit(self):
+        self._active.clear()
+
+    async def wait_until_active(self, timeout: float = AGENT_SWITCH_TIMEOUT) -> bool:
+        try:
+            await asyncio.wait_for(self._active.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"{type(self).__name__} not active after {timeout}s")
+            return False
 
 #-----------------------------BASE Agent-------------------------------------
-class BaseAgent(Agent):
+class BaseAgent(SwitchableAgent):
     def __init__(self, instructions, chat_context=None):
         instructions="""You are a Voice-to-Voice AI Agent. 
                 Be concise and to the point.\n\n""" + instructions
@@ -18,18 +48,49 @@ class BaseAgent(Agent):
                 instructions=instructions
             )
 
-    # Remove automatic on_enter to prevent unwanted responses
-    # We'll manually trigger the reply generation when needed
+    # on_enter only flags the agent as active (refer: SwitchableAgent) so no
+    # unwanted responses; we manually trigger the reply generation when needed
     
     @function_tool
     async def get_question(self):
         """Tool function that uses the session's userdata"""
+        # Read-only: the RPC turn already decided the question. Advancing the
+        # interview from here would race with the RPCs and skip a question.
         interview_data = self.session.userdata
-        return get_next_question(interview_data)
+        return interview_data.state.current_decision
+
+#-----------------------------STT Refining Agent-------------------------------------
+class STTRefiningAgent(SwitchableAgent):
+    """
+    Echoes the candidate's answer back cleaned of fillers and disfluencies.
+
+    Final STT segments are cleaned by rule as they arrive (refer:
+    Agent/transcript_refiner.py); at end of turn the cleaned text is spoken
+    straight away, and the LLM only runs when the refiner is unsure.
+    """
 
-class STTRefiningAgent(Agent):
     def __init__(self, instructions):
         super().__init__(
             instructions="""You are a Voice-to-Voice AI Agent. 
             Be concise and to the point.\n\n""" + instructions
         )
+        self.refiner = StreamingRefiner()
+
+    async def stt_node(self, audio, model_settings):
+        async for event in Agent.default.stt_node(self, audio, model_settings):
+            if isinstance(event, stt.SpeechEvent) and event.type == stt.SpeechEventType.FINAL_TRANSCRIPT and event.alternatives:
+                self.refiner.feed(event.alternatives[0].text, event.alternatives[0].confidence)
+            yield event
+
+    async def llm_node(self, chat_ctx, tools, model_settings):
+        messages = [item for item in chat_ctx.items if getattr(item, "role", None) == "user"]
+        transcript = (messages[-1].text_content or "") if messages else ""
+        result = self.refiner.finish(transcript)
+        use_llm = STT_REFINE_LLM_FALLBACK and not result.confident
+        metrics.observe_refinement(use_llm, result.reasons)
+        if not use_llm:
+            yield result.text
+            return
+        logger.info(f"Refining with the LLM: {', '.join(result.reasons)}")
+        async for chunk in Agent.default.llm_node(self, chat_ctx, tools, model_settings):
+            yield chunk
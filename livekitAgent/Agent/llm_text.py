@@ -0,0 +1,11 @@
+from livekit.agents import ChatContext
+
+
+async def generate_text(llm, chat_ctx: ChatContext) -> str:
+    """Run one out-of-band LLM completion (not spoken) and return its text."""
+    parts = []
+    async with llm.chat(chat_ctx=chat_ctx) as stream:
+        async for chunk in stream:
+            if chunk.delta and chunk.delta.content:
+                parts.append(chunk.delta.content)
+    return "".join(parts).strip()
@@ -0,0 +1,145 @@
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+from config.config import (
+    STT_MIN_CONFIDENCE,
+    STT_MAX_REMOVED_RATIO,
+    STT_MAX_REFINE_WORDS,
+)
+
+#----------------------------Rule tables--------------------------------
+# Never carry meaning in an answer: always dropped
+HARD_FILLERS = r"(?:u+m+|u+h+m*|e+r+m*|a+h+|h+m+|m+h*m+|uh-huh)"
+FILLER_BETWEEN_COMMAS = re.compile(rf",\s*{HARD_FILLERS},\s*", re.IGNORECASE)
+FILLERS = re.compile(rf"\b{HARD_FILLERS}\b[,.]?\s*", re.IGNORECASE)
+
+# Fillers only when set off by punctuation or opening the sentence ("like, it was" but not "I like it")
+SOFT_FILLERS = r"(?:like|you know|i mean|basically|sort of|kind of|so yeah|right|okay so|well)"
+SOFT_FILLER_AT_START = re.compile(rf"(^|[.?!]\s+){SOFT_FILLERS},\s*", re.IGNORECASE)
+SOFT_FILLER_BETWEEN_COMMAS = re.compile(rf",\s*{SOFT_FILLERS}\s*,", re.IGNORECASE)
+# Left in place because they may carry meaning ("I like it", "a kind of cache"), so the LLM decides
+SOFT_FILLER_LEFT = re.compile(r"\b(?:you know|i mean|sort of|kind of)\b|\blike,|,\s*like\b", re.IGNORECASE)
+
+# Stutters and cut-off words: "p-p-python" -> "python", "w- what" -> "what"
+STUTTER = re.compile(r"\b(?:(\w{1,3})-\s*)+(?=\1)", re.IGNORECASE)
+CUT_OFF = re.compile(r"\b\w{1,3}-\s+(?=\w)")
+# Immediate repeats of one to three whole tokens: "the the", "I think I think", not "at at&t"
+REPEAT = re.compile(r"(?<![^\s,])((?:\w+[\s,]+){0,2}\w+)(?:[\s,]+\1(?=[,.?!;:]?(?:\s|$)))+", re.IGNORECASE)
+
+# The candidate corrected themself; what to keep is a judgement call
+SELF_CORRECTION = re.compile(r"\b(?:no wait|sorry,? i meant?|scratch that|let me rephrase|i mean,? no|actually no)\b", re.IGNORECASE)
+
+SPACES = re.compile(r"\s{2,}")
+SPACE_BEFORE_PUNCT = re.compile(r"\s+([,.?!])")
+DOUBLE_PUNCT = re.compile(r"([,.?!])[,\s]*(?=[,.?!])")
+LEADING_PUNCT = re.compile(r"^[,.\s]+")
+# Sentence starts, except identifiers such as "useEffect"
+SENTENCE_START = re.compile(r"(^|[.?!]\s+)([a-z])(?=[a-z']*\b)")
+# No rule matches across a sentence end, so text up to one can be cleaned on its own
+SENTENCE_END = re.compile(r"[.?!]\s+")
+
+
+@dataclass
+class Refinement:
+    text: str
+    confident: bool
+    reasons: list[str] = field(default_factory=list)  # why the LLM is still needed
+    removed_ratio: float = 0.0
+
+
+#----------------------------Helper methods--------------------------------
+def _words(text: str) -> int:
+    return len(text.split())
+
+def clean(text: str) -> str:
+    """The deterministic pass: fillers, stutters, cut-offs and repeats, then spacing."""
+    text = FILLER_BETWEEN_COMMAS.sub(" ", text)
+    text = FILLERS.sub("", text)
+    text = SOFT_FILLER_AT_START.sub(r"\1", text)
+    text = SOFT_FILLER_BETWEEN_COMMAS.sub(" ", text)
+    text = STUTTER.sub("", text)
+    text = CUT_OFF.sub("", text)
+    text = REPEAT.sub(r"\1", text)
+    text = SPACE_BEFORE_PUNCT.sub(r"\1", text)
+    text = DOUBLE_PUNCT.sub("", text)
+    return LEADING_PUNCT.sub("", SPACES.sub(" ", text)).strip()
+
+def judge(raw: str, cleaned: str, stt_confidence: Optional[float] = None) -> Refinement:
+    """
+    Decide whether `cleaned` can be used as is. The LLM is only needed when
+    the heuristic finds something the rules can't settle: a self-correction,
+    ambiguous fillers left in place, a very messy or very long utterance, or
+    a transcript the STT itself was unsure of.
+    """
+    before, after = _words(raw), _words(cleaned)
+    removed_ratio = (before - after) / before if before else 0.0
+    reasons = []
+    if SELF_CORRECTION.search(raw):
+        reasons.append("self_correction")
+    if SOFT_FILLER_LEFT.search(cleaned):
+        reasons.append("ambiguous_filler")
+    if removed_ratio > STT_MAX_REMOVED_RATIO:
+        reasons.append("messy")
+    if after > STT_MAX_REFINE_WORDS:
+        reasons.append("long")
+    if stt_confidence is not None and stt_confidence < STT_MIN_CONFIDENCE:
+        reasons.append("low_stt_confidence")
+    if not cleaned:
+        reasons.append("empty")
+    text = SENTENCE_START.sub(lambda m: m.group(1) + m.group(2).upper(), cleaned)
+    return Refinement(text=text, confident=not reasons, reasons=reasons, removed_ratio=removed_ratio)
+
+def refine(text: str, stt_confidence: Optional[float] = None) -> Refinement:
+    return judge(text, clean(text), stt_confidence)
+
+
+class StreamingRefiner:
+    """
+    Refines an utterance as the STT finalizes each segment, so the cleaned text
+    is ready the moment the candidate stops speaking.
+
+    Segment boundaries are not sentence boundaries ("with," | "uh, Docker"), so
+    segments are not cleaned on their own: every complete sentence is cleaned
+    once it ends, and the unfinished one waits for the next segment. The
+    result is the same as cleaning the whole transcript at once.
+
+    `feed` takes each final segment; `finish` takes the turn's full transcript
+    and returns the refinement, or refines the transcript in one go if it
+    doesn't match what was fed (e.g. the session merged segments itself).
+    """
+
+    def __init__(self):
+        self._raw: list[str] = []
+        self._cleaned: list[str] = []  # cleaned complete sentences
+        self._pending = ""             # raw text of the sentence still being spoken
+        self._min_confidence: Optional[float] = None
+
+    def feed(self, segment: str, stt_confidence: Optional[float] = None):
+        if not segment.strip():
+            return
+        self._raw.append(segment)
+        self._pending = f"{self._pending} {segment}" if self._pending else segment
+        cut = None
+        for cut in SENTENCE_END.finditer(self._pending):
+            pass
+        if cut is not None:
+            self._cleaned.append(clean(self._pending[:cut.end()]))
+            self._pending = self._pending[cut.end():]
+        if stt_confidence is not None and stt_confidence > 0:
+            current = self._min_confidence
+            self._min_confidence = stt_confidence if current is None else min(current, stt_confidence)
+
+    def reset(self):
+        self._raw.clear()
+        self._cleaned.clear()
+        self._pending = ""
+        self._min_confidence = None
+
+    def finish(self, transcript: str) -> Refinement:
+        if self._raw and " ".join(self._raw).split() == transcript.split():
+            cleaned = " ".join(part for part in (*self._cleaned, clean(self._pending)) if part)
+            result = judge(transcript, cleaned, self._min_confidence)
+        else:
+            result = refine(transcript, self._min_confidence)
+        self.reset()
+        return result
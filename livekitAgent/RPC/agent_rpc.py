@@ -1,12 +1,15 @@
 
-from livekit.agents import AgentSession
+from livekit.agents import AgentSession, get_job_context
 from data_class.interview_data import InterviewData
 from Agent.agent import BaseAgent
-from config.config import INTERVIEW_INSTRUCTIONS
-from data_class.interview_data import get_next_question, InterviewPrompt
-import asyncio
+from config.config import INTERVIEW_INSTRUCTIONS, RESUME_QUESTION_INSTRUCTIONS, INTERVIEW_CLOSING_MESSAGE
+from RPC.question_prefetch import replay_frames
+from data_class.interview_data import get_next_question, record_answer
+from data_class.interview_state import InterviewPrompt
+from data_class.session_snapshot import history_chat_context, schedule_snapshot
+from telemetry import metrics
+from functools import partial
 import logging
-import json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("agent_rpc.py")
@@ -14,148 +17,233 @@ logger = logging.getLogger("agent_rpc.py")
 
 
 
+#--------------------------------Helpers---------------------------------
+async def switch_agent(session: AgentSession, agent):
+    """Switch the session to `agent` and return once it is actually active."""
+    session.update_agent(agent)
+    await agent.wait_until_active()
+
+def get_interview_agent(interview_data: InterviewData) -> BaseAgent:
+    """The session's single BaseAgent. Its instructions are formatted once and
+    its chat context grows in place, so nothing is rebuilt or copied per turn.
+    A restored session starts it from the answers it already has."""
+    if interview_data.interview_agent is None:
+        interview_data.interview_agent = BaseAgent(
+            instructions=INTERVIEW_INSTRUCTIONS.format(resume_data=interview_data.resume_data),
+            chat_context=history_chat_context(interview_data),
+        )
+    return interview_data.interview_agent
+
+async def speak_text(session: AgentSession, agent: BaseAgent, text: str, audio=None, user_input=None):
+    """Say an exact question without an LLM call. `user_input` (the candidate's
+    answer) is added to the agent's chat context first, as generate_reply would."""
+    if user_input is not None:
+        chat_ctx = agent.chat_ctx.copy()
+        chat_ctx.add_message(role="user", content=user_input)
+        await agent.update_chat_ctx(chat_ctx)
+        # update_chat_ctx emits no conversation_item_added, so main.py's transcript
+        # handler never sees this message: write it here, as that handler would
+        interview_data: InterviewData = session.userdata
+        if interview_data.transcript_sink:
+            interview_data.transcript_sink.append({"type": "message", "role": "user", "content": user_input})
+    return session.say(text, audio=audio)
+
+async def ask_question(session: AgentSession, agent: BaseAgent, next_question, user_input=None):
+    """Start asking the question decision; returns its SpeechHandle.
+    Exact questions (predefined or from the resume pool) and the closing line
+    are spoken directly; the others are generated by the LLM. Answers are
+    scored offline, refer: scoring/pipeline.py"""
+    if isinstance(next_question, dict):
+        logger.info(f"asking an exact question: {next_question}")
+        return await speak_text(session, agent, next_question.get("question", ""), user_input=user_input)
+
+    if next_question == InterviewPrompt.INTERVIEW_END:
+        return await speak_text(session, agent, INTERVIEW_CLOSING_MESSAGE, user_input=user_input)
+    if next_question == InterviewPrompt.ASK_FOLLOW_UP:
+        instructions = "Ask a follow-up question based on the candidate's previous answer to get more details or clarification."
+    else:
+        instructions = RESUME_QUESTION_INSTRUCTIONS
+
+    if user_input is None:
+        return session.generate_reply(instructions=instructions)
+    return session.generate_reply(user_input=user_input, instructions=instructions)
+
+async def speak_prefetched(session: AgentSession, agent: BaseAgent, prefetched, user_input=None):
+    """Say a prefetched question as-is, using its pre-synthesized audio when ready."""
+    audio = replay_frames(prefetched.audio) if prefetched.audio else None
+    return await speak_text(session, agent, prefetched.text, audio=audio, user_input=user_input)
+
+def remember_asked_question(interview_data: InterviewData, agent: BaseAgent):
+    """Keep the question just asked for the next QnA record: the decision's
+    shared dict when it was an exact question, else the text the agent said."""
+    if interview_data.state.current_decision == InterviewPrompt.INTERVIEW_END:
+        return  # the closing line, not a question
+    items = agent.chat_ctx.items
+    if items and getattr(items[-1], "role", None) == "assistant":
+        text = items[-1].text_content
+        decision = interview_data.state.current_decision
+        exact = isinstance(decision, dict) and decision.get("question") == text
+        interview_data.last_question = decision if exact else text
+        interview_data.asked_index.add([text])
+
+def end_interview(interview_data: InterviewData):
+    """Mark the transcript complete for offline scoring and close the job right
+    away; the shutdown callbacks flush the transcript and save the questions."""
+    if interview_data.transcript_sink:
+        interview_data.transcript_sink.append({"type": "end", "candidate_id": interview_data.candidate_id})
+    try:
+        get_job_context().shutdown(reason="interview complete")
+    except RuntimeError:
+        logger.warning("No job context to shut down")
+
 #--------------------------------RPC Methods---------------------------------
+# confirm_answer and skip_question both move the interview on, so they run as
+# turns of the session's TurnGate: one at a time, duplicates coalesced and
+# requests made stale by an earlier turn rejected. refer: RPC/turn_gate.py
 async def confirm_answer(payload, session: AgentSession):
+    interview_data: InterviewData = session.userdata
+    return await interview_data.turn_gate.run(
+        ("confirm_answer", payload.payload),
+        interview_data.state,
+        partial(_confirm_answer_turn, payload, session),
+    )
+
+async def skip_question(payload, session):
+    interview_data: InterviewData = session.userdata
+    return await interview_data.turn_gate.run(
+        ("skip_question", payload.payload),
+        interview_data.state,
+        partial(_skip_question_turn, payload, session),
+    )
+
+async def _confirm_answer_turn(payload, session: AgentSession):
+    trace = metrics.start_turn("confirm_answer")
     try:
         interview_data: InterviewData = session.userdata
+        if interview_data.latency_probe:
+            interview_data.latency_probe.mark_rpc("confirm_answer")
         logger.info("🔵 Starting confirm_answer process...")
-        logger.info(f"here is the resume data {interview_data.resume_data}")
-        # Step 1: Save the current STT refining agent
+        # Step 1: Save the answer from the previous question
+        answer = None
         if not (payload.payload == "first_request"):
-            # Save the answer from the previous question
-            if interview_data.interview_history:
-                interview_data.qna_history.append({"question":interview_data.interview_history.items[-1].text_content,"answer":payload.payload})
+            answer = payload.payload
+            if interview_data.last_question:
+                with trace.span("record_answer"):
+                    record_answer(interview_data, interview_data.last_question, answer)
                 logger.info("💾 Saved previous answer to QnA history")
-            
-            interview_data.interview_history.add_message(role="user", content=payload.payload)
-        
         
         # Step 2: Store reference to current STT refining agent
         stt_refining_agent = session.current_agent
         logger.info("📝 Stored reference to STT refining agent")
        
-        # Step 3: Create and switch to BaseAgent
-        base_agent = BaseAgent(
-                instructions=INTERVIEW_INSTRUCTIONS.format(resume_data=interview_data.resume_data),
-                chat_context=interview_data.interview_history
-            )
-       
+        # Step 3: Switch to the session's BaseAgent and wait for it to be activated
+        base_agent = get_interview_agent(interview_data)
         logger.info("🔄 Switching to BaseAgent...")
-        session.update_agent(base_agent)
-
-        # Step 4: Wait for agent switch to complete
-        await asyncio.sleep(0.1)  # Minimal wait for agent switch
+        with trace.span("switch_to_interview"):
+            await switch_agent(session, base_agent)
        
+        # Step 4: Swap in any summary folded since the last turn (never waits on the LLM)
+        if interview_data.context_window:
+            with trace.span("context_apply"):
+                await interview_data.context_window.apply(base_agent)
+
         # Step 5: Get the question directly using the tool function
         logger.info("🎯 Getting next question using tool...")
-        next_question = get_next_question(interview_data)
+        with trace.span("decision"):
+            next_question = get_next_question(interview_data)
        
-        # Step 6: Generate reply with the specific question
+        # Step 6: Ask it, straight from the prefetch if one was prepared for this decision
         logger.info(f"🎯 BaseAgent asking question: {next_question}")
-        if next_question == InterviewPrompt.INTERVIEW_END:
-            await session.generate_reply(
-                instructions="The interview is complete. Provide a summary of the candidate's performance and final scores."
-            )
-        elif next_question == InterviewPrompt.ASK_FOLLOW_UP:
-            await session.generate_reply(
-                instructions="Ask a follow-up question based on the candidate's previous answer to get more details or clarification."
-            )
-        elif next_question == InterviewPrompt.ASK_RESUME_QUESTION:
-            await session.generate_reply(
-                instructions="""Based on the candidate's resume, ask a relevant and specific question about their experience, skills, education, or projects.
-Vary the focus each time to cover different aspects of the resume and avoid repetition."""
-            )
-        else:
-            # Extract question text if it's a dict
-            logger.info(f"asking a predefine question: {next_question}")
-            question_text = next_question.get("question", next_question) if isinstance(next_question, dict) else next_question
-            await session.generate_reply(
-                instructions=f"Do not use any context and only ask this exact question to the candidate : {question_text}"
-            )
-        
-        
+        with trace.span("prepare_reply"):
+            prefetched = await interview_data.prefetcher.take(next_question) if interview_data.prefetcher else None
+            if prefetched:
+                handle = await speak_prefetched(session, base_agent, prefetched, user_input=answer)
+            else:
+                handle = await ask_question(session, base_agent, next_question, user_input=answer)
        
-        # Step 8: Wait for reply completion
-        await asyncio.sleep(0.5)  # Reduced wait time
-        interview_data.interview_history = session.current_agent.chat_ctx.copy()
+        # Step 7: Wait for the reply to be played out (and committed to the chat context)
+        with trace.span("playout"):
+            await handle.wait_for_playout()
+        remember_asked_question(interview_data, base_agent)
+        schedule_snapshot(interview_data)
+        if interview_data.context_window:
+            interview_data.context_window.schedule(base_agent)
+        # Step 8: Prepare the next question while the candidate answers this one
+        if interview_data.prefetcher:
+            interview_data.prefetcher.start(interview_data, base_agent)
        
-        # if next_question == "Interview End":
-        interview_history_json = []
-        for item in session.current_agent.chat_ctx.items:
-            interview_history_json.append({item.role : item.content})
-        with open("interview_history.json","w") as fp:
-            json.dump(interview_history_json, fp, ensure_ascii=False, indent=2)
-        with open("interview_qna.json", "w") as fp:
-                json.dump(interview_data.qna_history, fp, ensure_ascii=False, indent= 2)
         logger.info("🔄 Switching back to STT refining agent...")
-        session.update_agent(stt_refining_agent)
+        with trace.span("switch_back"):
+            await switch_agent(session, stt_refining_agent)
        
         logger.info("✅ Successfully completed agent switching cycle")
+        if next_question == InterviewPrompt.INTERVIEW_END:
+            end_interview(interview_data)
        
     except Exception as e:
         logger.error(f"❌ Error in confirm_answer: {e}")
         # Ensure we're back on the refining agent even if there's an error
         if 'stt_refining_agent' in locals():
             session.update_agent(stt_refining_agent)
+    finally:
+        trace.finish()
  
-async def skip_question(payload, session):
-    interview_data: InterviewData = session.userdata
-    logger.info("⏭️ Skipping question...")
- 
-    #skipping to the next predefine question question
-    interview_data.number_of_follow_ups = 99
-    # Mark current question as skipped
-    if interview_data.interview_history:
-        interview_data.qna_history.append({"question":interview_data.interview_history.items[-1].text_content,"answer":"[Question Skipped]"})
-    interview_data.interview_history.add_message("user", "[Question Skipped]")
-   
-    # Use similar switching logic as confirm_answer
-    stt_refining_agent = session.current_agent
-
-    base_agent = None
-    if not interview_data.interview_history:
-        base_agent = BaseAgent(
-            instructions=INTERVIEW_INSTRUCTIONS.format(resume_data=interview_data.resume_data),
-            chat_context=interview_data.interview_history
-        )
-    else:
-        base_agent = BaseAgent(chat_context=interview_data.interview_history)
-    session.update_agent(base_agent)
-    await asyncio.sleep(0.1)
-   
-    # Get the question directly
-    next_question = get_next_question(interview_data)
-   
-    # Generate appropriate response
-    if next_question == InterviewPrompt.INTERVIEW_END:
-        await session.generate_reply(
-            instructions="The interview is complete. Provide a summary of the candidate's performance and final scores."
-        )
-    elif next_question == InterviewPrompt.ASK_FOLLOW_UP:
-        await session.generate_reply(
-            instructions="Ask a follow-up question based on the candidate's previous answer to get more details or clarification."
-        )
-    elif next_question == InterviewPrompt.ASK_RESUME_QUESTION:
-        await session.generate_reply(
-                instructions="""Based on the candidate's resume, ask a relevant and specific question about their experience, skills, education, or projects.
-Vary the focus each time to cover different aspects of the resume and avoid repetition."""
-            ) 
-    else:
-        question_text = next_question.get("question", next_question) if isinstance(next_question, dict) else next_question
-        await session.generate_reply(
-            instructions=f"Ask this exact question to the candidate: {question_text}"
-        )
-   
-    await asyncio.sleep(0.5)
-    
-    # if next_question == "Interview End":
-    with open("interview_qna.json", "w") as fp:
-            json.dump(interview_data.qna_history, fp, ensure_ascii=False, indent= 2)
-    interview_data.interview_history = session.current_agent.chat_ctx.copy()
-    session.current_agent.chat_ctx.empty()
-    session.update_agent(stt_refining_agent)
-   
-    return f"Skipped question with payload: {payload.payload}"
+async def _skip_question_turn(payload, session):
+    trace = metrics.start_turn("skip_question")
+    try:
+        interview_data: InterviewData = session.userdata
+        if interview_data.latency_probe:
+            interview_data.latency_probe.mark_rpc("skip_question")
+        logger.info("⏭️ Skipping question...")
+
+        #skipping to the next predefine question question; whatever was prefetched no longer applies
+        if interview_data.prefetcher:
+            interview_data.prefetcher.discard()
+        interview_data.state.skip_follow_ups()
+        # Mark current question as skipped
+        if interview_data.last_question:
+            with trace.span("record_answer"):
+                record_answer(interview_data, interview_data.last_question, "[Question Skipped]")
+
+        # Use similar switching logic as confirm_answer
+        stt_refining_agent = session.current_agent
+        base_agent = get_interview_agent(interview_data)
+        with trace.span("switch_to_interview"):
+            await switch_agent(session, base_agent)
+        if interview_data.context_window:
+            with trace.span("context_apply"):
+                await interview_data.context_window.apply(base_agent)
+
+        # Get the question directly
+        with trace.span("decision"):
+            next_question = get_next_question(interview_data)
+
+        # Generate appropriate response
+        with trace.span("prepare_reply"):
+            handle = await ask_question(session, base_agent, next_question, user_input="[Question Skipped]")
+        with trace.span("playout"):
+            await handle.wait_for_playout()
+        remember_asked_question(interview_data, base_agent)
+        schedule_snapshot(interview_data)
+        if interview_data.context_window:
+            interview_data.context_window.schedule(base_agent)
+        if interview_data.prefetcher:
+            interview_data.prefetcher.start(interview_data, base_agent)
+
+        with trace.span("switch_back"):
+            await switch_agent(session, stt_refining_agent)
+        if next_question == InterviewPrompt.INTERVIEW_END:
+            end_interview(interview_data)
+
+        return f"Skipped question with payload: {payload.payload}"
+
+    except Exception as e:
+        logger.error(f"❌ Error in skip_question: {e}")
+        # Ensure we're back on the refining agent even if there's an error
+        if 'stt_refining_agent' in locals():
+            session.update_agent(stt_refining_agent)
+    finally:
+        trace.finish()
  
 async def re_answer(payload, session):
     logger.info("🔄 Re-answering question...")
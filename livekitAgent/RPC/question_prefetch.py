@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional
+from livekit.agents import ChatContext
+from data_class.interview_data import peek_next_question
+from data_class.interview_state import InterviewPrompt
+from Agent.llm_text import generate_text
+from config.config import RESUME_QUESTION_INSTRUCTIONS, PREFETCH_TTS, INTERVIEW_CLOSING_MESSAGE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("question_prefetch.py")
+
+
+@dataclass
+class PrefetchedQuestion:
+    decision: object   # the question dict or InterviewPrompt it was prepared for
+    text: str
+    audio: Optional[list] = None   # pre-synthesized rtc.AudioFrame list
+
+
+#----------------------------Helper methods--------------------------------
+async def synthesize_frames(tts, text: str) -> list:
+    frames = []
+    async with tts.synthesize(text) as stream:
+        async for audio in stream:
+            frames.append(audio.frame)
+    return frames
+
+async def replay_frames(frames: list):
+    for frame in frames:
+        yield frame
+
+
+class QuestionPrefetcher:
+    """
+    Prepares the next question while the candidate is still answering.
+
+    Only decisions that don't depend on the answer are prefetched: exact
+    questions, predefined or from the resume pool, and the closing line (text
+    known, audio optionally pre-synthesized), plus live resume questions (text
+    generated out of band by the LLM). A prefetch is used only
+    if the turn's actual decision matches it; anything else throws it away.
+    """
+
+    def __init__(self, llm=None, tts=None, synthesize_audio: bool = PREFETCH_TTS):
+        self._llm = llm
+        self._tts = tts
+        self._synthesize_audio = synthesize_audio and tts is not None
+        self._decision = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, interview_data, agent):
+        """Begin preparing whatever peek_next_question says comes next."""
+        self.discard()
+        if interview_data.state.current_decision == InterviewPrompt.INTERVIEW_END:
+            return  # nothing comes after the closing line
+        decision = peek_next_question(interview_data)
+        if decision == InterviewPrompt.ASK_FOLLOW_UP:
+            return
+        if decision == InterviewPrompt.ASK_RESUME_QUESTION and self._llm is None:
+            return
+        self._decision = decision
+        self._task = asyncio.create_task(self._prepare(decision, agent, interview_data.asked_index))
+
+    def discard(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._decision = None
+
+    async def take(self, decision) -> Optional[PrefetchedQuestion]:
+        """Return the prefetch for `decision`, waiting for it if still in flight."""
+        task, prepared_for = self._task, self._decision
+        self._task = None
+        self._decision = None
+        if task is None:
+            return None
+        if prepared_for != decision:
+            task.cancel()
+            return None
+        try:
+            return await task
+        except Exception as e:
+            logger.error(f"Question prefetch failed, asking normally: {e}")
+            return None
+
+    async def _question_text(self, decision, agent, asked_index) -> str:
+        if decision == InterviewPrompt.ASK_RESUME_QUESTION:
+            chat_ctx = ChatContext()
+            chat_ctx.add_message(role="system", content=agent.instructions)
+            for item in agent.chat_ctx.items:
+                if getattr(item, "type", None) == "message" and item.role in ("user", "assistant"):
+                    chat_ctx.add_message(role=item.role, content=item.text_content or "")
+            chat_ctx.add_message(role="system", content=RESUME_QUESTION_INSTRUCTIONS)
+            text = await generate_text(self._llm, chat_ctx)
+            # One retry when the LLM comes back with something already asked
+            if asked_index is not None and asked_index.is_duplicate(text):
+                logger.info(f"Generated question repeats an earlier one, regenerating: {text}")
+                chat_ctx.add_message(role="system", content=f"Do not ask this again, it was already asked: {text}")
+                text = await generate_text(self._llm, chat_ctx)
+            return text
+        if decision == InterviewPrompt.INTERVIEW_END:
+            return INTERVIEW_CLOSING_MESSAGE
+        return decision.get("question", decision) if isinstance(decision, dict) else str(decision)
+
+    async def _prepare(self, decision, agent, asked_index=None) -> PrefetchedQuestion:
+        text = await self._question_text(decision, agent, asked_index)
+        audio = await synthesize_frames(self._tts, text) if self._synthesize_audio else None
+        logger.info(f"⚡ Prefetched next question: {text}")
+        return PrefetchedQuestion(decision=decision, text=text, audio=audio)
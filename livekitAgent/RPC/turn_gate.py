@@ -0,0 +1,48 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Hashable
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("turn_gate.py")
+
+STALE_RESPONSE = "stale request ignored"
+
+
+class TurnGate:
+    """
+    Serializes the turn-changing RPCs of one session.
+
+    - Turns run one at a time behind a per-session lock, so other sessions in
+      the worker never wait on it.
+    - A request identical (same key) to one already queued or running shares
+      its result instead of running again, e.g. a double-clicked button.
+    - A request is bound to the interview state version it arrived at; if
+      another turn has moved the interview on by the time it gets the lock, it
+      is rejected as stale instead of skipping a question.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._pending: dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+        self.rejected = 0
+
+    async def run(self, key: Hashable, state, turn: Callable[[], Awaitable]):
+        task = self._pending.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.info(f"Coalesced duplicate request {key!r}")
+        else:
+            task = asyncio.create_task(self._run_turn(key, state.version, state, turn))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        # shield: a caller giving up must not cancel a turn others are waiting on
+        return await asyncio.shield(task)
+
+    async def _run_turn(self, key: Hashable, version: int, state, turn: Callable[[], Awaitable]):
+        async with self._lock:
+            if state.version != version:
+                self.rejected += 1
+                logger.info(f"Rejected stale request {key!r}: interview moved on to version {state.version}")
+                return STALE_RESPONSE
+            return await turn()
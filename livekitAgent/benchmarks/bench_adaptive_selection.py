@@ -0,0 +1,134 @@
+"""
+Adaptive difficulty selection with synthetic candidates.
+
+Each candidate has a hidden skill in [0, 2] (basic .. advanced) and answers a
+question of level L well with probability sigmoid(2 * (skill - L)). Interviews
+run through InterviewState + AdaptiveSelector exactly as in a session; answer
+quality reaches the selector through qna_history, as live.
+
+Reports the cost of one pick on growing banks (against a linear scan per
+pick), how well the final level tracks the hidden skill, the difficulty mix
+asked per skill band, and bank coverage across sessions.
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_adaptive_selection.py --sessions 2000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_question_bank import synthetic_bank
+from data_class.adaptive_selector import AdaptiveSelector
+from data_class.interview_data import InterviewData, get_next_question, record_answer
+from data_class.interview_state import InterviewPrompt
+from data_class.question_bank import DIFFICULTIES, QuestionBank
+
+
+def synthetic_answer(rng: random.Random, skill: float, level: int) -> str:
+    good = rng.random() < 1 / (1 + math.exp(-2 * (skill - level)))
+    words = rng.randint(60, 120) if good else rng.randint(3, 20)
+    return " ".join(["word"] * words)
+
+
+def run_interview(bank: QuestionBank, skill: float, seed: int, pick_times: list[float]):
+    rng = random.Random(seed)
+    selector = AdaptiveSelector(bank, seed=seed)
+    commit = selector.commit
+
+    def timed_commit(interview_data, ordinal):
+        start = time.perf_counter()
+        question = commit(interview_data, ordinal)
+        pick_times.append(time.perf_counter() - start)
+        return question
+
+    selector.commit = timed_commit
+    interview_data = InterviewData(pre_define_questions=[], question_selector=selector)
+    level = 0
+    while True:
+        decision = get_next_question(interview_data)
+        if decision == InterviewPrompt.INTERVIEW_END:
+            break
+        if isinstance(decision, dict) and "difficulty" in decision:
+            level = DIFFICULTIES.index(decision["difficulty"])
+            question = decision["question"]
+        else:
+            question = str(decision)
+        # follow-up and resume answers are judged at the level of the current predefined question
+        record_answer(interview_data, question, synthetic_answer(rng, skill, level))
+    return interview_data.pre_define_questions, selector.level
+
+
+def linear_pick(questions, difficulty: str, asked: set, rng: random.Random):
+    candidates = [i for i, q in enumerate(questions) if q["difficulty"] == difficulty and i not in asked]
+    return rng.choice(candidates)
+
+
+def pick_cost(sizes: list[int], picks: int):
+    print(f"{'bank size':>10} {'ladder build':>13} {'adaptive pick':>14} {'linear scan pick':>17}")
+    for size in sizes:
+        bank = QuestionBank(synthetic_bank(size))
+        start = time.perf_counter()
+        ladder = bank.ladder()
+        build = time.perf_counter() - start
+
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for i in range(picks):
+            ladder.pick(i % len(DIFFICULTIES), rng.random())
+        adaptive = (time.perf_counter() - start) / picks
+
+        scans = max(1, min(picks, 2_000_000 // size))
+        start = time.perf_counter()
+        for i in range(scans):
+            linear_pick(bank.questions, DIFFICULTIES[i % len(DIFFICULTIES)], set(), rng)
+        linear = (time.perf_counter() - start) / scans
+        print(f"{size:>10} {build * 1000:10.1f} ms {adaptive * 1e6:11.2f} us {linear * 1e6:14.1f} us")
+
+
+def simulate(args):
+    bank = QuestionBank(synthetic_bank(args.questions))
+    bank.ladder()
+    pick_times: list[float] = []
+    bands: dict[str, Counter] = {}
+    errors, asked_ids, repeats = [], Counter(), 0
+    rng = random.Random(args.seed)
+    for session in range(args.sessions):
+        skill = rng.uniform(0, len(DIFFICULTIES) - 1)
+        asked, final_level = run_interview(bank, skill, args.seed + session, pick_times)
+        errors.append(abs(final_level - skill))
+        band = DIFFICULTIES[min(len(DIFFICULTIES) - 1, round(skill))]
+        bands.setdefault(band, Counter()).update(q["difficulty"] for q in asked)
+        ids = [id(q) for q in asked]
+        repeats += len(ids) - len(set(ids))
+        asked_ids.update(ids)
+
+    pick_times.sort()
+    print(f"\n{args.sessions} synthetic interviews on a {args.questions}-question bank")
+    print(f"pick p50 / p99         : {pick_times[len(pick_times) // 2] * 1e6:.1f} / {pick_times[int(len(pick_times) * 0.99)] * 1e6:.1f} us")
+    print(f"final level vs skill   : mean abs error {sum(errors) / len(errors):.2f} levels")
+    print(f"repeats within session : {repeats}")
+    print(f"bank coverage          : {len(asked_ids)} distinct questions asked ({len(asked_ids) / len(bank):.1%} of the bank)")
+    print("difficulty mix asked by hidden skill band:")
+    for band in DIFFICULTIES:
+        counts = bands.get(band, Counter())
+        total = sum(counts.values()) or 1
+        mix = "  ".join(f"{d} {counts[d] / total:5.1%}" for d in DIFFICULTIES)
+        print(f"  {band:>12}: {mix}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--picks", type=int, default=100_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    pick_cost(args.sizes, args.picks)
+    simulate(args)
@@ -0,0 +1,69 @@
+"""
+Per-turn CPU time and peak allocated memory of the interview agent bookkeeping over a
+long synthetic interview.
+
+"before" rebuilds a BaseAgent every turn (re-formatting the instructions with
+the resume and re-wrapping the whole history) and copies its chat context
+back; "after" keeps one BaseAgent per session and appends to its context.
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_agent_reuse.py --turns 40
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livekit.agents import ChatContext
+from Agent.agent import BaseAgent
+from config.config import INTERVIEW_INSTRUCTIONS
+
+RESUME = "\n".join(f"Experience line {i}: built and scaled service number {i}." for i in range(80))
+ANSWER = "I would start by profiling the slow path, then cache what is read often. " * 4
+
+
+def rebuild_per_turn(turns: int):
+    history = ChatContext()
+    for turn in range(turns):
+        history.add_message(role="user", content=ANSWER)
+        agent = BaseAgent(
+            instructions=INTERVIEW_INSTRUCTIONS.format(resume_data=RESUME),
+            chat_context=history,
+        )
+        agent._chat_ctx.add_message(role="assistant", content=f"Question {turn}?")
+        history = agent.chat_ctx.copy()
+
+
+def reuse_one_agent(turns: int):
+    agent = BaseAgent(instructions=INTERVIEW_INSTRUCTIONS.format(resume_data=RESUME))
+    for turn in range(turns):
+        agent._chat_ctx.add_message(role="user", content=ANSWER)
+        agent._chat_ctx.add_message(role="assistant", content=f"Question {turn}?")
+
+
+def measure(fn, turns: int) -> tuple[float, int]:
+    # CPU time is taken without tracemalloc, which would dominate it
+    start = time.process_time()
+    fn(turns)
+    cpu = time.process_time() - start
+
+    tracemalloc.start()
+    fn(turns)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu / turns, peak
+
+
+def main(args):
+    for label, fn in (("before", rebuild_per_turn), ("after", reuse_one_agent)):
+        cpu, peak = measure(fn, args.turns)
+        print(f"{label:7}: {cpu * 1e6:9.1f} us CPU/turn   peak traced memory {peak / 1024:8.1f} KiB  ({args.turns} turns)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=40)
+    main(parser.parse_args())
@@ -0,0 +1,59 @@
+"""
+Prompt size per turn over a 50-turn mock interview, with and without the
+ContextWindow. The summarizer is a stub with a fixed delay and output size,
+so only the windowing itself is measured.
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_context_window.py --turns 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Agent.agent import BaseAgent
+from config.config import INTERVIEW_INSTRUCTIONS
+from data_class.context_window import ContextWindow, estimate_tokens, prompt_tokens
+
+RESUME = "\n".join(f"Experience line {i}: built and scaled service number {i}." for i in range(60))
+ANSWER = "So in that project I owned the API layer and we moved the hot reads behind a cache. " * 5
+
+
+async def stub_summarize(previous_summary: str, transcript: str) -> str:
+    await asyncio.sleep(0.01)
+    return ("Candidate covered caching, API design and team leadership. " * 8).strip()
+
+
+async def run(turns: int, window: ContextWindow | None) -> list[int]:
+    agent = BaseAgent(instructions=INTERVIEW_INSTRUCTIONS.format(resume_data=RESUME))
+    instruction_tokens = estimate_tokens(agent.instructions)
+    sizes = []
+    for turn in range(turns):
+        if window:
+            await window.apply(agent)
+        agent._chat_ctx.add_message(role="user", content=ANSWER)
+        sizes.append(instruction_tokens + prompt_tokens(agent.chat_ctx))
+        agent._chat_ctx.add_message(role="assistant", content=f"Can you walk me through decision number {turn}?")
+        if window:
+            window.schedule(agent)
+        # the candidate's answer time: the background summary finishes here
+        await asyncio.sleep(0.02)
+    return sizes
+
+
+async def main(args):
+    unbounded = await run(args.turns, None)
+    bounded = await run(args.turns, ContextWindow(stub_summarize))
+    print(f"{'turn':>5} {'unbounded tokens':>17} {'windowed tokens':>16}")
+    for turn in range(0, args.turns, 5):
+        print(f"{turn + 1:5} {unbounded[turn]:17} {bounded[turn]:16}")
+    print(f"{args.turns:5} {unbounded[-1]:17} {bounded[-1]:16}")
+    print(f"total prompt tokens over the interview: {sum(unbounded)} -> {sum(bounded)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,73 @@
+"""
+Time to first audio per question type, with and without the speculative
+QuestionPrefetcher, over a full mock interview. LLM and TTS are stubs with
+injected delays; the candidate "answers" for --answer-time seconds per turn,
+which is the window the prefetch works in.
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_prefetch.py --llm-ttft 0.6 --tts-ttfb 0.25
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeLLM, FakeSession, FakeTTS, FakeTimings, rpc_payload
+from Agent.agent import STTRefiningAgent
+from config.config import STT_REFINING_INSTRUCTIONS
+from data_class.interview_data import InterviewData, peek_next_question
+from data_class.interview_state import InterviewPrompt
+from RPC.agent_rpc import confirm_answer, get_interview_agent
+from RPC.question_prefetch import QuestionPrefetcher
+from telemetry.latency_probe import TurnLatencyProbe, percentile
+
+
+def kind_of(decision) -> str:
+    if isinstance(decision, InterviewPrompt):
+        return decision.name.lower()
+    return "predefined"
+
+
+async def run(args, prefetch: bool) -> dict[str, list[float]]:
+    timings = FakeTimings(llm_ttft=args.llm_ttft, tts_ttfb=args.tts_ttfb, speech=args.speech)
+    interview_data = InterviewData(resume_data="Synthetic resume for benchmarking.")
+    session = FakeSession(interview_data, timings)
+    interview_data.refining_agent = STTRefiningAgent(instructions=STT_REFINING_INSTRUCTIONS)
+    interview_data.latency_probe = TurnLatencyProbe(session)
+    if prefetch:
+        interview_data.prefetcher = QuestionPrefetcher(llm=FakeLLM(args.llm_ttft), tts=FakeTTS(args.tts_ttfb))
+        interview_data.prefetcher.start(interview_data, get_interview_agent(interview_data))
+    await session.start(agent=interview_data.refining_agent)
+
+    by_kind: dict[str, list[float]] = {}
+    turn = 0
+    while peek_next_question(interview_data) != InterviewPrompt.INTERVIEW_END:
+        kind = kind_of(peek_next_question(interview_data))
+        payload = rpc_payload("first_request" if turn == 0 else f"Answer number {turn}.")
+        await asyncio.sleep(args.answer_time)
+        await confirm_answer(payload, session=session)
+        by_kind.setdefault(kind, []).append(interview_data.latency_probe.samples["confirm_answer"][-1])
+        turn += 1
+    return by_kind
+
+
+async def main(args):
+    before = await run(args, prefetch=False)
+    after = await run(args, prefetch=True)
+    print(f"{'question type':>20} {'no prefetch p50':>16} {'prefetch p50':>13}")
+    for kind in sorted(before):
+        print(
+            f"{kind:>20} {percentile(before[kind], 50) * 1000:13.0f} ms"
+            f" {percentile(after.get(kind, []), 50) * 1000:10.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-ttft", type=float, default=0.6)
+    parser.add_argument("--tts-ttfb", type=float, default=0.25)
+    parser.add_argument("--speech", type=float, default=0.5)
+    parser.add_argument("--answer-time", type=float, default=1.5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,69 @@
+"""
+Job start to agent-ready, with and without the prewarm stage.
+
+Each job runs the real entrypoint against the fakes from load_test.py, with
+the real silero VAD. Before every job the per-process caches (question bank,
+bank vectors) are cleared, as in a fresh job process. Then:
+
+- cold: nothing is prewarmed. The VAD, the plugin clients and the question
+  bank load inside the job, as before the prewarm hook existed.
+- warm: main.prewarm runs first, as it does in an idle process before that
+  process is handed a job. It is timed separately and is not part of the
+  job's latency.
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_prewarm.py --jobs 10
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeJobContext
+from benchmarks.load_test import _current_job, install_fakes
+import main
+from data_class import question_bank
+from telemetry.latency_probe import percentile
+
+
+def fresh_process():
+    question_bank._bank = None
+    question_bank._last_check = 0.0
+
+
+async def run_job(index: int, prewarmed: bool, prewarm_times: list[float]) -> float:
+    fresh_process()
+    ctx = FakeJobContext(f"prewarm-{index}", {"candidate_id": f"candidate-{index}"})
+    if prewarmed:
+        start = time.perf_counter()
+        main.prewarm(ctx.proc)
+        prewarm_times.append(time.perf_counter() - start)
+    _current_job.set({})
+    job_started = time.perf_counter()
+    await main.entrypoint(ctx)
+    ready_at = next(at for at, payload in ctx.room.local_participant.published if payload == b"agent-ready")
+    await ctx.shutdown()
+    return ready_at - job_started
+
+
+async def run(args):
+    install_fakes(SimpleNamespace(
+        agent_switch=0.005, speech=0.5, stt_latency=0.2, llm_ttft=0.4, tts_ttfb=0.15,
+        real_stores=False, store_latency=0.002,
+    ))
+    prewarm_times: list[float] = []
+    print(f"{'':>6} {'p50':>9} {'p99':>9} {'max':>9}   job start -> agent-ready, {args.jobs} jobs")
+    for mode, prewarmed in (("cold", False), ("warm", True)):
+        ready = [await run_job(i, prewarmed, prewarm_times) for i in range(args.jobs)]
+        print(f"{mode:>6} " + " ".join(f"{v * 1000:6.0f} ms" for v in (percentile(ready, 50), percentile(ready, 99), max(ready))))
+    print(f"\nprewarm (in the idle process, before the job): median {percentile(prewarm_times, 50) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=10)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,94 @@
+"""
+Per-session question selection over a synthetic question bank.
+
+"before" is the old path: read and parse questions.json, then scan the whole
+bank once per difficulty. "after" uses the per-worker indexed QuestionBank.
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_question_bank.py --questions 100000 --sessions 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import NUM_EASY, NUM_MEDIUM, NUM_HARD
+from data_class.question_bank import DIFFICULTIES, QuestionBank
+
+ROLES = ("frontend", "backend", "data", "devops", "mobile")
+TAGS = ("javascript", "react", "python", "sql", "networking", "testing", "design")
+
+
+def synthetic_bank(n: int) -> list[dict]:
+    rng = random.Random(42)
+    return [
+        {
+            "question": f"Synthetic question {i} about {rng.choice(TAGS)}?",
+            "difficulty": rng.choice(DIFFICULTIES),
+            "role": rng.choice(ROLES),
+            "tags": rng.sample(TAGS, 2),
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_select(path: str) -> list[dict]:
+    with open(path, 'r') as file:
+        question_bank = json.load(file)
+    easy_qs = [q for q in question_bank if q['difficulty'] == 'basic']
+    medium_qs = [q for q in question_bank if q['difficulty'] == 'intermediate']
+    hard_qs = [q for q in question_bank if q['difficulty'] == 'advanced']
+    selected = []
+    selected.extend(random.sample(easy_qs, min(NUM_EASY, len(easy_qs))))
+    selected.extend(random.sample(medium_qs, min(NUM_MEDIUM, len(medium_qs))))
+    selected.extend(random.sample(hard_qs, min(NUM_HARD, len(hard_qs))))
+    return selected
+
+
+def indexed_select(bank: QuestionBank, tag=None) -> list[dict]:
+    return (
+        bank.sample('basic', NUM_EASY, tag)
+        + bank.sample('intermediate', NUM_MEDIUM, tag)
+        + bank.sample('advanced', NUM_HARD, tag)
+    )
+
+
+def per_session(fn, sessions: int) -> float:
+    start = time.perf_counter()
+    for _ in range(sessions):
+        fn()
+    return (time.perf_counter() - start) / sessions
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "questions.json")
+        with open(path, "w") as fp:
+            json.dump(synthetic_bank(args.questions), fp)
+
+        start = time.perf_counter()
+        bank = QuestionBank.load(path)
+        load = time.perf_counter() - start
+
+        before = per_session(lambda: legacy_select(path), args.legacy_sessions)
+        after = per_session(lambda: indexed_select(bank), args.sessions)
+        after_tag = per_session(lambda: indexed_select(bank, "frontend"), args.sessions)
+
+    print(f"bank size              : {args.questions} questions")
+    print(f"one-time load + index  : {load * 1000:10.1f} ms per worker")
+    print(f"before (per session)   : {before * 1000:10.3f} ms")
+    print(f"after  (per session)   : {after * 1000:10.3f} ms")
+    print(f"after, role filter     : {after_tag * 1000:10.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--legacy-sessions", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,108 @@
+"""
+Cost of the semantic repeat check on the turn's critical path.
+
+Builds the per-worker bank vectors once, seeds a session index with a
+returning candidate's earlier questions, then times is_duplicate for
+candidate questions, find_replacement when one repeats, and the incremental
+add of each asked question. Then reloads the bank file, as an edit of
+questions.json does, and reports the longest event loop stall while a
+session keeps checking questions. Also lists which questions.json pairs the
+configured threshold treats as the same question.
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_question_dedupe.py --questions 100000 --previous 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_question_bank import synthetic_bank
+from config.config import QUESTION_DUPLICATE_THRESHOLD, QUESTION_BANK_PATH
+from data_class import question_bank
+from data_class.question_bank import QuestionBank, get_question_bank
+from data_class.question_index import QuestionIndex, embed, find_replacement, get_bank_vectors
+
+
+def per_call_us(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def reload_stall(questions: list[dict]) -> tuple[float, float]:
+    """Longest gap between a session's repeat checks, and the reload's length."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "questions.json")
+        with open(path, "w") as fp:
+            json.dump(questions, fp)
+        question_bank._bank, question_bank.QUESTION_BANK_RELOAD_INTERVAL = None, 0
+        old = get_question_bank(path)
+        os.utime(path, (old.mtime + 1, old.mtime + 1))
+        asked = QuestionIndex()
+        asked.add([q["question"] for q in questions[:50]])
+        started = last = time.perf_counter()
+        stall = 0.0
+        while get_question_bank(path) is old:
+            asked.is_duplicate(questions[0]["question"])
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall, last = max(stall, now - last), now
+        return stall, time.perf_counter() - started
+
+
+def bank_pairs(path: str):
+    with open(path, "r") as fp:
+        texts = [q["question"] for q in json.load(fp)]
+    vectors = embed(texts)
+    similarity = vectors @ vectors.T
+    print(f"\nquestions.json pairs at or above {QUESTION_DUPLICATE_THRESHOLD}:")
+    for i in range(len(texts)):
+        for j in range(i + 1, len(texts)):
+            if similarity[i, j] >= QUESTION_DUPLICATE_THRESHOLD:
+                print(f"  {similarity[i, j]:.2f}  {texts[i]}  |  {texts[j]}")
+
+
+def main(args):
+    bank = QuestionBank(synthetic_bank(args.questions))
+    start = time.perf_counter()
+    get_bank_vectors(bank)
+    build = time.perf_counter() - start
+
+    rng = random.Random(0)
+    previous = [q["question"] for q in rng.sample(bank.questions, args.previous)]
+    asked = QuestionIndex()
+    start = time.perf_counter()
+    asked.add(previous)
+    seed = time.perf_counter() - start
+
+    candidates = [q["question"] for q in rng.sample(bank.questions, 1000)]
+    check = per_call_us(lambda i: asked.is_duplicate(candidates[i % len(candidates)]), args.calls)
+    repeats = [q for q in bank.questions if q["question"] in set(previous[:50])]
+    replace = per_call_us(lambda i: find_replacement(bank, repeats[i % len(repeats)], asked), args.calls)
+    grow = QuestionIndex()
+    add = per_call_us(lambda i: grow.add([candidates[i % len(candidates)]]), args.calls)
+
+    print(f"bank vectors (once per worker) : {build * 1000:8.1f} ms for {args.questions} questions")
+    print(f"seed {args.previous} earlier questions    : {seed * 1000:8.2f} ms")
+    print(f"is_duplicate                   : {check:8.1f} us")
+    print(f"find_replacement               : {replace:8.1f} us")
+    print(f"add one asked question         : {add:8.1f} us")
+    stall, reload = asyncio.run(reload_stall(list(bank.questions)))
+    print(f"bank file reload               : {reload * 1000:8.1f} ms, longest event loop stall {stall * 1000:.1f} ms")
+    bank_pairs(QUESTION_BANK_PATH)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--previous", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,84 @@
+"""
+Throughput of the offline scoring pipeline (refer: scoring/pipeline.py).
+
+Writes N synthetic completed interviews in the transcript sink's JSONL format
+to a temporary folder, then scores them with the stub backend, whose
+--latency stands in for one LLM round trip. For each batch size and worker
+count it reports the backend calls made, interviews scored per second and
+the share of answers left unscored. Loading and batching are timed on their own.
+
+Batch size 1 is one call per answer; the live summary this replaces was one
+call per interview, kept in the candidate's session.
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_scoring.py --interviews 200 --batch-sizes 1 10 40 --workers 1 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_class.question_bank import get_question_bank
+from scoring.pipeline import build_items, load_interviews, run
+
+FILLER = ("so", "basically", "in my project", "we used it for", "I think", "for example", "which means")
+
+
+def answer_for(rng: random.Random, question: dict) -> str:
+    if rng.random() < 0.1:
+        return "[Question Skipped]"
+    words = " ".join(rng.sample(question.get("rubric", []), k=min(2, len(question.get("rubric", [])))))
+    return " ".join(rng.choice(FILLER) + " " + words for _ in range(rng.randint(1, 3)))
+
+
+def write_transcripts(directory: str, count: int, turns: int):
+    bank = get_question_bank()
+    for index in range(count):
+        rng = random.Random(index)
+        with open(os.path.join(directory, f"session-{index}.jsonl"), "w", encoding="utf-8") as fp:
+            for _ in range(turns):
+                question = rng.choice(bank.questions)
+                fp.write(json.dumps({"type": "qna", "question": question["question"], "answer": answer_for(rng, question)}) + "\n")
+            fp.write(json.dumps({"type": "end", "candidate_id": f"candidate-{index % 50}"}) + "\n")
+
+
+async def bench(directory: str, batch_size: int, workers: int, latency: float):
+    interviews = load_interviews(directory, [])
+    started = time.perf_counter()
+    documents, calls = await run(
+        interviews, "stub", backend_options={"latency": latency}, batch_size=batch_size, workers=workers,
+    )
+    elapsed = time.perf_counter() - started
+    answers = sum(len(doc["answers"]) for doc in documents)
+    unscored = sum(a["score"] is None for doc in documents for a in doc["answers"])
+    print(f"{batch_size:>6} {workers:>8} {calls:>7} {len(documents) / elapsed:>14.1f} {elapsed:>9.2f} {unscored / answers:>9.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interviews", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 40])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per backend call")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_transcripts(directory, args.interviews, args.turns)
+        start = time.perf_counter()
+        interviews = load_interviews(directory, [])
+        loaded = time.perf_counter() - start
+        start = time.perf_counter()
+        items, _ = build_items(interviews, get_question_bank())
+        built = time.perf_counter() - start
+        print(f"{len(interviews)} interviews, {len(items)} answers: load {loaded * 1e3:.1f} ms, batch {built * 1e3:.1f} ms")
+        print(f"{'batch':>6} {'workers':>8} {'calls':>7} {'interviews/s':>14} {'seconds':>9} {'unscored':>9}")
+        for workers in args.workers:
+            for batch_size in args.batch_sizes:
+                asyncio.run(bench(directory, batch_size, workers, args.latency))
@@ -0,0 +1,100 @@
+"""
+Per-session memory of the interview state, measured with tracemalloc.
+
+Builds N sessions the way a worker holds them: an InterviewData with a resume
+and a resume question pool, walked through --turns turns (decision, answer
+recorded, question remembered as the RPC turn does). Reports the traced bytes
+per session, the allocation sites that dominate, and the size and cost of a
+session snapshot (refer: data_class/session_snapshot.py).
+
+Plugins, agents and their chat contexts are not included; they belong to the
+LiveKit session and are bounded separately (refer: data_class/context_window.py).
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_session_memory.py --sessions 100 1000 --turns 12
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_class.interview_data import InterviewData, get_next_question, record_answer
+from data_class.interview_state import InterviewPrompt
+from data_class.question_bank import get_question_bank
+from data_class.question_index import question_text
+from data_class.session_snapshot import restore, snapshot
+
+WORDS = ("state", "render", "closure", "promise", "hook", "cache", "event", "scope", "queue", "effect",
+         "component", "server", "request", "index", "memory", "thread", "value", "object", "array", "function")
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def build_session(index: int, turns: int) -> InterviewData:
+    rng = random.Random(index)
+    interview_data = InterviewData(session_id=f"session-{index}", resume_data=text(rng, 600))
+    interview_data.resume_questions = [
+        {"section": "Experience", "question": text(rng, 18) + "?"} for _ in range(8)
+    ]
+    for _ in range(turns):
+        decision = get_next_question(interview_data)
+        if decision == InterviewPrompt.INTERVIEW_END:
+            break
+        if interview_data.last_question:
+            record_answer(interview_data, interview_data.last_question, text(rng, rng.randint(40, 120)))
+        # As remember_asked_question: exact questions are kept by reference, generated ones as text
+        interview_data.last_question = decision if isinstance(decision, dict) else text(rng, 15) + "?"
+        interview_data.asked_index.add([question_text(interview_data.last_question)])
+    return interview_data
+
+
+def measure(count: int, turns: int, top: int):
+    get_question_bank()  # shared by every session of the worker, loaded before measuring
+    gc.collect()
+    tracemalloc.start(1)
+    before = tracemalloc.take_snapshot()
+    sessions = [build_session(i, turns) for i in range(count)]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "lineno")
+    total = sum(stat.size_diff for stat in stats)
+    print(f"\n{count} sessions, {turns} turns: {total / 1024 / 1024:.2f} MiB traced, {total / count / 1024:.1f} KiB per session")
+    for stat in stats[:top]:
+        frame = stat.traceback[0]
+        where = f"{os.path.relpath(frame.filename)}:{frame.lineno}"
+        print(f"  {stat.size_diff / count:9.0f} B/session  {where}")
+    return sessions
+
+
+def snapshot_cost(interview_data: InterviewData, calls: int):
+    start = time.perf_counter()
+    for _ in range(calls):
+        payload = json.dumps(snapshot(interview_data))
+    dump = (time.perf_counter() - start) / calls
+    start = time.perf_counter()
+    for _ in range(calls):
+        restore(InterviewData(session_id=interview_data.session_id), json.loads(payload))
+    load = (time.perf_counter() - start) / calls
+    print(f"\nsnapshot: {len(payload)} bytes, snapshot + json {dump * 1e6:.0f} us, json + restore {load * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+    sessions = []
+    for count in args.sessions:
+        sessions = measure(count, args.turns, args.top)
+    snapshot_cost(sessions[-1], 200)
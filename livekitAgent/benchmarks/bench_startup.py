@@ -0,0 +1,82 @@
+"""
+Worker startup cost: `python -X importtime` for the agent modules plus the
+time a fresh process needs before it can run its first job.
+
+"time-to-first-job" covers interpreter start, importing the worker modules
+and building the per-session InterviewData, all in a new process, which is
+what every (prewarmed) job process pays before it can accept a job.
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_startup.py --module RPC.agent_rpc --runs 5 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_JOB_SNIPPET = """
+import time, json
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+from data_class.interview_data import InterviewData
+InterviewData()
+t2 = time.perf_counter()
+print(json.dumps({{"import": t1 - t0, "first_job": t2 - t0}}))
+"""
+
+
+def import_times(module: str) -> list[tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, module) rows from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=AGENT_DIR, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def time_to_first_job(module: str) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", FIRST_JOB_SNIPPET.format(module=module)],
+        cwd=AGENT_DIR, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_wall"] = wall
+    return result
+
+
+def main(args):
+    rows = import_times(args.module)
+    total_us = max(cumulative for _, cumulative, _ in rows)
+    print(f"import {args.module}: {total_us / 1000:.1f} ms cumulative")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+
+    runs = [time_to_first_job(args.module) for _ in range(args.runs)]
+    print()
+    for key in ("import", "first_job", "process_wall"):
+        values = [r[key] * 1000 for r in runs]
+        print(f"{key:>13}: median {statistics.median(values):8.1f} ms   max {max(values):8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="RPC.agent_rpc",
+                        help="entry module to import; main imports the LiveKit plugins and falls back to cartesia TTS without the custom TTS module")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    main(parser.parse_args())
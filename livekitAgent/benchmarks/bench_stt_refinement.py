@@ -0,0 +1,81 @@
+"""
+Streaming STT refinement against the LLM pass it replaces.
+
+Each corpus line is a recorded utterance, {"text": ..., "confidence": ...}.
+Utterances are split into segments the way the STT finalizes them and fed to
+StreamingRefiner as they "arrive"; only the work left after the last segment
+is on the end-of-turn path. Reports that cost, how often the LLM is still
+called and why, and the modeled end-of-turn delay before (an LLM pass on
+every utterance) and after (the LLM only when the refiner is unsure).
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_stt_refinement.py --llm-latency 0.6 --show
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Agent.transcript_refiner import StreamingRefiner
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "stt_transcripts.jsonl")
+
+
+def load_corpus(path: str) -> list[dict]:
+    with open(path, "r") as fp:
+        return [json.loads(line) for line in fp if line.strip()]
+
+
+def segments(text: str, size: int) -> list[str]:
+    words = text.split()
+    return [" ".join(words[i:i + size]) for i in range(0, len(words), size)] or [""]
+
+
+def main(args):
+    corpus = load_corpus(args.corpus)
+    refiner = StreamingRefiner()
+    feed_times, finish_times, reasons, results = [], [], Counter(), []
+    for _ in range(args.repeat):
+        results.clear()
+        for utterance in corpus:
+            for segment in segments(utterance["text"], args.segment_words):
+                start = time.perf_counter()
+                refiner.feed(segment, utterance.get("confidence"))
+                feed_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            result = refiner.finish(utterance["text"])
+            finish_times.append(time.perf_counter() - start)
+            results.append((utterance, result))
+
+    llm_calls = [result for _, result in results if not result.confident]
+    reasons.update(reason for result in llm_calls for reason in result.reasons)
+    finish_times.sort()
+    rate = len(llm_calls) / len(results)
+    before = args.llm_latency
+    after = finish_times[len(finish_times) // 2] + rate * args.llm_latency
+
+    print(f"{len(corpus)} utterances, segments of {args.segment_words} words, {args.repeat} passes")
+    print(f"feed per segment (off the end-of-turn path): {sum(feed_times) / len(feed_times) * 1e6:8.1f} us")
+    print(f"finish p50 / p99 (on it)                   : {finish_times[len(finish_times) // 2] * 1e6:8.1f} / {finish_times[int(len(finish_times) * 0.99)] * 1e6:.1f} us")
+    print(f"LLM calls                                  : {len(llm_calls)}/{len(results)} ({rate:.0%}), before: {len(results)}/{len(results)}")
+    print(f"LLM-call reasons                           : {dict(reasons)}")
+    print(f"modeled mean end-of-turn refinement delay  : {before * 1000:.0f} ms before, {after * 1000:.0f} ms after (LLM {args.llm_latency * 1000:.0f} ms)")
+    if args.show:
+        print()
+        for utterance, result in results:
+            marker = "LLM  " if not result.confident else "rules"
+            print(f"[{marker}] {utterance['text']}\n        -> {result.text}  {result.reasons or ''}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--segment-words", type=int, default=8)
+    parser.add_argument("--llm-latency", type=float, default=0.6, help="seconds for one refining LLM turn")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--show", action="store_true", help="print every refinement")
+    main(parser.parse_args())
@@ -0,0 +1,85 @@
+"""
+RPC -> first TTS audio, per turn, with a fake session whose LLM/TTS latencies
+are fixed, so only the agent-switching overhead changes between runs.
+
+"before" replays the old fixed-sleep switching (0.1 s after update_agent,
+0.5 s after the reply); "after" runs the real confirm_answer handler.
+
+Run from the livekitAgent folder:
+    python benchmarks/bench_turn_latency.py --turns 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livekit.agents import ChatContext
+from benchmarks.fakes import FakeSession, FakeTimings, rpc_payload
+from Agent.agent import BaseAgent, STTRefiningAgent
+from config.config import INTERVIEW_INSTRUCTIONS, STT_REFINING_INSTRUCTIONS
+from data_class.interview_data import InterviewData, get_next_question
+from RPC.agent_rpc import confirm_answer
+from telemetry.latency_probe import TurnLatencyProbe, percentile
+
+
+async def legacy_confirm_answer(payload, session):
+    interview_data = session.userdata
+    interview_data.latency_probe.mark_rpc("confirm_answer")
+    history = getattr(session, "legacy_history", None)
+    if history is None:
+        history = ChatContext()
+    if payload.payload != "first_request":
+        history.add_message(role="user", content=payload.payload)
+    refining_agent = session.current_agent
+    session.update_agent(BaseAgent(
+        instructions=INTERVIEW_INSTRUCTIONS.format(resume_data=interview_data.resume_data),
+        chat_context=history,
+    ))
+    await asyncio.sleep(0.1)
+    get_next_question(interview_data)
+    await session.generate_reply(instructions="Ask the next question.")
+    await asyncio.sleep(0.5)
+    session.legacy_history = session.current_agent.chat_ctx.copy()
+    session.update_agent(refining_agent)
+
+
+async def run(handler, turns: int, timings: FakeTimings) -> tuple[list[float], list[float]]:
+    interview_data = InterviewData(resume_data="Synthetic resume for benchmarking.")
+    session = FakeSession(interview_data, timings)
+    interview_data.refining_agent = STTRefiningAgent(instructions=STT_REFINING_INSTRUCTIONS)
+    interview_data.latency_probe = TurnLatencyProbe(session)
+    await session.start(agent=interview_data.refining_agent)
+
+    totals = []
+    for turn in range(turns):
+        payload = rpc_payload("first_request" if turn == 0 else f"Answer number {turn}.")
+        start = time.perf_counter()
+        await handler(payload, session=session)
+        totals.append(time.perf_counter() - start)
+    return list(interview_data.latency_probe.samples["confirm_answer"]), totals
+
+
+def report(label: str, first_audio: list[float], totals: list[float]):
+    print(
+        f"{label:7}: first audio p50 {percentile(first_audio, 50) * 1000:7.1f} ms"
+        f"  p90 {percentile(first_audio, 90) * 1000:7.1f} ms"
+        f"  | RPC total p50 {percentile(totals, 50) * 1000:7.1f} ms"
+    )
+
+
+async def main(args):
+    timings = FakeTimings(llm_ttft=args.llm_ttft, tts_ttfb=args.tts_ttfb, speech=args.speech)
+    report("before", *await run(legacy_confirm_answer, args.turns, timings))
+    report("after", *await run(confirm_answer, args.turns, timings))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--llm-ttft", type=float, default=0.3)
+    parser.add_argument("--tts-ttfb", type=float, default=0.15)
+    parser.add_argument("--speech", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,253 @@
+"""
+In-process stand-ins for the LiveKit pieces the agent touches (job context,
+room, participants, AgentSession) and deterministic STT/LLM/TTS plugins with
+configurable latencies.
+
+They are only meant for benchmarks: the entrypoint and RPC handlers run
+unchanged, while the fakes decide how long "hearing", "thinking" and
+"speaking" take.
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional
+
+
+@dataclass
+class FakeTimings:
+    agent_switch: float = 0.005   # update_agent -> new agent's on_enter
+    llm_ttft: float = 0.300       # generate_reply -> first LLM token
+    tts_ttfb: float = 0.150       # first token -> first audio byte
+    speech: float = 1.500         # length of the spoken reply
+
+
+class EventEmitter:
+    def __init__(self):
+        self._handlers: dict[str, list] = {}
+
+    def on(self, event: str, callback=None):
+        if callback is None:
+            def decorator(fn):
+                self._handlers.setdefault(event, []).append(fn)
+                return fn
+            return decorator
+        self._handlers.setdefault(event, []).append(callback)
+        return callback
+
+    def emit(self, event: str, ev):
+        for handler in list(self._handlers.get(event, ())):
+            handler(ev)
+
+
+#----------------------------Plugins--------------------------------
+class _FakeStream:
+    def __init__(self, items, delay: float):
+        self._items = items
+        self._delay = delay
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        await asyncio.sleep(self._delay)
+        for item in self._items:
+            yield item
+
+
+class FakeSTT:
+    """Turns a candidate utterance into a transcript after `latency` seconds."""
+
+    def __init__(self, latency: float = 0.2):
+        self.latency = latency
+        self.calls = 0
+
+    async def recognize(self, text: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return text
+
+
+class FakeLLM:
+    """llm.chat(chat_ctx=...) stand-in: one chunk after `ttft` seconds.
+    Requests asking for a JSON array (the resume question pool) get one."""
+
+    def __init__(self, ttft: float = 0.3, text: str = "Tell me about a project on your resume?"):
+        self.ttft = ttft
+        self.text = text
+        self.calls = 0
+
+    def _reply_for(self, chat_ctx) -> str:
+        items = getattr(chat_ctx, "items", None) or []
+        prompt = (getattr(items[0], "text_content", "") or "") if items else ""
+        if "JSON array" in prompt:
+            return json.dumps([{"section": "Experience", "question": f"{self.text} ({i})"} for i in range(8)])
+        return self.text
+
+    def chat(self, *, chat_ctx=None, **kwargs):
+        self.calls += 1
+        chunk = SimpleNamespace(delta=SimpleNamespace(content=self._reply_for(chat_ctx)))
+        return _FakeStream([chunk], self.ttft)
+
+
+class FakeTTS:
+    """tts.synthesize(text) stand-in: frames after `ttfb` seconds."""
+
+    def __init__(self, ttfb: float = 0.15, frames: int = 10):
+        self.ttfb = ttfb
+        self.frames = frames
+        self.calls = 0
+
+    def synthesize(self, text: str, **kwargs):
+        self.calls += 1
+        return _FakeStream([SimpleNamespace(frame=b"\0" * 960) for _ in range(self.frames)], self.ttfb)
+
+
+#----------------------------Session--------------------------------
+class FakeSpeechHandle:
+    def __init__(self, task: asyncio.Task):
+        self._task = task
+
+    async def wait_for_playout(self):
+        await asyncio.shield(self._task)
+
+    def done(self) -> bool:
+        return self._task.done()
+
+    def __await__(self):
+        return self.wait_for_playout().__await__()
+
+
+class FakeSession(EventEmitter):
+    """Mimics AgentSession.update_agent / generate_reply / say timing. LLM and
+    TTS latencies come from the fake plugins when given, else from `timings`."""
+
+    def __init__(self, userdata, timings: Optional[FakeTimings] = None, *, stt=None, llm=None, tts=None, vad=None):
+        super().__init__()
+        self.userdata = userdata
+        self.timings = timings or FakeTimings()
+        self.stt = stt
+        self.llm = llm
+        self.tts = tts
+        self.vad = vad
+        self.current_agent = None
+        self.llm_calls = 0
+        self._switch: Optional[asyncio.Task] = None
+
+    @property
+    def _llm_ttft(self) -> float:
+        return self.llm.ttft if self.llm is not None else self.timings.llm_ttft
+
+    @property
+    def _tts_ttfb(self) -> float:
+        return self.tts.ttfb if self.tts is not None else self.timings.tts_ttfb
+
+    #----------------------------Agents--------------------------------
+    def update_agent(self, agent):
+        previous = self._switch
+        self._switch = asyncio.create_task(self._activate(agent, previous))
+
+    async def _activate(self, agent, previous: Optional[asyncio.Task]):
+        if previous is not None:
+            await previous
+        old = self.current_agent
+        if old is not None and hasattr(old, "on_exit"):
+            await old.on_exit()
+        await asyncio.sleep(self.timings.agent_switch)
+        self.current_agent = agent
+        if hasattr(agent, "on_enter"):
+            await agent.on_enter()
+
+    async def start(self, agent, room=None):
+        self.update_agent(agent)
+        await self._switch
+
+    #----------------------------Speech--------------------------------
+    def _set_state(self, old: str, new: str):
+        self.emit("agent_state_changed", SimpleNamespace(old_state=old, new_state=new))
+
+    def _commit(self, agent, text: str):
+        agent._chat_ctx.add_message(role="assistant", content=text)
+        self.emit("conversation_item_added", SimpleNamespace(item=agent._chat_ctx.items[-1]))
+
+    async def _speak(self, text: str, think: float, synth: float):
+        agent = self.current_agent
+        self._set_state("listening", "thinking")
+        await asyncio.sleep(think)
+        await asyncio.sleep(synth)
+        self._set_state("thinking", "speaking")
+        await asyncio.sleep(self.timings.speech)
+        self._commit(agent, text)
+        self._set_state("speaking", "listening")
+
+    def generate_reply(self, *, instructions: str = "", user_input: Optional[str] = None, **kwargs):
+        self.llm_calls += 1
+        if user_input is not None:
+            self.current_agent._chat_ctx.add_message(role="user", content=user_input)
+        text = f"[reply] {instructions[:60]}"
+        task = asyncio.create_task(self._speak(text, self._llm_ttft, self._tts_ttfb))
+        return FakeSpeechHandle(task)
+
+    def say(self, text: str, *, audio=None, **kwargs):
+        # Pre-synthesized audio skips the TTS time to first byte as well
+        synth = 0.0 if audio is not None else self._tts_ttfb
+        task = asyncio.create_task(self._speak(text, 0.0, synth))
+        return FakeSpeechHandle(task)
+
+    async def user_turn(self, utterance: str):
+        """The candidate speaks: STT, then the current (refining) agent replies."""
+        transcript = await self.stt.recognize(utterance) if self.stt is not None else utterance
+        await self.generate_reply(user_input=transcript)
+
+
+#----------------------------Job / room--------------------------------
+class FakeLocalParticipant:
+    def __init__(self):
+        self.rpc_handlers: dict[str, object] = {}
+        self.published: list[tuple[float, bytes]] = []
+
+    def register_rpc_method(self, method: str, handler):
+        self.rpc_handlers[method] = handler
+
+    async def publish_data(self, payload: bytes, **kwargs):
+        self.published.append((time.perf_counter(), payload))
+
+    async def perform_rpc(self, method: str, payload: str, caller_identity: str = "candidate"):
+        """What the candidate's browser does: invoke one of the agent's RPC methods."""
+        data = SimpleNamespace(payload=payload, caller_identity=caller_identity, request_id=f"{method}-{time.perf_counter_ns()}", response_timeout=30.0)
+        return await self.rpc_handlers[method](data)
+
+
+class FakeRoom:
+    def __init__(self, name: str):
+        self.name = name
+        self.local_participant = FakeLocalParticipant()
+
+
+class FakeJobContext:
+    def __init__(self, room_name: str, candidate_attributes: Optional[dict] = None):
+        self.room = FakeRoom(room_name)
+        self._participant = SimpleNamespace(identity=f"{room_name}-candidate", attributes=candidate_attributes or {})
+        self.proc = SimpleNamespace(userdata={})  # JobProcess; filled by main.prewarm when prewarmed
+        self._shutdown_callbacks = []
+
+    async def connect(self):
+        await asyncio.sleep(0)
+
+    async def wait_for_participant(self):
+        return self._participant
+
+    def add_shutdown_callback(self, callback):
+        self._shutdown_callbacks.append(callback)
+
+    async def shutdown(self):
+        for callback in self._shutdown_callbacks:
+            await callback()
+
+
+def rpc_payload(text: str):
+    return SimpleNamespace(payload=text)
@@ -0,0 +1,275 @@
+"""
+Multi-session load test: N concurrent simulated candidates in one worker
+process, each driven through the real entrypoint and RPC handlers
+(confirm_answer / skip_question) with LiveKit, STT, LLM and TTS replaced by the
+deterministic fakes in benchmarks/fakes.py. The resume store and the resume
+question cache are in-memory unless --real-stores is given, and transcripts go
+to a temporary folder.
+
+Reports per-turn latency percentiles, event loop lag, CPU time, peak RSS and
+throughput, and writes the same numbers as JSON so runs on different commits
+can be compared.
+
+Run from the livekitAgent folder:
+    python benchmarks/load_test.py --sessions 50 --llm-ttft 0.4 --output load.json
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeJobContext, FakeLLM, FakeSession, FakeSTT, FakeTTS, FakeTimings
+import main
+from data_class import interview_data as interview_data_module, resume_questions, session_snapshot
+from data_class.interview_data import peek_next_question
+from data_class.interview_state import InterviewPrompt
+from telemetry.latency_probe import percentile
+from transcript import transcript_sink
+
+RESUME = """Experience:
+Backend engineer, built a payments API in Python and Postgres.
+
+Projects:
+Realtime chat app with websockets and Redis pub/sub.
+"""
+
+# Each simulated candidate runs in its own task; create_session hands the
+# session it built back to that task through this slot.
+_current_job: contextvars.ContextVar[dict] = contextvars.ContextVar("current_job")
+
+
+#----------------------------Instrumentation--------------------------------
+class LoopLagMonitor:
+    """Samples how late a periodic wake-up fires: a direct read of event loop congestion."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - expected))
+
+    def stop(self):
+        self._task.cancel()
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def describe(values: list[float]) -> dict:
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 50) * 1000,
+        "p90_ms": percentile(values, 90) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": max(values, default=0.0) * 1000,
+    }
+
+
+#----------------------------Environment--------------------------------
+def install_fakes(args):
+    """Swap the network-bound pieces of main for in-process fakes."""
+    timings = FakeTimings(agent_switch=args.agent_switch, speech=args.speech)
+
+    def create_plugins():
+        return {"stt": FakeSTT(args.stt_latency), "llm": FakeLLM(args.llm_ttft), "tts": FakeTTS(args.tts_ttfb)}
+
+    def create_session(interview_data, warm):
+        # Same fallbacks as main.create_session: an unprewarmed process loads the real VAD here
+        plugins = warm.get("plugins") or create_plugins()
+        session = FakeSession(interview_data, timings, vad=warm.get("vad") or main.silero.VAD.load(), **plugins)
+        _current_job.get()["session"] = session
+        return session
+
+    main.create_plugins = create_plugins
+    main.create_session = create_session
+
+    transcript_dir = tempfile.mkdtemp(prefix="load_test_transcripts_")
+    transcript_sink.BACKENDS["file"] = lambda: transcript_sink.FileBackend(transcript_dir)
+
+    if args.real_stores:
+        return
+    pools: dict[tuple[str, str], list] = {}
+    asked: dict[str, list[str]] = {}
+    snapshots: dict[str, str] = {}
+
+    async def get_latest_resume(candidate_id):
+        if not isinstance(candidate_id, str):
+            candidate_id = await candidate_id
+        await asyncio.sleep(args.store_latency)
+        return RESUME
+
+    async def get_resume_questions(candidate_id, digest):
+        await asyncio.sleep(args.store_latency)
+        return pools.get((candidate_id, digest))
+
+    async def set_resume_questions(candidate_id, digest, questions):
+        await asyncio.sleep(args.store_latency)
+        pools[(candidate_id, digest)] = questions
+
+    async def get_asked_questions(candidate_id):
+        await asyncio.sleep(args.store_latency)
+        return list(asked.get(candidate_id, ()))
+
+    async def add_asked_questions(candidate_id, questions):
+        await asyncio.sleep(args.store_latency)
+        asked.setdefault(candidate_id, []).extend(questions)
+
+    async def get_session_snapshot(session_id):
+        await asyncio.sleep(args.store_latency)
+        return json.loads(snapshots[session_id]) if session_id in snapshots else None
+
+    async def set_session_snapshot(session_id, snapshot):
+        await asyncio.sleep(args.store_latency)
+        snapshots[session_id] = json.dumps(snapshot)
+
+    async def delete_session_snapshot(session_id):
+        snapshots.pop(session_id, None)
+
+    main.get_latest_resume = get_latest_resume
+    resume_questions.getResumeQuestions = get_resume_questions
+    resume_questions.setResumeQuestions = set_resume_questions
+    interview_data_module.getAskedQuestions = get_asked_questions
+    interview_data_module.addAskedQuestions = add_asked_questions
+    session_snapshot.getSessionSnapshot = get_session_snapshot
+    session_snapshot.setSessionSnapshot = set_session_snapshot
+    session_snapshot.deleteSessionSnapshot = delete_session_snapshot
+
+
+#----------------------------One candidate--------------------------------
+async def run_candidate(index: int, args, results: dict, warm: dict):
+    rng = random.Random(args.seed + index)
+    # Spread joins over --ramp seconds instead of a thundering herd
+    await asyncio.sleep(rng.uniform(0, args.ramp))
+    ctx = FakeJobContext(f"load-{index}", {"candidate_id": f"candidate-{index % args.candidates}"})
+    ctx.proc.userdata = warm
+    job = {}
+    _current_job.set(job)
+    job_started = time.perf_counter()
+    await main.entrypoint(ctx)
+    session = job["session"]
+    ready_at = next(at for at, payload in ctx.room.local_participant.published if payload == b"agent-ready")
+    results["ready"].append(ready_at - job_started)
+
+    interview_data = session.userdata
+    lp = ctx.room.local_participant
+    turn = 0
+    while peek_next_question(interview_data) != InterviewPrompt.INTERVIEW_END and turn < args.max_turns:
+        if turn > 0:
+            # The candidate answers through STT and the refining agent, then confirms or skips
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * args.answer_time)
+            await session.user_turn(f"Answer {turn} from candidate {index}.")
+        method = "skip_question" if turn > 0 and rng.random() < args.skip_rate else "confirm_answer"
+        payload = "first_request" if turn == 0 else f"Answer {turn} from candidate {index}."
+        started = time.perf_counter()
+        await lp.perform_rpc(method, payload)
+        results["rpc"].setdefault(method, []).append(time.perf_counter() - started)
+        turn += 1
+
+    for method, samples in interview_data.latency_probe.samples.items():
+        results["first_audio"].setdefault(method, []).extend(samples)
+    results["turns"] += turn
+    await ctx.shutdown()
+
+
+async def run(args) -> dict:
+    install_fakes(args)
+    results = {"ready": [], "rpc": {}, "first_audio": {}, "turns": 0}
+    # Every session shares one job process, prewarmed before the first job as a worker's would be
+    warm = {}
+    main.prewarm(SimpleNamespace(userdata=warm))
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(run_candidate(i, args, results, warm) for i in range(args.sessions)),
+        return_exceptions=True,
+    )
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+    monitor.stop()
+
+    failures = [repr(outcome) for outcome in outcomes if isinstance(outcome, Exception)]
+    return {
+        "commit": git_commit(),
+        "config": vars(args),
+        "sessions": args.sessions,
+        "failed_sessions": len(failures),
+        "errors": failures[:10],
+        "turns": results["turns"],
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_per_turn_ms": cpu / max(results["turns"], 1) * 1000,
+        "turns_per_s": results["turns"] / wall if wall else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "job_start_to_ready": describe(results["ready"]),
+        "rpc_to_first_audio": {method: describe(v) for method, v in results["first_audio"].items()},
+        "rpc_total": {method: describe(v) for method, v in results["rpc"].items()},
+        "loop_lag": describe(monitor.lags),
+    }
+
+
+def print_report(report: dict):
+    print(f"commit {report['commit']}: {report['sessions']} sessions, {report['turns']} turns, "
+          f"{report['failed_sessions']} failed")
+    print(f"wall {report['wall_s']:.1f} s, cpu {report['cpu_s']:.2f} s "
+          f"({report['cpu_per_turn_ms']:.2f} ms/turn), {report['turns_per_s']:.1f} turns/s, "
+          f"peak RSS {report['peak_rss_mb']:.0f} MB")
+    rows = [("job start -> ready", report["job_start_to_ready"]), ("event loop lag", report["loop_lag"])]
+    rows += [(f"{m} first audio", s) for m, s in report["rpc_to_first_audio"].items()]
+    rows += [(f"{m} total", s) for m, s in report["rpc_total"].items()]
+    print(f"{'':>28} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for name, stats in rows:
+        print(f"{name:>28} " + " ".join(f"{stats[k]:6.0f} ms" for k in ("p50_ms", "p90_ms", "p99_ms", "max_ms")))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--candidates", type=int, default=10, help="distinct candidate ids (retakes share a pool)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which sessions join")
+    parser.add_argument("--max-turns", type=int, default=20)
+    parser.add_argument("--answer-time", type=float, default=1.0)
+    parser.add_argument("--skip-rate", type=float, default=0.1)
+    parser.add_argument("--stt-latency", type=float, default=0.2)
+    parser.add_argument("--llm-ttft", type=float, default=0.4)
+    parser.add_argument("--tts-ttfb", type=float, default=0.15)
+    parser.add_argument("--speech", type=float, default=0.5)
+    parser.add_argument("--agent-switch", type=float, default=0.005)
+    parser.add_argument("--store-latency", type=float, default=0.002)
+    parser.add_argument("--real-stores", action="store_true", help="use the configured Redis and Mongo")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2)
@@ -20,6 +20,9 @@ Do not generate new questions unless specifically instructed.
 Output format: Return only the question string — no symbols, no commentary, no formatting, no JSON. Just the question.
 """ 
 
+RESUME_QUESTION_INSTRUCTIONS = """Based on the candidate's resume, ask a relevant and specific question about their experience, skills, education, or projects.
+Vary the focus each time to cover different aspects of the resume and avoid repetition."""
+
 STT_REFINING_INSTRUCTIONS = """
 Your role is to refine the speech input (e.g., STT output) exactly as if the user is speaking.
 - Clean the input by removing repetitions, filler words, and speech disfluencies (e.g., "uh," "like," stutters), while keeping the original intent and tone.
@@ -29,7 +32,118 @@ Output format: A refined version of the user's input in the first person, as if
 """
 
 
+#Deterministic STT refinement; the LLM above is used only when the heuristic asks for it.
+#STT confidence below which, share of words removed above which, and length above which
+#a transcript goes to the LLM. refer: Agent/transcript_refiner.py
+STT_REFINE_LLM_FALLBACK=True
+STT_MIN_CONFIDENCE=0.6
+STT_MAX_REMOVED_RATIO=0.35
+STT_MAX_REFINE_WORDS=120
+
+
 #Configure Number of easy, medium and hard question to be asked using below varialbes respectively
 NUM_EASY=2
 NUM_MEDIUM=2
-NUM_HARD=1
\ No newline at end of file
+NUM_HARD=1
+
+#Candidate used when the participant does not publish a candidate_id attribute
+DEFAULT_CANDIDATE_ID="686b60d2a6601148142a968b"
+
+#Resume cache settings (seconds / entries), refer: redisLogic/redis_client.py
+RESUME_CACHE_TTL=24 * 60 * 60
+RESUME_NEGATIVE_CACHE_TTL=60
+RESUME_L1_CACHE_SIZE=256
+RESUME_L1_CACHE_TTL=300
+
+#Question bank file and how often (seconds) to check it for changes
+QUESTION_BANK_PATH="questions.json"
+QUESTION_BANK_RELOAD_INTERVAL=30
+
+#Transcript persistence: backend is one of "file", "redis", "mongo"
+TRANSCRIPT_BACKEND="file"
+TRANSCRIPT_DIR="transcripts"
+TRANSCRIPT_BATCH_SIZE=20
+TRANSCRIPT_FLUSH_INTERVAL=1.0
+
+#Seconds to wait for the session to activate an agent after update_agent
+AGENT_SWITCH_TIMEOUT=5.0
+
+#Interview chat-context window: turns kept verbatim, turns folded per summary,
+#and the token budget for the verbatim turns. refer: data_class/context_window.py
+CONTEXT_KEEP_TURNS=4
+CONTEXT_FOLD_BATCH=2
+CONTEXT_TOKEN_BUDGET=1500
+
+CONTEXT_SUMMARY_INSTRUCTIONS = """
+You maintain a running summary of a job interview for the interviewer.
+Merge the new turns into the summary so far. Keep, for every question: the topic, the gist of the candidate's answer, and notable strengths or gaps.
+Do not invent details. Be compact: at most 200 words.
+Output format: plain text only.
+"""
+
+#Interview plan: this pattern of (step, follow-ups) is repeated until every
+#predefined question is asked; a step is "predefined" or "resume". refer: data_class/interview_state.py
+INTERVIEW_PLAN=[("predefined", 1), ("resume", 1)]
+
+#Adaptive difficulty: choose each predefined question online from how the candidate
+#is doing instead of a fixed easy/medium/hard set. Levels are 0 basic, 1 intermediate,
+#2 advanced; each answer moves the level by up to ADAPTIVE_STEP. refer: data_class/adaptive_selector.py
+ADAPTIVE_DIFFICULTY=False
+ADAPTIVE_QUESTION_COUNT=NUM_EASY + NUM_MEDIUM + NUM_HARD
+ADAPTIVE_START_LEVEL=0.0
+ADAPTIVE_STEP=0.6
+ADAPTIVE_GOOD_ANSWER_WORDS=60
+
+#Question de-duplication: hashed n-gram vector size, cosine similarity above which two
+#questions count as the same, and bank questions tried when replacing a repeat.
+#refer: data_class/question_index.py
+QUESTION_INDEX_DIM=256
+QUESTION_DUPLICATE_THRESHOLD=0.7
+REPLACEMENT_CANDIDATES=16
+#Questions remembered per candidate across sessions, and for how long (seconds)
+ASKED_QUESTIONS_HISTORY=200
+ASKED_QUESTIONS_TTL=90 * 24 * 60 * 60
+
+#How long (seconds) the snapshot of an interrupted interview can still be resumed. refer: data_class/session_snapshot.py
+SESSION_SNAPSHOT_TTL=2 * 60 * 60
+
+#Pre-synthesize the audio of prefetched questions while the candidate answers
+PREFETCH_TTS=True
+
+#Resume question pool generated once per (candidate, resume). refer: data_class/resume_questions.py
+RESUME_QUESTION_POOL_SIZE=8
+
+RESUME_QUESTION_POOL_INSTRUCTIONS = """
+You prepare interview questions from a candidate's resume, given below split into sections.
+Write {count} questions, spread across different sections (experience, skills, projects, education, certifications) so that no two questions cover the same point.
+Each question must be specific to the resume, answerable verbally in one or two minutes, and must not contain the answer.
+Order them from most to least insightful.
+Output format: a JSON array only, like [{{"section": "Work Experience", "question": "..."}}] — no commentary, no code fences.
+"""
+
+#Worker capacity: interviews one worker runs at once (its load is the share of these in use),
+#load at which LiveKit stops sending it jobs, and prewarmed job processes kept idle. refer: main.py
+WORKER_MAX_JOBS=20
+WORKER_LOAD_THRESHOLD=1.0
+WORKER_IDLE_PROCESSES=3
+
+#Said as the interview's last turn; the candidate no longer waits for a live summary
+INTERVIEW_CLOSING_MESSAGE="That was the last question. Thank you for your time, the interview is now complete and your answers will be reviewed."
+
+#Offline scoring of completed interviews: backend is "gemini" or "stub" (no LLM, for local runs),
+#answers scored per LLM call (across interviews), worker processes, and where the scores go.
+#refer: scoring/pipeline.py
+SCORING_BACKEND="gemini"
+SCORING_MODEL="gemini-2.0-flash"
+SCORING_BATCH_SIZE=40
+SCORING_WORKERS=4
+SCORING_COLLECTION="interview_scores"
+#Rubric of questions that are not in the question bank (resume and follow-up questions)
+SCORING_DEFAULT_RUBRIC=["answers the question that was asked", "technically correct", "specific, with examples from own experience"]
+
+SCORING_INSTRUCTIONS = """
+You grade answers from technical interviews. Each item has an id, the question, the candidate's answer and the rubric: the key points a complete answer covers.
+Score every answer from 0 to 10 against its rubric: 0 for a skipped, empty or wrong answer, 10 for a correct answer covering every key point. Grade each item on its own; the items come from different candidates.
+Write one sentence of feedback per answer naming what was missing or wrong.
+Output format: a JSON array only, one entry per item, like [{"id": "...", "score": 7, "feedback": "..."}] — no commentary, no code fences.
+"""
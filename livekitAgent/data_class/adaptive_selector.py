@@ -0,0 +1,111 @@
+import logging
+import random
+import re
+from typing import Optional, Sequence
+from config.config import (
+    ADAPTIVE_QUESTION_COUNT,
+    ADAPTIVE_START_LEVEL,
+    ADAPTIVE_STEP,
+    ADAPTIVE_GOOD_ANSWER_WORDS,
+)
+from data_class.question_bank import DIFFICULTIES, QuestionBank
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("adaptive_selector.py")
+
+SKIPPED_ANSWER = "[Question Skipped]"
+UNSURE = re.compile(r"\b(i don'?t know|no idea|not sure|can'?t remember)\b", re.IGNORECASE)
+TOP_LEVEL = len(DIFFICULTIES) - 1
+
+
+#----------------------------Helper methods--------------------------------
+def answer_quality(answer: str) -> float:
+    """
+    Cheap live signal of answer quality in [0, 1]: skipped is 0, hedged
+    answers are capped low, otherwise longer answers score higher up to
+    ADAPTIVE_GOOD_ANSWER_WORDS words. Proper scoring happens offline.
+    """
+    if not answer or answer == SKIPPED_ANSWER:
+        return 0.0
+    quality = min(1.0, len(answer.split()) / ADAPTIVE_GOOD_ANSWER_WORDS)
+    if UNSURE.search(answer):
+        quality = min(quality, 0.2)
+    return quality
+
+
+class AdaptiveSelector:
+    """
+    Chooses each predefined question when its turn comes, at the difficulty the
+    candidate's answers so far point to.
+
+    `level` is a running estimate in [0, TOP_LEVEL] (basic .. advanced), moved
+    up or down by the quality of every answer in qna_history. The question is
+    a DifficultyLadder pick at round(level), rotating through `topics` when
+    given, so a pick is O(log n) on any bank size.
+
+    `peek` is pure for a given history; `commit` makes the same pick and
+    records it as asked.
+    """
+
+    def __init__(
+        self,
+        bank: QuestionBank,
+        budget: int = ADAPTIVE_QUESTION_COUNT,
+        topics: Optional[Sequence[str]] = None,
+        start_level: float = ADAPTIVE_START_LEVEL,
+        step: float = ADAPTIVE_STEP,
+        seed: Optional[int] = None,
+    ):
+        self.bank = bank
+        # Every level falls back to the others, so the whole bank is available
+        self.budget = min(budget, len(bank.ladder().positions))
+        self.topics = list(topics or ())
+        self.level = start_level
+        self._step = step
+        self._seed = random.getrandbits(32) if seed is None else seed
+        self._scored = 0   # qna_history entries already folded into `level`
+        self._asked: set[int] = set()
+
+    def _update_level(self, qna_history: list):
+        # Memoized fold over the history; repeated calls with the same history are no-ops
+        for turn in qna_history[self._scored:]:
+            self.level = min(TOP_LEVEL, max(0.0, self.level + self._step * (2 * turn.quality - 1)))
+        self._scored = len(qna_history)
+
+    def _pick(self, level: int, ordinal: int) -> Optional[int]:
+        point = random.Random(self._seed * 1_000_003 + ordinal).random()
+        ladders = []
+        if self.topics:
+            ladders.append(self.bank.ladder(self.topics[ordinal % len(self.topics)]))
+        ladders.append(self.bank.ladder())
+        # Difficulty matters more than topic: nearest level first, topic before whole bank
+        levels = sorted(range(len(DIFFICULTIES)), key=lambda other: (abs(other - level), other))
+        for candidate in levels:
+            for ladder in ladders:
+                position = ladder.pick(candidate, point, self._asked)
+                if position is not None:
+                    return position
+        return None
+
+    def peek(self, interview_data, ordinal: int) -> dict:
+        """The question predefined slot `ordinal` would get right now."""
+        self._update_level(interview_data.qna_history)
+        return self.bank.questions[self._pick(round(self.level), ordinal)]
+
+    def commit(self, interview_data, ordinal: int) -> dict:
+        """Pick slot `ordinal`'s question and append it to pre_define_questions."""
+        self._update_level(interview_data.qna_history)
+        position = self._pick(round(self.level), ordinal)
+        self._asked.add(position)
+        question = self.bank.questions[position]
+        interview_data.pre_define_questions.append(question)
+        logger.info(f"Adaptive pick at level {self.level:.2f}: {question['difficulty']}")
+        return question
+
+    def snapshot(self) -> dict:
+        return {"level": self.level, "scored": self._scored, "seed": self._seed}
+
+    def restore(self, data: dict, asked: Sequence[dict]):
+        """Continue a snapshotted selector; `asked` are its committed questions."""
+        self.level, self._scored, self._seed = data["level"], data["scored"], data["seed"]
+        self._asked = {p for p in (self.bank.locate(q["question"]) for q in asked) if p is not None}
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+from livekit.agents import ChatContext
+from livekit.agents.llm import ChatMessage
+from Agent.llm_text import generate_text
+from config.config import (
+    CONTEXT_KEEP_TURNS,
+    CONTEXT_FOLD_BATCH,
+    CONTEXT_TOKEN_BUDGET,
+    CONTEXT_SUMMARY_INSTRUCTIONS,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("context_window.py")
+
+SUMMARY_ID = "interview.rolling_summary"
+
+# summarize(previous_summary, transcript_of_turns_to_fold) -> new summary
+Summarizer = Callable[[str, str], Awaitable[str]]
+
+
+#----------------------------Helper methods--------------------------------
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgeting."""
+    return len(text) // 4 + 1
+
+def item_text(item) -> str:
+    return getattr(item, "text_content", None) or ""
+
+def prompt_tokens(chat_ctx) -> int:
+    return sum(estimate_tokens(item_text(item)) for item in chat_ctx.items)
+
+def render_turns(items) -> str:
+    lines = []
+    for item in items:
+        if getattr(item, "type", None) != "message" or item.role not in ("user", "assistant"):
+            continue
+        speaker = "Interviewer" if item.role == "assistant" else "Candidate"
+        lines.append(f"{speaker}: {item_text(item)}")
+    return "\n".join(lines)
+
+async def summarize_with_llm(llm, previous_summary: str, transcript: str) -> str:
+    """Summarizer backed by the session's LLM, run outside the agent's turn."""
+    chat_ctx = ChatContext()
+    chat_ctx.add_message(role="system", content=CONTEXT_SUMMARY_INSTRUCTIONS)
+    chat_ctx.add_message(
+        role="user",
+        content=f"Summary so far:\n{previous_summary or '(none)'}\n\nNew turns:\n{transcript}",
+    )
+    return await generate_text(llm, chat_ctx)
+
+
+class ContextWindow:
+    """
+    Keeps the interview agent's chat context bounded.
+
+    The last `keep_turns` question/answer turns stay verbatim (fewer if they
+    alone exceed `token_budget`); older turns are folded into a rolling summary
+    message. Folding runs as a background task between turns (`schedule`) and
+    is swapped into the context right before the next reply (`apply`), so the
+    summarizing LLM call is never on the candidate's critical path.
+    """
+
+    def __init__(
+        self,
+        summarize: Summarizer,
+        keep_turns: int = CONTEXT_KEEP_TURNS,
+        fold_batch: int = CONTEXT_FOLD_BATCH,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+    ):
+        self.summary = ""
+        self._summarize = summarize
+        self._keep_turns = keep_turns
+        self._fold_batch = fold_batch
+        self._token_budget = token_budget
+        self._pending: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _split(items) -> tuple[list, list]:
+        """Leading system/developer messages (instructions, summary) vs the conversation."""
+        head = 0
+        while head < len(items) and getattr(items[head], "type", None) == "message" and items[head].role in ("system", "developer"):
+            head += 1
+        return list(items[:head]), list(items[head:])
+
+    def _fold_point(self, body) -> int:
+        """Index in `body` before which turns should be folded, or 0 for nothing."""
+        starts = [i for i, item in enumerate(body) if getattr(item, "type", None) == "message" and item.role == "assistant"]
+        keep = min(self._keep_turns, len(starts))
+        while keep > 1 and sum(estimate_tokens(item_text(item)) for item in body[starts[-keep]:]) > self._token_budget:
+            keep -= 1
+        foldable = len(starts) - keep
+        over_budget = keep < self._keep_turns and foldable > 0
+        if foldable < self._fold_batch and not over_budget:
+            return 0
+        return starts[-keep] if keep else len(body)
+
+    def schedule(self, agent):
+        """Start folding old turns in the background if the window overflowed."""
+        if self._pending is not None:
+            return
+        _, body = self._split(agent.chat_ctx.items)
+        cut = self._fold_point(body)
+        if cut == 0:
+            return
+        old = body[:cut]
+        self._pending = asyncio.create_task(self._fold(old))
+
+    async def _fold(self, old) -> tuple[str, set[str]]:
+        summary = await self._summarize(self.summary, render_turns(old))
+        return summary, {item.id for item in old}
+
+    async def apply(self, agent):
+        """Swap a finished summary into the agent's context. Never waits on the LLM."""
+        if self._pending is None or not self._pending.done():
+            return
+        task, self._pending = self._pending, None
+        try:
+            summary, folded_ids = task.result()
+        except Exception as e:
+            logger.error(f"Context summary failed, keeping full context: {e}")
+            return
+
+        items = [item for item in agent.chat_ctx.items if item.id not in folded_ids and item.id != SUMMARY_ID]
+        head, body = self._split(items)
+        summary_message = ChatMessage(
+            id=SUMMARY_ID,
+            role="system",
+            content=[f"Summary of the earlier part of the interview:\n{summary}"],
+        )
+        await agent.update_chat_ctx(ChatContext(head + [summary_message] + body))
+        self.summary = summary
+        logger.info(f"🧾 Folded {len(folded_ids)} chat items into the rolling summary")
@@ -1,82 +1,139 @@
 
 from dataclasses import dataclass, field
-from typing import Optional
-from livekit.agents import Agent, ChatContext
-from config.config import INTERVIEW_INSTRUCTIONS, NUM_EASY, NUM_MEDIUM, NUM_HARD
-import random
-import json
+from typing import TYPE_CHECKING, Awaitable, Optional, Union
+from livekit.agents import Agent
+from config.config import NUM_EASY, NUM_MEDIUM, NUM_HARD, DEFAULT_CANDIDATE_ID, ADAPTIVE_DIFFICULTY
 import logging
-from enum import Enum
-from redisLogic.redis_client import getCandidateData
+from redisLogic.redis_client import getCandidateData, getAskedQuestions, addAskedQuestions
+from data_class.question_bank import QuestionBank, get_question_bank
+from transcript.transcript_sink import TranscriptSink
+from telemetry.latency_probe import TurnLatencyProbe
+from data_class.context_window import ContextWindow
+from data_class.interview_state import InterviewState
+from data_class.adaptive_selector import AdaptiveSelector, answer_quality
+from data_class.question_index import QuestionIndex, drop_repeats, question_text
+from RPC.turn_gate import TurnGate
+if TYPE_CHECKING:
+    from RPC.question_prefetch import QuestionPrefetcher
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("Interview_data.py")
 
+# A question as the interview refers to it: the shared dict of a bank (or resume
+# pool) question, never a copy, or the text of a question the LLM generated
+QuestionRef = Union[dict, str]
+
+
+@dataclass(slots=True, frozen=True)
+class Turn:
+    """One answered (or skipped) question. The history only ever grows by appending these."""
+    question: QuestionRef
+    answer: str
+    quality: float  # live signal, refer: data_class/adaptive_selector.py
+
+    @property
+    def question_text(self) -> str:
+        return question_text(self.question)
+
+
 #----------------------------Helper methods--------------------------------
-def get_latest_resume():
+async def get_candidate_id(ctx) -> str:
+    """Candidate id published by the joining participant, or the test candidate."""
+    participant = await ctx.wait_for_participant()
+    return participant.attributes.get("candidate_id") or DEFAULT_CANDIDATE_ID
+
+async def get_latest_resume(candidate_id: str | Awaitable[str]) -> str:
     try:
         logger.info("Attempting to retrieve resume")
-        logger.info(f"resume : {getCandidateData('686b60d2a6601148142a968b')}")
-        return getCandidateData("686b60d2a6601148142a968b")
+        return await getCandidateData(candidate_id) or ''
         
     except Exception as e:
         logger.error(f"Error fetching resume: {e}")
         return ''
 
-def question_bank_loader():
-    with open('questions.json', 'r') as file:
-        return json.load(file)
-
-def select_questions(question_bank):
-    num_easy = NUM_EASY
-    num_medium = NUM_MEDIUM
-    num_hard = NUM_HARD
-    # Filter questions by difficulty
-    easy_qs = [q for q in question_bank if q['difficulty'] == 'basic']
-    medium_qs = [q for q in question_bank if q['difficulty'] == 'intermediate']
-    hard_qs = [q for q in question_bank if q['difficulty'] == 'advanced']
-
-    # Randomly select questions without repetition
+def select_questions(question_bank: QuestionBank, tag: Optional[str] = None):
+    # Randomly select questions without repetition, straight from the difficulty indexes
     selected = []
-    selected.extend(random.sample(easy_qs, min(num_easy, len(easy_qs))))
-    selected.extend(random.sample(medium_qs, min(num_medium, len(medium_qs))))
-    selected.extend(random.sample(hard_qs, min(num_hard, len(hard_qs))))
+    selected.extend(question_bank.sample('basic', NUM_EASY, tag))
+    selected.extend(question_bank.sample('intermediate', NUM_MEDIUM, tag))
+    selected.extend(question_bank.sample('advanced', NUM_HARD, tag))
 
     return selected
 
+def default_predefined_questions() -> list[dict]:
+    # With adaptive difficulty the questions are picked one by one as the interview goes
+    return [] if ADAPTIVE_DIFFICULTY else select_questions(get_question_bank())
+
+def default_question_selector() -> Optional[AdaptiveSelector]:
+    return AdaptiveSelector(get_question_bank()) if ADAPTIVE_DIFFICULTY else None
+
+async def load_asked_questions(interview_data):
+    """Seed the session's de-duplication index with the candidate's earlier sessions."""
+    try:
+        interview_data.asked_index.add(await getAskedQuestions(interview_data.candidate_id))
+    except Exception as e:
+        logger.error(f"Earlier questions unavailable, checking this session only: {e}")
+
+async def save_asked_questions(interview_data):
+    asked = [turn.question_text for turn in interview_data.qna_history]
+    last_question = question_text(interview_data.last_question)
+    if last_question and (not asked or asked[-1] != last_question):
+        asked.append(last_question)
+    try:
+        await addAskedQuestions(interview_data.candidate_id, asked)
+    except Exception as e:
+        logger.error(f"Could not save asked questions: {e}")
+
+def drop_repeated_resume_questions(interview_data, pool: list[dict]) -> list[dict]:
+    """The resume pool minus questions close to anything asked or planned for this session."""
+    return drop_repeats(pool, interview_data.asked_index, also=interview_data.pre_define_questions)
+
+def record_answer(interview_data, question: QuestionRef, answer: str):
+    """Add a turn to the QnA history and queue it for the transcript sink."""
+    turn = Turn(question, answer, answer_quality(answer))
+    interview_data.qna_history.append(turn)
+    if interview_data.transcript_sink:
+        interview_data.transcript_sink.append(
+            {"type": "qna", "question": turn.question_text, "answer": answer, "quality": turn.quality}
+        )
+
+def peek_next_question(interview_data):
+    """What get_next_question would return right now, without advancing the interview"""
+    return interview_data.state.plan_next(interview_data)[0]
+
 # Standalone function to handle question logic
 def get_next_question(interview_data):
-    """Get the next question based on current interview state"""
-    logger.info(f"get_next_question called. current_question: {interview_data.current_question}")
-    
-    if interview_data.current_question == len(interview_data.pre_define_questions) * 2:
-        return InterviewPrompt.INTERVIEW_END
-    
-    if interview_data.number_of_follow_ups < 1:
-        interview_data.number_of_follow_ups += 1
-        return InterviewPrompt.ASK_FOLLOW_UP
-    
-    if interview_data.current_question % 2 == 1:
-        interview_data.current_question += 1
-        interview_data.number_of_follow_ups = 0
-        return InterviewPrompt.ASK_RESUME_QUESTION
-
-    interview_data.current_question += 1
-    interview_data.number_of_follow_ups = 0        
-    return interview_data.pre_define_questions[interview_data.current_question // 2]
-
-class InterviewPrompt(Enum):
-    ASK_RESUME_QUESTION = "Ask Resume Based Question"
-    ASK_FOLLOW_UP = "Ask a Follow Up"
-    INTERVIEW_END = "Interview End"
-
-@dataclass
+    """Advance the interview to its next question. Only call this from inside a
+    turn of the session's TurnGate, refer: RPC/agent_rpc.py"""
+    logger.info(f"get_next_question called. step: {interview_data.state.step}")
+    return interview_data.state.advance(interview_data)
+
+@dataclass(slots=True)
 class InterviewData:
-    current_question: int = 0
-    number_of_follow_ups: int = 99 # setting this a high value as we need to ask predefine question first. refer: get_next_question
-    pre_define_questions: list[dict[str, str]] = field(default_factory=lambda: select_questions(question_bank_loader()))
+    pre_define_questions: list[dict[str, str]] = field(default_factory=default_predefined_questions)
+    question_selector: Optional[AdaptiveSelector] = field(default_factory=default_question_selector)
     refining_agent: Optional[Agent] = None
-    qna_history: list[dict[str, str]] = field(default_factory=list)
-    interview_history: ChatContext = field(default_factory=lambda: ChatContext.from_dict({"items":[{"type":"message","role":"system", "content":[INTERVIEW_INSTRUCTIONS]}]}))
-    resume_data: str = field(default_factory=get_latest_resume)
+    qna_history: list[Turn] = field(default_factory=list) # append-only
+    interview_agent: Optional[Agent] = None # single BaseAgent per session, holds the interview chat context
+    last_question: QuestionRef = ''
+    context_window: Optional[ContextWindow] = None
+    prefetcher: Optional["QuestionPrefetcher"] = None
+    candidate_id: str = DEFAULT_CANDIDATE_ID
+    session_id: str = '' # the room name; keys the transcript and the snapshot, refer: data_class/session_snapshot.py
+    resume_data: str = '' # filled in by the entrypoint, refer: get_latest_resume
+    resume_questions: list[dict[str, str]] = field(default_factory=list) # refer: data_class/resume_questions.py
+    transcript_sink: Optional[TranscriptSink] = None
+    latency_probe: Optional[TurnLatencyProbe] = None
+    state: InterviewState = field(init=False) # refer: data_class/interview_state.py
+    turn_gate: TurnGate = field(init=False, default_factory=TurnGate) # serializes RPC turns, refer: RPC/turn_gate.py
+    asked_index: QuestionIndex = field(default_factory=QuestionIndex) # questions asked to this candidate, refer: data_class/question_index.py
+
+    def __post_init__(self):
+        self.state = InterviewState.for_questions(self.num_predefined)
+
+    @property
+    def num_predefined(self) -> int:
+        if self.question_selector is not None:
+            return self.question_selector.budget
+        return len(self.pre_define_questions)
 
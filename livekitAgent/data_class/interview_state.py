@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable, Optional
+from config.config import INTERVIEW_PLAN
+from data_class.question_bank import get_question_bank
+from data_class.question_index import find_replacement
+
+
+class InterviewPrompt(Enum):
+    ASK_RESUME_QUESTION = "Ask Resume Based Question"
+    ASK_FOLLOW_UP = "Ask a Follow Up"
+    INTERVIEW_END = "Interview End"
+
+
+PREDEFINED = "predefined"
+RESUME = "resume"
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    kind: str            # PREDEFINED or RESUME
+    follow_ups: int = 1  # follow-up questions asked after this step's question
+
+
+#----------------------------Helper methods--------------------------------
+def build_plan(pattern: Iterable, num_predefined: int) -> tuple[PlanStep, ...]:
+    """
+    Repeat `pattern` until every predefined question has a step. `pattern`
+    holds PlanSteps or (kind, follow_ups) pairs, e.g. the default
+    predefined -> resume alternation is [("predefined", 1), ("resume", 1)].
+    A pattern without predefined steps is used once.
+    """
+    pattern = [step if isinstance(step, PlanStep) else PlanStep(*step) for step in pattern]
+    for step in pattern:
+        if step.kind not in (PREDEFINED, RESUME):
+            raise ValueError(f"Unknown interview plan step: {step.kind!r}")
+    per_cycle = sum(step.kind == PREDEFINED for step in pattern)
+    cycles = -(-num_predefined // per_cycle) if per_cycle else 1
+    plan, used = [], 0
+    for _ in range(cycles):
+        for step in pattern:
+            if step.kind == PREDEFINED:
+                if used == num_predefined:
+                    continue
+                used += 1
+            plan.append(step)
+    return tuple(plan)
+
+
+class InterviewState:
+    """
+    Question-selection state machine of one interview.
+
+    The interview walks through `plan`; after each step's question come that
+    step's follow-ups, then the next step. The last step's question is followed
+    by INTERVIEW_END. `plan_next` is pure, `advance` commits a decision. Every
+    decision bumps `version`, which the RPC gate uses to tell stale requests
+    from current ones (refer: RPC/turn_gate.py).
+    """
+
+    __slots__ = ("plan", "step", "follow_ups_left", "version", "current_decision", "resume_point", "_ordinal")
+
+    def __init__(self, plan: tuple[PlanStep, ...]):
+        self.plan = plan
+        self.step = -1              # index in plan of the question being discussed
+        self.follow_ups_left = 0
+        self.version = 0
+        self.current_decision = None
+        self.resume_point = (-1, 0)  # (step, follow_ups_left) before the current decision
+        # position of each step among the steps of its kind: which predefined/resume question it asks
+        counts = {PREDEFINED: 0, RESUME: 0}
+        self._ordinal = []
+        for step in plan:
+            self._ordinal.append(counts[step.kind])
+            counts[step.kind] += 1
+
+    @classmethod
+    def for_questions(cls, num_predefined: int, pattern: Optional[Iterable] = None) -> "InterviewState":
+        return cls(build_plan(INTERVIEW_PLAN if pattern is None else pattern, num_predefined))
+
+    def _predefined_question(self, ordinal: int, interview_data, commit: bool) -> dict:
+        questions = interview_data.pre_define_questions
+        if ordinal < len(questions):
+            question = questions[ordinal]
+        elif commit:
+            # chosen online from the answers so far, refer: data_class/adaptive_selector.py
+            question = interview_data.question_selector.commit(interview_data, ordinal)
+        else:
+            question = interview_data.question_selector.peek(interview_data, ordinal)
+
+        # Never ask again what this candidate was already asked, here or in an earlier session
+        if interview_data.asked_index.is_duplicate(question["question"]):
+            replacement = find_replacement(get_question_bank(), question, interview_data.asked_index, questions)
+            if replacement is not None:
+                if commit:
+                    questions[ordinal] = replacement
+                question = replacement
+        return question
+
+    def _question_for(self, index: int, interview_data, commit: bool = False):
+        ordinal = self._ordinal[index]
+        if self.plan[index].kind == PREDEFINED:
+            return self._predefined_question(ordinal, interview_data, commit)
+        # taken from the pre-generated resume pool while it lasts, unless it repeats a question
+        if ordinal < len(interview_data.resume_questions):
+            question = interview_data.resume_questions[ordinal]
+            if not interview_data.asked_index.is_duplicate(question["question"]):
+                return question
+        return InterviewPrompt.ASK_RESUME_QUESTION
+
+    def _plan(self, interview_data, commit: bool) -> tuple[object, int, int]:
+        index = self.step + 1
+        # The interview closes right after the last step's question, without its follow-ups
+        if index >= len(self.plan):
+            return InterviewPrompt.INTERVIEW_END, self.step, 0
+        if self.follow_ups_left > 0:
+            return InterviewPrompt.ASK_FOLLOW_UP, self.step, self.follow_ups_left - 1
+        return self._question_for(index, interview_data, commit), index, self.plan[index].follow_ups
+
+    def plan_next(self, interview_data) -> tuple[object, int, int]:
+        """Next decision without changing the state: (decision, step, follow_ups_left) after it."""
+        return self._plan(interview_data, commit=False)
+
+    def advance(self, interview_data):
+        self.resume_point = (self.step, self.follow_ups_left)
+        decision, self.step, self.follow_ups_left = self._plan(interview_data, commit=True)
+        self.current_decision = decision
+        self.version += 1
+        return decision
+
+    def skip_follow_ups(self):
+        """Drop the remaining follow-ups of the current question."""
+        self.follow_ups_left = 0
+
+    def rewind(self, resume_point: tuple[int, int]):
+        """Go back to just before a decision, so the next `advance` makes it again:
+        a restored session re-asks the question it was interrupted on."""
+        self.step, self.follow_ups_left = resume_point
+        self.current_decision = None
+        self.version += 1
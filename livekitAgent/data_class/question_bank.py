@@ -0,0 +1,200 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from array import array
+from bisect import bisect_left
+from typing import Callable, Optional
+from config.config import QUESTION_BANK_PATH, QUESTION_BANK_RELOAD_INTERVAL
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("question_bank.py")
+
+DIFFICULTIES = ("basic", "intermediate", "advanced")
+
+
+def spread(position: int) -> float:
+    """Deterministic pseudo-random fraction in [0, 1) for a bank position
+    (Knuth multiplicative hash), used to shuffle questions within a level."""
+    return ((position * 2654435761) & 0xFFFFFFFF) / 2**32
+
+
+class DifficultyLadder:
+    """
+    Questions of one topic (or the whole bank) sorted by level + spread(position),
+    so every difficulty level is a contiguous run in random order. A pick is a
+    bisect at a random point of the level's run: O(log n), nothing copied.
+    """
+
+    def __init__(self, questions: tuple[dict, ...], positions):
+        rank = {difficulty: level for level, difficulty in enumerate(DIFFICULTIES)}
+        keyed = sorted(
+            (rank[questions[p]["difficulty"]] + spread(p), p)
+            for p in positions
+            if questions[p]["difficulty"] in rank
+        )
+        self.keys = array("d", (key for key, _ in keyed))
+        self.positions = array("I", (p for _, p in keyed))
+
+    def count(self, level: int) -> int:
+        return bisect_left(self.keys, level + 1) - bisect_left(self.keys, level)
+
+    def pick(self, level: int, point: float, exclude=()) -> Optional[int]:
+        """Position of the question of `level` at `point` in [0, 1) of the level's
+        run, or the next one not in `exclude`; None if the level has none left."""
+        lo = bisect_left(self.keys, level)
+        hi = bisect_left(self.keys, level + 1)
+        size = hi - lo
+        if size == 0:
+            return None
+        start = bisect_left(self.keys, level + point, lo, hi) - lo
+        # Only already-asked questions are stepped over, a handful per session
+        for offset in range(size):
+            position = self.positions[lo + (start + offset) % size]
+            if position not in exclude:
+                return position
+        return None
+
+
+class QuestionBank:
+    """
+    Question bank loaded once per worker and indexed for sampling.
+
+    Questions are kept as one shared tuple; the indexes are compact arrays of
+    positions into it, per difficulty, per tag/role and per (difficulty, tag).
+    Sessions get references to the shared question dicts, never copies.
+    """
+
+    def __init__(self, questions: list[dict], mtime: float = 0.0):
+        self.questions: tuple[dict, ...] = tuple(questions)
+        self.mtime = mtime
+        self.by_difficulty: dict[str, array] = {}
+        self.by_tag: dict[str, array] = {}
+        self.by_difficulty_tag: dict[tuple[str, str], array] = {}
+        self._ladders: dict[Optional[str], DifficultyLadder] = {}
+        self._by_text: Optional[dict[str, int]] = None
+        self.vectors = None  # de-duplication vectors, refer: data_class/question_index.py
+
+        for position, question in enumerate(self.questions):
+            difficulty = question["difficulty"]
+            self.by_difficulty.setdefault(difficulty, array("I")).append(position)
+            for tag in self.tags_of(question):
+                self.by_tag.setdefault(tag, array("I")).append(position)
+                self.by_difficulty_tag.setdefault((difficulty, tag), array("I")).append(position)
+
+    @staticmethod
+    def tags_of(question: dict) -> list[str]:
+        tags = list(question.get("tags", ()))
+        if question.get("role"):
+            tags.append(question["role"])
+        return tags
+
+    @classmethod
+    def load(cls, path: str) -> "QuestionBank":
+        mtime = os.stat(path).st_mtime
+        with open(path, 'r') as file:
+            return cls(json.load(file), mtime)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def index_for(self, difficulty: str, tag: Optional[str] = None) -> array:
+        if tag is None:
+            return self.by_difficulty.get(difficulty, array("I"))
+        return self.by_difficulty_tag.get((difficulty, tag), array("I"))
+
+    def ladder(self, tag: Optional[str] = None) -> DifficultyLadder:
+        """Difficulty-ordered index of a topic (or of the whole bank), built on first use."""
+        ladder = self._ladders.get(tag)
+        if ladder is None:
+            positions = range(len(self.questions)) if tag is None else self.by_tag.get(tag, ())
+            ladder = self._ladders[tag] = DifficultyLadder(self.questions, positions)
+        return ladder
+
+    def locate(self, text: str) -> Optional[int]:
+        """Position of the question with this exact text. The text index is only
+        built on first use (restoring a session), not for every worker."""
+        if self._by_text is None:
+            self._by_text = {q["question"]: p for p, q in enumerate(self.questions)}
+        return self._by_text.get(text)
+
+    def sample(self, difficulty: str, k: int, tag: Optional[str] = None) -> list[dict]:
+        """Pick up to k distinct questions of a difficulty (and tag) in O(k)."""
+        index = self.index_for(difficulty, tag)
+        k = min(k, len(index))
+        # random.sample over a range only draws k positions; the index is never copied
+        return [self.questions[index[i]] for i in random.sample(range(len(index)), k)]
+
+
+#----------------------------Per-worker bank--------------------------------
+_bank: Optional[QuestionBank] = None
+_last_check = 0.0
+_reload_task: Optional[asyncio.Task] = None
+# Indexes other modules build over a bank, run on every bank before it is served
+_loaders: list[Callable[[QuestionBank], object]] = []
+
+def on_load(build: Callable[[QuestionBank], object]):
+    """Register `build` to run on each bank as it is loaded (decorator)."""
+    _loaders.append(build)
+    return build
+
+def _load(path: str) -> QuestionBank:
+    bank = QuestionBank.load(path)
+    for build in _loaders:
+        build(bank)
+    return bank
+
+async def _reload(path: str):
+    """Load and index the changed file in a thread; the old bank is served
+    until the new one is complete, then replaced in one assignment."""
+    global _bank
+    try:
+        bank = await asyncio.to_thread(_load, path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Question bank reload failed, keeping loaded copy: {e}")
+        return
+    _bank = bank
+    logger.info(f"Reloaded {len(bank)} questions from {path}")
+
+def get_question_bank(path: str = QUESTION_BANK_PATH) -> QuestionBank:
+    """
+    Return the worker's question bank, loading it on first use and reloading
+    it when the file changes. The file is stat'ed at most once every
+    QUESTION_BANK_RELOAD_INTERVAL seconds. Inside a running event loop the
+    reload happens in the background (refer: _reload).
+    """
+    global _bank, _last_check, _reload_task
+    now = time.monotonic()
+    if _bank is not None and now - _last_check < QUESTION_BANK_RELOAD_INTERVAL:
+        return _bank
+    _last_check = now
+
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError as e:
+        if _bank is None:
+            raise
+        logger.error(f"Question bank not readable, keeping loaded copy: {e}")
+        return _bank
+
+    if _bank is not None and mtime != _bank.mtime:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass  # no event loop (prewarm, scripts): reload right here
+        else:
+            if _reload_task is None or _reload_task.done():
+                _reload_task = asyncio.create_task(_reload(path))
+            return _bank
+
+    if _bank is None or mtime != _bank.mtime:
+        try:
+            _bank = _load(path)
+            logger.info(f"Loaded {len(_bank)} questions from {path}")
+        except (OSError, ValueError, KeyError) as e:
+            if _bank is None:
+                raise
+            logger.error(f"Question bank reload failed, keeping loaded copy: {e}")
+    return _bank
@@ -0,0 +1,174 @@
+import logging
+import re
+import zlib
+from typing import Optional, Sequence
+import numpy as np
+from config.config import (
+    QUESTION_INDEX_DIM,
+    QUESTION_DUPLICATE_THRESHOLD,
+    REPLACEMENT_CANDIDATES,
+)
+from data_class.question_bank import QuestionBank, on_load
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("question_index.py")
+
+TOKEN = re.compile(r"[a-z0-9]+")
+# Question boilerplate that would make every "What is X?" look alike
+STOPWORDS = frozenset(
+    "a about an and are between can difference do does explain how in is it its me mean means of on tell "
+    "the to use used we what whats when where which why with work works you your".split()
+)
+SYNONYMS = {"js": "javascript"}
+# Words most of the bank shares; at full weight they would pair unrelated questions
+WEAK_WORDS = {"javascript": 0.3, "react": 0.5}
+TRIGRAM_WEIGHT = 0.7
+
+
+#----------------------------Hashed n-gram vectors--------------------------------
+def singular(word: str) -> str:
+    """Crude plural stripping, so "promises" and "promise" are one word."""
+    if len(word) > 4 and word.endswith("es") and (word[-4:-2] in ("ss", "ch", "sh") or word[-3] in "xz"):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def features(text: str) -> list[tuple[str, float]]:
+    """Weighted content words, word bigrams and character trigrams of each word."""
+    words = [singular(SYNONYMS.get(w, w)) for w in TOKEN.findall(text.lower()) if w not in STOPWORDS]
+    grams = [(word, WEAK_WORDS.get(word, 1.0)) for word in words]
+    grams.extend((f"{a} {b}", 1.0) for a, b in zip(words, words[1:]))
+    for word in words:
+        padded, weight = f"<{word}>", TRIGRAM_WEIGHT * WEAK_WORDS.get(word, 1.0)
+        grams.extend((padded[i:i + 3], weight) for i in range(len(padded) - 2))
+    return grams
+
+def embed(texts: Sequence[str], dim: int = QUESTION_INDEX_DIM) -> np.ndarray:
+    """
+    L2-normalized signed feature-hashing vectors, one row per text: a fixed,
+    CPU-only "model" with no weights to load. Cosine similarity between rows
+    is a plain dot product.
+    """
+    rows, cols, weights = [], [], []
+    for row, text in enumerate(texts):
+        for gram, weight in features(text):
+            h = zlib.crc32(gram.encode("utf-8"))
+            rows.append(row)
+            cols.append(h % dim)
+            weights.append(weight if h & 0x80000000 else -weight)
+    flat = np.asarray(rows, dtype=np.int64) * dim + np.asarray(cols, dtype=np.int64)
+    vectors = np.bincount(flat, weights, minlength=len(texts) * dim).reshape(len(texts), dim).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def question_text(question) -> str:
+    return question.get("question", "") if isinstance(question, dict) else str(question)
+
+
+class QuestionIndex:
+    """
+    Growable matrix of question vectors with batched cosine lookups.
+
+    Rows are appended in place (capacity doubles when full), so adding the
+    question just asked costs one embedding, never a rebuild.
+    """
+
+    def __init__(self, dim: int = QUESTION_INDEX_DIM, capacity: int = 8):
+        self.dim = dim
+        self.texts: list[str] = []
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[:len(self.texts)]
+
+    def add(self, texts: Sequence[str]):
+        texts = [t for t in texts if t]
+        if texts:
+            self.add_vectors(embed(texts, self.dim), texts)
+
+    def add_vectors(self, vectors: np.ndarray, texts: Sequence[str]):
+        size, needed = len(self.texts), len(self.texts) + len(texts)
+        if needed > len(self._vectors):
+            grown = np.zeros((max(needed, 2 * len(self._vectors)), self.dim), dtype=np.float32)
+            grown[:size] = self._vectors[:size]
+            self._vectors = grown
+        self._vectors[size:needed] = vectors
+        self.texts.extend(texts)
+
+    def max_similarity(self, vectors: np.ndarray) -> np.ndarray:
+        """Highest cosine similarity of each query row against the index (0 when empty)."""
+        if not self.texts:
+            return np.zeros(len(vectors), dtype=np.float32)
+        return (vectors @ self.vectors.T).max(axis=1)
+
+    def is_duplicate(self, text: str, threshold: float = QUESTION_DUPLICATE_THRESHOLD) -> bool:
+        return bool(text) and float(self.max_similarity(embed([text], self.dim))[0]) >= threshold
+
+
+#----------------------------Per-worker bank vectors--------------------------------
+@on_load
+def get_bank_vectors(bank: QuestionBank) -> np.ndarray:
+    """Vectors of every bank question, embedded once per bank and kept on it.
+    A reloaded bank gets them off the event loop before it replaces the old one
+    (refer: question_bank.get_question_bank). Stored as float16 (512 bytes per question)."""
+    if bank.vectors is None:
+        texts = [q["question"] for q in bank.questions]
+        vectors = np.empty((len(texts), QUESTION_INDEX_DIM), dtype=np.float16)
+        # In slices, so a reload thread never holds the GIL for long
+        for start in range(0, len(texts), 2000):
+            vectors[start:start + 2000] = embed(texts[start:start + 2000])
+        bank.vectors = vectors
+        logger.info(f"Embedded {len(bank)} bank questions for de-duplication")
+    return bank.vectors
+
+
+#----------------------------Session checks--------------------------------
+def find_replacement(
+    bank: QuestionBank,
+    question: dict,
+    asked: QuestionIndex,
+    exclude: Sequence[dict] = (),
+    threshold: float = QUESTION_DUPLICATE_THRESHOLD,
+) -> Optional[dict]:
+    """
+    A bank question of the same difficulty that is not close to anything
+    asked. Candidates are scanned in a fixed order seeded by the question
+    text, so peeking and asking agree; one batched lookup per call.
+    """
+    index = bank.index_for(question["difficulty"])
+    if not len(index):
+        return None
+    count = min(REPLACEMENT_CANDIDATES, len(index))
+    start = zlib.crc32(question["question"].encode("utf-8")) % len(index)
+    positions = [index[(start + i) % len(index)] for i in range(count)]
+    similarity = asked.max_similarity(get_bank_vectors(bank)[positions].astype(np.float32))
+    taken = {id(q) for q in exclude}
+    for position, score in zip(positions, similarity):
+        candidate = bank.questions[position]
+        if score < threshold and id(candidate) not in taken and candidate is not question:
+            return candidate
+    return None
+
+def drop_repeats(questions: list[dict], asked: QuestionIndex, also: Sequence = (), threshold: float = QUESTION_DUPLICATE_THRESHOLD) -> list[dict]:
+    """Keep the questions that are not close to anything asked, to `also`, or to
+    an earlier kept one. Meant for whole pools, off the turn's critical path."""
+    if not questions:
+        return questions
+    vectors = embed([question_text(q) for q in questions], asked.dim)
+    against = QuestionIndex(asked.dim)
+    against.add_vectors(asked.vectors, asked.texts)
+    against.add([question_text(q) for q in also])
+    kept = []
+    for question, vector in zip(questions, vectors):
+        if against.max_similarity(vector[None, :])[0] < threshold:
+            kept.append(question)
+            against.add_vectors(vector[None, :], [question_text(question)])
+        else:
+            logger.info(f"Dropped repeated question: {question_text(question)}")
+    return kept
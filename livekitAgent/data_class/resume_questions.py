@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from livekit.agents import ChatContext
+from Agent.llm_text import generate_text
+from config.config import RESUME_QUESTION_POOL_SIZE, RESUME_QUESTION_POOL_INSTRUCTIONS
+from redisLogic.redis_client import getResumeQuestions, setResumeQuestions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("resume_questions.py")
+
+# Sections that never make for interview questions
+SKIPPED_SECTIONS = ("contact",)
+SECTION_HEADER = re.compile(r"^\s*([A-Z][A-Za-z &/]{2,40}):\s*$")
+
+
+#----------------------------Helper methods--------------------------------
+def resume_hash(resume: str) -> str:
+    return hashlib.sha256(resume.encode("utf-8")).hexdigest()[:16]
+
+def split_sections(resume: str) -> list[tuple[str, str]]:
+    """Split a resume into (title, body) sections on 'Title:' header lines."""
+    sections = []
+    title, lines = "Overview", []
+    for line in resume.splitlines():
+        header = SECTION_HEADER.match(line)
+        if header:
+            if "".join(lines).strip():
+                sections.append((title, "\n".join(lines).strip()))
+            title, lines = header.group(1), []
+        else:
+            lines.append(line)
+    if "".join(lines).strip():
+        sections.append((title, "\n".join(lines).strip()))
+    return [(t, body) for t, body in sections if not t.lower().startswith(SKIPPED_SECTIONS)]
+
+def parse_questions(text: str) -> list[dict]:
+    """Parse the LLM's JSON array, tolerating code fences around it."""
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        return []
+    try:
+        items = json.loads(match.group(0))
+    except ValueError:
+        return []
+    questions = []
+    for item in items:
+        if isinstance(item, dict) and item.get("question"):
+            questions.append({"question": str(item["question"]).strip(), "section": str(item.get("section", "")), "source": "resume"})
+        elif isinstance(item, str) and item.strip():
+            questions.append({"question": item.strip(), "section": "", "source": "resume"})
+    return questions
+
+async def generate_question_pool(llm, resume: str, size: int = RESUME_QUESTION_POOL_SIZE) -> list[dict]:
+    """One batched LLM call producing a ranked, section-diverse question pool."""
+    sections = split_sections(resume)
+    if not sections:
+        return []
+    chat_ctx = ChatContext()
+    chat_ctx.add_message(role="system", content=RESUME_QUESTION_POOL_INSTRUCTIONS.format(count=size))
+    chat_ctx.add_message(
+        role="user",
+        content="\n\n".join(f"## {title}\n{body}" for title, body in sections),
+    )
+    return parse_questions(await generate_text(llm, chat_ctx))[:size]
+
+
+#----------------------------Per-candidate pool--------------------------------
+_in_flight: dict[tuple[str, str], asyncio.Task] = {}
+
+async def _load_or_generate(candidate_id: str, resume: str, llm) -> list[dict]:
+    digest = resume_hash(resume)
+    cached = await getResumeQuestions(candidate_id, digest)
+    if cached is not None:
+        logger.info(f"Using cached resume question pool for {candidate_id}")
+        return cached
+    questions = await generate_question_pool(llm, resume)
+    if questions:
+        await setResumeQuestions(candidate_id, digest, questions)
+    return questions
+
+async def get_resume_question_pool(candidate_id: str, resume: str, llm) -> list[dict]:
+    """
+    Ranked resume questions for this (candidate, resume) pair, generated once and
+    kept in Redis next to the cached resume, so retakes and panel sessions reuse
+    them. Concurrent sessions of the same candidate share one generation.
+    """
+    if not resume:
+        return []
+    key = (candidate_id, resume_hash(resume))
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.create_task(_load_or_generate(candidate_id, resume, llm))
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    try:
+        return await asyncio.shield(task)
+    except Exception as e:
+        logger.error(f"Resume question pool unavailable, falling back to live questions: {e}")
+        return []
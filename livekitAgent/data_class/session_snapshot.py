@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from typing import Optional
+from livekit.agents.llm import ChatContext
+from data_class.interview_data import InterviewData, QuestionRef, Turn
+from data_class.interview_state import InterviewPrompt, InterviewState
+from data_class.question_bank import QuestionBank, get_question_bank
+from redisLogic.redis_client import getSessionSnapshot, setSessionSnapshot, deleteSessionSnapshot
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("session_snapshot.py")
+
+SNAPSHOT_VERSION = 1
+# Latest write per session; a new write waits for the previous one so they land in order
+_writes: dict[str, asyncio.Task] = {}
+
+
+#----------------------------Helper methods--------------------------------
+def _intern(bank: QuestionBank, question: QuestionRef, pool: dict[str, dict]) -> QuestionRef:
+    """The shared dict of a restored question: the bank's, or the session's resume pool entry."""
+    if not isinstance(question, dict):
+        return question
+    position = bank.locate(question["question"])
+    if position is not None:
+        return bank.questions[position]
+    return pool.get(question["question"], question)
+
+def snapshot(interview_data: InterviewData) -> dict:
+    """
+    What another worker needs to carry the interview on: the questions chosen,
+    the answers so far and where the state machine was just before the
+    question now being answered. Chat context, prefetches and audio are
+    rebuilt, not saved.
+    """
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "candidate_id": interview_data.candidate_id,
+        "resume_point": list(interview_data.state.resume_point),
+        "pre_define_questions": list(interview_data.pre_define_questions),
+        "resume_questions": list(interview_data.resume_questions),
+        "turns": [[turn.question, turn.answer, turn.quality] for turn in interview_data.qna_history],
+    }
+    if interview_data.question_selector is not None:
+        data["selector"] = interview_data.question_selector.snapshot()
+    return data
+
+def restore(interview_data: InterviewData, data: dict) -> bool:
+    """Load a snapshot into a fresh InterviewData. The next decision re-asks
+    the question the interview was interrupted on."""
+    if data.get("version") != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring snapshot of unknown version {data.get('version')}")
+        return False
+    bank = get_question_bank()
+    pool = {q["question"]: q for q in data["resume_questions"]}
+    interview_data.candidate_id = data["candidate_id"]
+    interview_data.resume_questions = data["resume_questions"]
+    interview_data.pre_define_questions = [_intern(bank, q, pool) for q in data["pre_define_questions"]]
+    interview_data.qna_history = [Turn(_intern(bank, q, pool), answer, quality) for q, answer, quality in data["turns"]]
+    if interview_data.question_selector is not None and "selector" in data:
+        interview_data.question_selector.restore(data["selector"], interview_data.pre_define_questions)
+    interview_data.state = InterviewState.for_questions(interview_data.num_predefined)
+    interview_data.state.rewind(tuple(data["resume_point"]))
+    interview_data.asked_index.add([turn.question_text for turn in interview_data.qna_history])
+    return True
+
+def history_chat_context(interview_data: InterviewData) -> Optional[ChatContext]:
+    """The interview so far as chat messages, to seed the interview agent of a
+    restored session. None for a session that has no history yet."""
+    if not interview_data.qna_history:
+        return None
+    chat_ctx = ChatContext()
+    for turn in interview_data.qna_history:
+        chat_ctx.add_message(role="assistant", content=turn.question_text)
+        chat_ctx.add_message(role="user", content=turn.answer)
+    return chat_ctx
+
+
+#----------------------------Redis--------------------------------
+async def _write(session_id: str, data: Optional[dict], previous: Optional[asyncio.Task]):
+    if previous is not None:
+        await asyncio.gather(previous, return_exceptions=True)
+    try:
+        if data is None:
+            await deleteSessionSnapshot(session_id)
+        else:
+            await setSessionSnapshot(session_id, data)
+    except Exception as e:
+        logger.error(f"Could not save session snapshot: {e}")
+
+def schedule_snapshot(interview_data: InterviewData):
+    """Snapshot the session now and write it in the background, so the turn
+    never waits on Redis. Once the interview has ended the snapshot is dropped."""
+    session_id = interview_data.session_id
+    if not session_id:
+        return
+    ended = interview_data.state.current_decision == InterviewPrompt.INTERVIEW_END
+    data = None if ended else snapshot(interview_data)
+    task = asyncio.create_task(_write(session_id, data, _writes.get(session_id)))
+    _writes[session_id] = task
+    task.add_done_callback(lambda done: _writes.pop(session_id, None) if _writes.get(session_id) is done else None)
+
+async def restore_session(interview_data: InterviewData) -> bool:
+    """Resume the session from its snapshot, if an earlier worker left one."""
+    if not interview_data.session_id:
+        return False
+    try:
+        data = await getSessionSnapshot(interview_data.session_id)
+    except Exception as e:
+        logger.error(f"Session snapshot unavailable, starting fresh: {e}")
+        return False
+    if not data or not restore(interview_data, data):
+        return False
+    logger.info(f"Restored session {interview_data.session_id} at turn {len(interview_data.qna_history)}")
+    return True
@@ -1,40 +1,134 @@
 import asyncio
-from livekit.agents import JobContext, WorkerOptions, cli
+import time
+from livekit.agents import JobContext, JobProcess, WorkerOptions, cli
 from livekit.agents.voice import AgentSession
 from livekit.plugins import google, silero, groq, cartesia
 from dotenv import load_dotenv
 from functools import partial
-from data_class.interview_data import InterviewData
-from Agent.agent import STTRefiningAgent
-from config.config import STT_REFINING_INSTRUCTIONS
-from RPC.agent_rpc import confirm_answer, skip_question, re_answer
-from test2 import CustomTTS
+from data_class.interview_data import (
+    InterviewData,
+    get_candidate_id,
+    get_latest_resume,
+    load_asked_questions,
+    save_asked_questions,
+    drop_repeated_resume_questions,
+)
+from Agent.agent import BaseAgent, STTRefiningAgent
+from config.config import (
+    STT_REFINING_INSTRUCTIONS,
+    ADAPTIVE_DIFFICULTY,
+    WORKER_MAX_JOBS,
+    WORKER_LOAD_THRESHOLD,
+    WORKER_IDLE_PROCESSES,
+)
+from RPC.agent_rpc import confirm_answer, skip_question, re_answer, get_interview_agent
+from transcript.transcript_sink import TranscriptSink
+from telemetry.latency_probe import TurnLatencyProbe
+from telemetry import metrics
+from data_class.context_window import ContextWindow, summarize_with_llm
+from RPC.question_prefetch import QuestionPrefetcher
+from data_class.resume_questions import get_resume_question_pool
+from data_class.question_bank import get_question_bank
+from data_class.question_index import get_bank_vectors
+from data_class.session_snapshot import restore_session
 import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("main_entrypoint")
 load_dotenv()
 
+# CustomTTS is the author's own TTS module and is not part of this repo
+try:
+    from test2 import CustomTTS
+except ImportError:
+    CustomTTS = None
+
+
+def create_plugins() -> dict:
+    """STT, LLM and TTS clients. They hold configuration and connection pools
+    but no per-session state, so one set serves every job of a process."""
+    return {
+        # "stt": CustomSTT("medium"),
+        "stt": groq.STT(model="whisper-large-v3-turbo",language="en"),
+        "llm": google.LLM(model="gemini-2.0-flash"),
+        "tts": CustomTTS() if CustomTTS else cartesia.TTS(),
+    }
+
+
+def prewarm(proc: JobProcess):
+    """
+    Runs once per job process, before it is handed a job: load the VAD model,
+    build the plugin clients and warm the question bank, so none of it is on
+    the path from job start to agent-ready.
+    """
+    started = time.perf_counter()
+    proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["plugins"] = create_plugins()
+    bank = get_question_bank()
+    get_bank_vectors(bank)
+    if ADAPTIVE_DIFFICULTY:
+        bank.ladder()
+    logger.info(f"Prewarmed job process in {time.perf_counter() - started:.2f}s")
+
+
+def worker_load(worker) -> float:
+    """Share of the worker's interview slots in use. LiveKit stops dispatching
+    to the worker once this reaches WORKER_LOAD_THRESHOLD."""
+    return min(1.0, len(worker.active_jobs) / WORKER_MAX_JOBS)
+
+
+def create_session(interview_data: InterviewData, warm: dict) -> AgentSession:
+    """Build the session from the prewarmed VAD and plugins (refer: prewarm),
+    loading them here only if the process was not prewarmed. Kept separate
+    from the entrypoint so the load-test harness can substitute fake plugins."""
+    plugins = warm.get("plugins") or create_plugins()
+    return AgentSession[InterviewData](
+        userdata=interview_data,
+        vad=warm.get("vad") or silero.VAD.load(),
+        **plugins,
+    )
+
+
+def log_task_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        logger.error(f"Background task {task.get_name()} failed: {task.exception()!r}")
+
 
 async def entrypoint(ctx: JobContext):
+    job_started = time.perf_counter()
+    metrics.start_exporter()
     await ctx.connect()
     logger.info("🚀 Starting interview session...")
     
-    interview_data = InterviewData()
+    interview_data = InterviewData(session_id=ctx.room.name)
 
-    session = AgentSession[InterviewData](
-        userdata=interview_data,
-        # stt=CustomSTT("medium"),
-        stt = groq.STT(model="whisper-large-v3-turbo",language="en"),
-        llm=google.LLM(model="gemini-2.0-flash"),
-        tts=CustomTTS(),
-        # tts=cartesia.TTS(),
-        vad=silero.VAD.load()
-    )
+    # Resolve the candidate and fetch the resume while the session starts up; a session
+    # interrupted on another worker is picked up from its snapshot meanwhile
+    restore_task = asyncio.create_task(restore_session(interview_data))
+    candidate_id_task = asyncio.create_task(get_candidate_id(ctx))
+    resume_task = asyncio.create_task(get_latest_resume(candidate_id_task))
+
+    session = create_session(interview_data, ctx.proc.userdata)
 
-    
-    
     # Store the STT refining agent in interview_data for easy access
     interview_data.refining_agent = STTRefiningAgent(instructions=STT_REFINING_INSTRUCTIONS)
+    interview_data.latency_probe = TurnLatencyProbe(session)
+    metrics.instrument_session(session)
+    interview_data.context_window = ContextWindow(partial(summarize_with_llm, session.llm))
+    interview_data.prefetcher = QuestionPrefetcher(llm=session.llm, tts=session.tts)
+
+    #----------------------Transcript persistence-------------------------
+    # Interview messages are appended as they are committed; the sink batches
+    # the writes in the background and is drained when the job shuts down.
+    interview_data.transcript_sink = TranscriptSink(session_id=interview_data.session_id)
+    interview_data.transcript_sink.start()
+    ctx.add_shutdown_callback(interview_data.transcript_sink.aclose)
+
+    @session.on("conversation_item_added")
+    def _record_interview_message(ev):
+        if isinstance(session.current_agent, BaseAgent):
+            interview_data.transcript_sink.append(
+                {"type": "message", "role": ev.item.role, "content": ev.item.text_content}
+            )
 
     #----------------------Registering the RPC methods-------------------------
     lp = ctx.room.local_participant
@@ -57,12 +151,49 @@ async def entrypoint(ctx: JobContext):
         room=ctx.room
     )
 
+    restored = await restore_task
+    interview_data.candidate_id = await candidate_id_task
+    interview_data.resume_data = await resume_task
     logger.info(f"Resume : {interview_data.resume_data}")
+    # The first question never depends on an answer; prepare it before the candidate asks for it
+    interview_data.prefetcher.start(interview_data, get_interview_agent(interview_data))
+
+    # Resume questions come from a pool generated once per (candidate, resume), off the critical path.
+    # Questions from the candidate's earlier sessions are loaded first so neither the pool nor the
+    # live picks repeat them; this session's questions are saved for the next one at shutdown.
+    # A restored session keeps the pool it was using.
+    async def load_resume_questions():
+        await load_asked_questions(interview_data)
+        if restored:
+            return
+        pool = await get_resume_question_pool(
+            interview_data.candidate_id, interview_data.resume_data, session.llm
+        )
+        interview_data.resume_questions = drop_repeated_resume_questions(interview_data, pool)
+    resume_questions_task = asyncio.create_task(load_resume_questions(), name="load_resume_questions")
+    resume_questions_task.add_done_callback(log_task_failure)
+
+    async def stop_resume_questions():
+        # The shutdown callback also keeps the task referenced for the whole session
+        resume_questions_task.cancel()
+        await asyncio.gather(resume_questions_task, return_exceptions=True)
+    ctx.add_shutdown_callback(stop_resume_questions)
+    ctx.add_shutdown_callback(partial(save_asked_questions, interview_data))
     #-------------------sending agent-ready message to participants-------------
-    await asyncio.sleep(1)  # optional buffer
+    # The candidate is in the room already (candidate_id_task waited for them),
+    # and the session and RPC methods are up: nothing left to wait for
     await ctx.room.local_participant.publish_data(
         b"agent-ready",
     )
+    ready = time.perf_counter() - job_started
+    metrics.observe_job_ready(ready)
+    logger.info(f"Agent ready {ready:.2f}s after job start")
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
+    cli.run_app(WorkerOptions(
+        entrypoint_fnc=entrypoint,
+        prewarm_fnc=prewarm,
+        load_fnc=worker_load,
+        load_threshold=WORKER_LOAD_THRESHOLD,
+        num_idle_processes=WORKER_IDLE_PROCESSES,
+    ))
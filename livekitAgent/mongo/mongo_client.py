@@ -1,24 +1,39 @@
-from pymongo import MongoClient
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
+import asyncio
 import logging
 import os
 from dotenv import load_dotenv
 load_dotenv()
 logging.getLogger("pymongo").setLevel(logging.WARNING)
 
-# Connect to MongoDB with authentication
-client = MongoClient(os.getenv("MONGO_CONNECTION_URL"))
+# One client (and so one connection pool) per worker process, created on first
+# use so that importing this module (and every idle prewarmed worker) stays cheap.
+client = None
 
-# Select database and collection
-db = client["livekit"]
-collection = db["resume"]
+def get_database():
+    global client
+    if client is None:
+        from pymongo import AsyncMongoClient
+        client = AsyncMongoClient(
+            os.getenv("MONGO_CONNECTION_URL"),
+            maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "20")),
+        )
+    return client["livekit"]
+
+def get_collection(name: str = "resume"):
+    return get_database()[name]
 
 # Predefined ObjectId
 doc_id = ObjectId("686b60d2a6601148142a968b")
 
-# Insert test document only if it doesn't exist
-if not collection.find_one({"_id": doc_id}):
-    collection.insert_one({
+# Insert test document only if it doesn't exist.
+# Not run by the agent worker; seed once with: python -m mongo.mongo_client
+async def seedTestCandidate():
+    collection = get_collection()
+    if await collection.find_one({"_id": doc_id}):
+        return
+    await collection.insert_one({
         "_id": doc_id,
         "resume": """John Smith - Software Developer
 
@@ -63,17 +78,23 @@ Certifications:
     })
 
 # Fetch candidate data by ObjectId
-def getCandidateDBData(id: str):
+async def getCandidateDBData(id: str):
+    """The candidate document, or None if there is no such candidate. Database
+    errors are raised, so callers never mistake an outage for an unknown id."""
     try:
-        return collection.find_one({"_id": ObjectId(id)})
-    except Exception as e:
-        print(f"Error: {e}")
+        object_id = ObjectId(id)
+    except (InvalidId, TypeError):
         return None
+    return await get_collection().find_one({"_id": object_id})
 
 # Example usage
-if __name__ == "__main__":
-    candidate = getCandidateDBData("686b60d2a6601148142a968b")
+async def _main():
+    await seedTestCandidate()
+    candidate = await getCandidateDBData("686b60d2a6601148142a968b")
     if candidate:
         print("Resume:\n", candidate.get("resume"))
     else:
         print("Candidate not found.")
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,16 +1,255 @@
-import redis
+import asyncio
+import inspect
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+import redis.asyncio as redis
+from dotenv import load_dotenv
+from config.config import (
+    RESUME_CACHE_TTL,
+    RESUME_NEGATIVE_CACHE_TTL,
+    RESUME_L1_CACHE_SIZE,
+    RESUME_L1_CACHE_TTL,
+    ASKED_QUESTIONS_HISTORY,
+    ASKED_QUESTIONS_TTL,
+    SESSION_SNAPSHOT_TTL,
+)
 from mongo.mongo_client import getCandidateDBData
+from telemetry import metrics
+load_dotenv()
 
-client = redis.Redis(host='localhost', port=6379, decode_responses=True)
+# One connection pool per worker process, shared by every session it runs.
+# Connections are opened lazily, inside the event loop that first uses them.
+pool = redis.ConnectionPool.from_url(
+    os.getenv("REDIS_URL", "redis://localhost:6379"),
+    max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+    decode_responses=True,
+)
+client = redis.Redis(connection_pool=pool)
 
+MISSING = "__missing__"  # negative-cache marker for unknown candidate ids
+LOCK_TIMEOUT = 5.0       # seconds a worker may hold the fill lock for one id
+# Deletes the fill lock only if it still holds this worker's token: once it has
+# expired another worker may own it
+RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
 
-def addCandidateData(id:str):
-    data = getCandidateDBData()
-    client.hset(id, mapping={"resume": data.get("resume")})
-    return data
 
-def getCandidateData(id:str):
-    data = client.hget(id, "resume")
-    if data:
-        return data
-    return addCandidateData(id=id)
\ No newline at end of file
+@dataclass
+class CacheStats:
+    l1_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    negative_hits: int = 0
+    db_fetches: int = 0
+    coalesced: int = 0
+    latency: dict[str, list[float]] = field(default_factory=dict)
+
+    def observe(self, outcome: str, seconds: float):
+        # [count, total, max] per outcome
+        entry = self.latency.setdefault(outcome, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "l1_hits": self.l1_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "db_fetches": self.db_fetches,
+            "coalesced": self.coalesced,
+            "latency": {
+                outcome: {"count": count, "avg": total / count, "max": worst}
+                for outcome, (count, total, worst) in self.latency.items()
+            },
+        }
+
+
+class ResumeCache:
+    """
+    Read-through cache for candidate resumes: in-process LRU -> Redis -> Mongo.
+
+    Concurrent misses for the same id share a single fill, inside this process
+    through an in-flight task and across workers through a short Redis lock.
+    Unknown ids are cached as MISSING for a shorter TTL so they don't keep
+    hitting Mongo. Failed lookups are not cached at all.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        fetch: Callable[[str], Awaitable[Optional[dict]]],
+        ttl: int = RESUME_CACHE_TTL,
+        negative_ttl: int = RESUME_NEGATIVE_CACHE_TTL,
+        l1_size: int = RESUME_L1_CACHE_SIZE,
+        l1_ttl: float = RESUME_L1_CACHE_TTL,
+    ):
+        self._redis = redis_client
+        self._fetch = fetch
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._l1_size = l1_size
+        self._l1_ttl = l1_ttl
+        self._l1: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._release_lock = redis_client.register_script(RELEASE_LOCK)
+        self.stats = CacheStats()
+
+    #----------------------------L1 (in-process)--------------------------------
+    def _l1_get(self, id: str) -> Optional[str]:
+        entry = self._l1.get(id)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._l1[id]
+            return None
+        self._l1.move_to_end(id)
+        return value
+
+    def _l1_put(self, id: str, value: str):
+        # An unknown id is kept no longer than Redis keeps it, so a new candidate shows up in time
+        ttl = min(self._l1_ttl, self._negative_ttl) if value == MISSING else self._l1_ttl
+        self._l1[id] = (value, time.monotonic() + ttl)
+        self._l1.move_to_end(id)
+        while len(self._l1) > self._l1_size:
+            self._l1.popitem(last=False)
+
+    def invalidate(self, id: str):
+        self._l1.pop(id, None)
+
+    #----------------------------L2 (Redis) + Mongo------------------------------
+    async def _store(self, id: str, value: str):
+        ttl = self._negative_ttl if value == MISSING else self._ttl
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(id, mapping={"resume": value})
+            pipe.expire(id, ttl)
+            await pipe.execute()
+
+    async def _load_from_db(self, id: str) -> str:
+        # A Mongo error propagates: only a lookup that found nothing is cached as MISSING
+        self.stats.db_fetches += 1
+        data = await self._fetch(id)
+        value = data.get("resume") if data else None
+        return value or MISSING
+
+    async def _fill(self, id: str) -> str:
+        value = await self._redis.hget(id, "resume")
+        if value is not None:
+            self.stats.redis_hits += 1
+            return value
+
+        self.stats.misses += 1
+        lock_key = f"{id}:fill-lock"
+        token = uuid.uuid4().hex
+        if await self._redis.set(lock_key, token, nx=True, px=int(LOCK_TIMEOUT * 1000)):
+            try:
+                value = await self._load_from_db(id)
+                await self._store(id, value)
+                return value
+            finally:
+                await self._release_lock(keys=[lock_key], args=[token])
+
+        # Another worker is filling this id; wait for it rather than hitting Mongo too
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            value = await self._redis.hget(id, "resume")
+            if value is not None:
+                self.stats.redis_hits += 1
+                return value
+        value = await self._load_from_db(id)
+        await self._store(id, value)
+        return value
+
+    async def get(self, id: str) -> Optional[str]:
+        """Return the resume for `id`, or None if the candidate is unknown."""
+        start = time.perf_counter()
+        value = self._l1_get(id)
+        if value is not None:
+            self.stats.l1_hits += 1
+            outcome = "l1"
+        else:
+            task = self._in_flight.get(id)
+            if task is None:
+                task = asyncio.create_task(self._fill(id))
+                self._in_flight[id] = task
+                task.add_done_callback(lambda _: self._in_flight.pop(id, None))
+                outcome = "fill"
+            else:
+                self.stats.coalesced += 1
+                outcome = "coalesced"
+            # shield: one caller being cancelled must not cancel the shared fill
+            value = await asyncio.shield(task)
+            self._l1_put(id, value)
+        elapsed = time.perf_counter() - start
+        self.stats.observe(outcome, elapsed)
+        metrics.observe_lookup(outcome, elapsed)
+
+        if value == MISSING:
+            self.stats.negative_hits += 1
+            return None
+        return value
+
+
+resume_cache = ResumeCache(client, getCandidateDBData)
+
+
+async def getCandidateData(id: str | Awaitable[str]):
+    """Return the candidate's resume. `id` may be awaitable, e.g. a task that
+    resolves once the participant has joined."""
+    if inspect.isawaitable(id):
+        id = await id
+    return await resume_cache.get(id)
+
+
+#----------------------------Resume question pools--------------------------------
+# Stored as a field of the candidate's hash, next to the cached resume, keyed by
+# the resume's hash so an updated resume never serves stale questions.
+async def getResumeQuestions(id: str, resume_hash: str):
+    data = await client.hget(id, f"resume_questions:{resume_hash}")
+    return json.loads(data) if data else None
+
+async def setResumeQuestions(id: str, resume_hash: str, questions: list[dict]):
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.hset(id, f"resume_questions:{resume_hash}", json.dumps(questions, ensure_ascii=False))
+        # keep the resume's TTL if it has one, otherwise give the key the same lifetime
+        pipe.expire(id, RESUME_CACHE_TTL, nx=True)
+        await pipe.execute()
+
+
+#----------------------------Questions asked in earlier sessions--------------------------------
+# A capped list per candidate, so retakes don't get the same questions again
+async def getAskedQuestions(id: str) -> list[str]:
+    return await client.lrange(f"{id}:asked", 0, -1)
+
+async def addAskedQuestions(id: str, questions: list[str]):
+    if not questions:
+        return
+    key = f"{id}:asked"
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.rpush(key, *questions)
+        pipe.ltrim(key, -ASKED_QUESTIONS_HISTORY, -1)
+        pipe.expire(key, ASKED_QUESTIONS_TTL)
+        await pipe.execute()
+
+
+#----------------------------Session snapshots--------------------------------
+# Latest state of a running interview, so another worker can resume it after a crash
+async def getSessionSnapshot(session_id: str) -> Optional[dict]:
+    data = await client.get(f"{session_id}:snapshot")
+    return json.loads(data) if data else None
+
+async def setSessionSnapshot(session_id: str, snapshot: dict):
+    await client.set(f"{session_id}:snapshot", json.dumps(snapshot, ensure_ascii=False), ex=SESSION_SNAPSHOT_TTL)
+
+async def deleteSessionSnapshot(session_id: str):
+    await client.delete(f"{session_id}:snapshot")
@@ -0,0 +1,104 @@
+import json
+import logging
+import os
+import re
+import time
+from typing import Protocol
+from config.config import SCORING_MODEL, SCORING_INSTRUCTIONS
+from data_class.adaptive_selector import SKIPPED_ANSWER
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("scoring_backends.py")
+
+WORD = re.compile(r"[a-z0-9]+")
+# Words that say nothing about whether a rubric point was covered
+STOP_WORDS = frozenset("a an and are as at be by for from in is it of on or such than that the their them then they this to with".split())
+
+
+#----------------------------Helper methods--------------------------------
+def parse_scores(text: str) -> list[dict]:
+    """Parse the LLM's JSON array of {id, score, feedback}, tolerating code fences
+    around it. Entries without an id or a numeric score are dropped."""
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        return []
+    try:
+        entries = json.loads(match.group(0))
+    except ValueError:
+        return []
+    scores = []
+    for entry in entries:
+        if not isinstance(entry, dict) or "id" not in entry:
+            continue
+        try:
+            score = min(10.0, max(0.0, float(entry.get("score"))))
+        except (TypeError, ValueError):
+            continue
+        scores.append({"id": str(entry["id"]), "score": score, "feedback": str(entry.get("feedback", ""))})
+    return scores
+
+
+#----------------------------Backends--------------------------------
+# A backend scores a batch of items {id, question, answer, rubric} and returns
+# [{id, score, feedback}]. It is built once per worker process and may miss
+# some ids; the pipeline retries those. refer: scoring/pipeline.py
+class ScoringBackend(Protocol):
+    def score(self, items: list[dict]) -> list[dict]: ...
+
+
+class StubBackend:
+    """
+    Deterministic, offline scorer for local runs and benchmarks: the share of
+    rubric words the answer mentions, plus a little for length. `latency`
+    (seconds per call) stands in for the LLM round trip.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def _score(self, item: dict) -> dict:
+        answer = item["answer"]
+        if not answer or answer == SKIPPED_ANSWER:
+            return {"id": item["id"], "score": 0.0, "feedback": "No answer given."}
+        words = set(WORD.findall(answer.lower()))
+        expected = {w for point in item["rubric"] for w in WORD.findall(point.lower())} - STOP_WORDS
+        covered = len(expected & words) / len(expected) if expected else 0.0
+        score = round(min(10.0, 8 * covered + min(2.0, len(answer.split()) / 40)), 1)
+        return {"id": item["id"], "score": score, "feedback": f"Covers {covered:.0%} of the rubric terms."}
+
+    def score(self, items: list[dict]) -> list[dict]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._score(item) for item in items]
+
+
+class GeminiBackend:
+    """One generate_content call per batch, asking for a JSON array of scores."""
+
+    def __init__(self, model: str = SCORING_MODEL):
+        from google import genai
+        from google.genai import types
+        self.model = model
+        self.client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+        self.config = types.GenerateContentConfig(
+            system_instruction=SCORING_INSTRUCTIONS,
+            response_mime_type="application/json",
+            temperature=0.0,
+        )
+
+    def score(self, items: list[dict]) -> list[dict]:
+        response = self.client.models.generate_content(
+            model=self.model,
+            contents=json.dumps(items, ensure_ascii=False),
+            config=self.config,
+        )
+        scores = parse_scores(response.text or "")
+        if len(scores) < len(items):
+            logger.warning(f"Scored {len(scores)} of {len(items)} answers in one call")
+        return scores
+
+
+BACKENDS = {
+    "gemini": GeminiBackend,
+    "stub": StubBackend,
+}
@@ -0,0 +1,306 @@
+"""
+Offline scoring of completed interviews.
+
+Reads the QnA records the transcript sink wrote, from the configured
+TRANSCRIPT_BACKEND (transcripts/<session>.jsonl files, the Redis streams
+transcript:<session> or the Mongo transcripts collection, refer:
+transcript/transcript_sink.py) and legacy interview_qna.json dumps,
+scores every answer against the rubric of its question in questions.json,
+and upserts one score document per session into Mongo.
+
+Answers from many interviews share each LLM call (SCORING_BATCH_SIZE) and the
+calls run across a process pool (SCORING_WORKERS), each process holding one
+backend client. Answers a call left out are retried once in a later batch.
+
+Run from the livekitAgent folder:
+    python -m scoring.pipeline                      # score new completed interviews
+    python -m scoring.pipeline --backend stub --output scores.jsonl   # no LLM, no Mongo
+    python -m scoring.pipeline --source redis       # transcripts from another sink backend
+"""
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+from config.config import (
+    TRANSCRIPT_BACKEND,
+    TRANSCRIPT_DIR,
+    SCORING_BACKEND,
+    SCORING_BATCH_SIZE,
+    SCORING_WORKERS,
+    SCORING_COLLECTION,
+    SCORING_DEFAULT_RUBRIC,
+)
+from data_class.question_bank import QuestionBank, get_question_bank
+from scoring.backends import BACKENDS, ScoringBackend
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("scoring_pipeline.py")
+
+LEGACY_QNA_FILE = "interview_qna.json"
+RETRIES = 1
+
+
+@dataclass(slots=True)
+class Interview:
+    session_id: str
+    candidate_id: str = ''
+    turns: list[dict] = field(default_factory=list)  # {"question", "answer"} in the order asked
+    complete: bool = False
+
+
+#----------------------------Loading--------------------------------
+def interview_from_records(session_id: str, records: Iterable[dict]) -> Interview:
+    """An interview from the transcript sink's records, in the order written. It
+    is complete once the session wrote its end record, refer: RPC/agent_rpc.py end_interview."""
+    interview = Interview(session_id=session_id)
+    for record in records:
+        if record.get("type") == "qna":
+            interview.turns.append({"question": record["question"], "answer": record["answer"]})
+        elif record.get("type") == "end":
+            interview.complete = True
+            interview.candidate_id = record.get("candidate_id", '')
+    return interview
+
+def read_jsonl(path: str):
+    with open(path, encoding="utf-8") as fp:
+        for line in fp:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # a line cut short by a crash
+
+def load_transcript(path: str) -> Interview:
+    """An interview from the file backend's <session>.jsonl."""
+    return interview_from_records(os.path.splitext(os.path.basename(path))[0], read_jsonl(path))
+
+async def load_redis_transcripts(client) -> list[Interview]:
+    """Interviews from the redis backend's streams, transcript:<session>."""
+    interviews = []
+    async for key in client.scan_iter(match="transcript:*", count=500):
+        entries = await client.xrange(key)
+        records = [json.loads(fields["record"]) for _, fields in entries]
+        interviews.append(interview_from_records(key.removeprefix("transcript:"), records))
+    return interviews
+
+async def load_mongo_transcripts(collection) -> list[Interview]:
+    """Interviews from the mongo backend's collection, one document per record."""
+    by_session: dict[str, list[dict]] = {}
+    cursor = collection.find({"type": {"$in": ["qna", "end"]}}, {"_id": 0}).sort([("session_id", 1), ("ts", 1)])
+    async for record in cursor:
+        by_session.setdefault(record["session_id"], []).append(record)
+    return [interview_from_records(session_id, records) for session_id, records in by_session.items()]
+
+def load_legacy(path: str) -> Interview:
+    """An interview from an interview_qna.json dump: a JSON list of {question, answer}.
+    Those were written once the interview was over, so they count as complete."""
+    with open(path, encoding="utf-8") as fp:
+        turns = json.load(fp)
+    session_id = os.path.splitext(os.path.basename(os.path.abspath(path)))[0]
+    if session_id == os.path.splitext(LEGACY_QNA_FILE)[0]:
+        session_id = f"legacy-{os.path.basename(os.path.dirname(os.path.abspath(path)))}"
+    return Interview(
+        session_id=session_id,
+        turns=[{"question": t.get("question", ""), "answer": t.get("answer", "")} for t in turns],
+        complete=True,
+    )
+
+def scorable(interviews: list[Interview], include_incomplete: bool = False) -> list[Interview]:
+    return [i for i in interviews if i.turns and (i.complete or include_incomplete)]
+
+def load_interviews(directory: str, legacy: list[str], include_incomplete: bool = False) -> list[Interview]:
+    interviews = [load_transcript(path) for path in sorted(glob.glob(os.path.join(directory, "*.jsonl")))]
+    interviews += [load_legacy(path) for path in legacy if os.path.exists(path)]
+    return scorable(interviews, include_incomplete)
+
+async def load_interviews_from(source: str, directory: str, legacy: list[str], include_incomplete: bool = False) -> list[Interview]:
+    """Interviews from the transcript backend `source` ("file", "redis" or "mongo"), plus `legacy` dumps."""
+    if source == "file":
+        return load_interviews(directory, legacy, include_incomplete)
+    if source == "redis":
+        from redisLogic.redis_client import client
+        interviews = await load_redis_transcripts(client)
+    elif source == "mongo":
+        from mongo.mongo_client import get_collection
+        interviews = await load_mongo_transcripts(get_collection("transcripts"))
+    else:
+        raise ValueError(f"Unknown transcript source {source!r}")
+    interviews += [load_legacy(path) for path in legacy if os.path.exists(path)]
+    return scorable(interviews, include_incomplete)
+
+
+#----------------------------Batching--------------------------------
+def rubric_for(bank: QuestionBank, question: str) -> list[str]:
+    position = bank.locate(question)
+    if position is not None and bank.questions[position].get("rubric"):
+        return bank.questions[position]["rubric"]
+    return SCORING_DEFAULT_RUBRIC
+
+def build_items(interviews: list[Interview], bank: QuestionBank) -> tuple[list[dict], dict[str, tuple[int, int]]]:
+    """Every answer as a scoring item, with a short id (tokens are paid per item)
+    mapped back to its (interview, turn)."""
+    items, where = [], {}
+    for i, interview in enumerate(interviews):
+        for t, turn in enumerate(interview.turns):
+            item_id = str(len(items))
+            where[item_id] = (i, t)
+            items.append({
+                "id": item_id,
+                "question": turn["question"],
+                "answer": turn["answer"],
+                "rubric": rubric_for(bank, turn["question"]),
+            })
+    return items, where
+
+def batches(items: list[dict], size: int) -> list[list[dict]]:
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+#----------------------------Worker processes--------------------------------
+_backend: Optional[ScoringBackend] = None
+
+def init_worker(backend: str, options: dict):
+    """Process pool initializer: one backend client per process, reused for every batch."""
+    global _backend
+    _backend = BACKENDS[backend](**options)
+
+def score_batch(items: list[dict]) -> list[dict]:
+    try:
+        return _backend.score(items)
+    except Exception as e:
+        logger.error(f"Scoring call for {len(items)} answers failed: {e}")
+        return []
+
+
+class InlineExecutor(Executor):
+    """Runs each batch in the calling process, for --workers 0."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+async def score_items(items: list[dict], executor: Executor, batch_size: int) -> tuple[dict[str, dict], int]:
+    """Score every item; returns the scores by id and the number of backend calls."""
+    loop = asyncio.get_running_loop()
+    scores: dict[str, dict] = {}
+    pending, calls = items, 0
+    for attempt in range(RETRIES + 1):
+        jobs = [loop.run_in_executor(executor, score_batch, batch) for batch in batches(pending, batch_size)]
+        calls += len(jobs)
+        expected = {item["id"] for item in pending}
+        for result in await asyncio.gather(*jobs):
+            for entry in result:
+                if entry["id"] in expected:
+                    scores[entry["id"]] = entry
+        pending = [item for item in pending if item["id"] not in scores]
+        if not pending:
+            break
+        if attempt < RETRIES:
+            logger.info(f"Retrying {len(pending)} unscored answers")
+    if pending:
+        logger.warning(f"{len(pending)} answers left unscored")
+    return scores, calls
+
+def session_document(interview: Interview, scores: list[Optional[dict]], backend: str) -> dict:
+    answers = []
+    for turn, score in zip(interview.turns, scores):
+        answers.append({
+            **turn,
+            "score": score["score"] if score else None,
+            "feedback": score["feedback"] if score else None,
+        })
+    scored = [a["score"] for a in answers if a["score"] is not None]
+    return {
+        "session_id": interview.session_id,
+        "candidate_id": interview.candidate_id,
+        "overall": round(sum(scored) / len(scored), 2) if scored else None,
+        "answers": answers,
+        "complete": interview.complete,
+        "backend": backend,
+        "scored_at": time.time(),
+    }
+
+
+#----------------------------Mongo--------------------------------
+async def scored_sessions(collection, session_ids: list[str]) -> set[str]:
+    cursor = collection.find({"session_id": {"$in": session_ids}}, {"session_id": 1})
+    return {doc["session_id"] async for doc in cursor}
+
+async def write_scores(collection, documents: list[dict]):
+    """Upsert all score documents in one unordered bulk write, keyed by session."""
+    from pymongo import UpdateOne
+    if not documents:
+        return
+    result = await collection.bulk_write(
+        [UpdateOne({"session_id": doc["session_id"]}, {"$set": doc}, upsert=True) for doc in documents],
+        ordered=False,
+    )
+    logger.info(f"Saved scores: {result.upserted_count} new, {result.modified_count} updated")
+
+
+#----------------------------Pipeline--------------------------------
+async def run(
+    interviews: list[Interview],
+    backend: str = SCORING_BACKEND,
+    backend_options: Optional[dict] = None,
+    batch_size: int = SCORING_BATCH_SIZE,
+    workers: int = SCORING_WORKERS,
+) -> tuple[list[dict], int]:
+    """Score `interviews`; returns their score documents and the number of backend calls."""
+    items, where = build_items(interviews, get_question_bank())
+    if workers > 0:
+        executor = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(backend, backend_options or {}))
+    else:
+        init_worker(backend, backend_options or {})
+        executor = InlineExecutor()
+    with executor:
+        scores, calls = await score_items(items, executor, batch_size)
+    per_turn = [[None] * len(interview.turns) for interview in interviews]
+    for item_id, entry in scores.items():
+        i, t = where[item_id]
+        per_turn[i][t] = entry
+    documents = [session_document(interview, per_turn[i], backend) for i, interview in enumerate(interviews)]
+    return documents, calls
+
+async def main(args):
+    interviews = await load_interviews_from(args.source, args.transcripts, args.legacy, args.include_incomplete)
+    collection = None
+    if not args.output:
+        from mongo.mongo_client import get_collection
+        collection = get_collection(SCORING_COLLECTION)
+        if not args.rescore and interviews:
+            done = await scored_sessions(collection, [i.session_id for i in interviews])
+            interviews = [i for i in interviews if i.session_id not in done]
+    if not interviews:
+        logger.info("No interviews to score")
+        return
+    started = time.perf_counter()
+    documents, calls = await run(interviews, args.backend, batch_size=args.batch_size, workers=args.workers)
+    logger.info(f"Scored {len(interviews)} interviews in {calls} calls, {time.perf_counter() - started:.1f}s")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            for doc in documents:
+                fp.write(json.dumps(doc, ensure_ascii=False) + "\n")
+    else:
+        await write_scores(collection, documents)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score completed interviews offline")
+    parser.add_argument("--source", default=TRANSCRIPT_BACKEND, choices=["file", "redis", "mongo"], help="transcript backend to read")
+    parser.add_argument("--transcripts", default=TRANSCRIPT_DIR, help="folder of <session>.jsonl transcripts (--source file)")
+    parser.add_argument("--legacy", nargs="*", default=[LEGACY_QNA_FILE], help="interview_qna.json files to score too")
+    parser.add_argument("--backend", default=SCORING_BACKEND, choices=sorted(BACKENDS))
+    parser.add_argument("--batch-size", type=int, default=SCORING_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=SCORING_WORKERS, help="0 scores in this process")
+    parser.add_argument("--include-incomplete", action="store_true", help="also score interviews that never ended")
+    parser.add_argument("--rescore", action="store_true", help="score sessions that already have scores again")
+    parser.add_argument("--output", help="write score documents to this JSONL file instead of Mongo")
+    asyncio.run(main(parser.parse_args()))
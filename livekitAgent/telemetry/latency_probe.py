@@ -0,0 +1,56 @@
+import logging
+import time
+from collections import deque
+from typing import Optional
+from telemetry import metrics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("latency_probe.py")
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+class TurnLatencyProbe:
+    """
+    Measures, per turn, the time from an RPC arriving to the agent starting to
+    speak (the first TTS audio reaching the room).
+
+    The RPC handler calls `mark_rpc`; the probe listens for the session's
+    agent_state_changed event and closes the measurement on "speaking".
+    """
+
+    def __init__(self, session, max_samples: int = 1000):
+        self.samples: dict[str, deque] = {}
+        self._max_samples = max_samples
+        self._pending: Optional[tuple[str, float]] = None
+        session.on("agent_state_changed", self._on_agent_state_changed)
+
+    def mark_rpc(self, method: str):
+        self._pending = (method, time.perf_counter())
+
+    def _on_agent_state_changed(self, ev):
+        if ev.new_state != "speaking" or self._pending is None:
+            return
+        method, started_at = self._pending
+        self._pending = None
+        elapsed = time.perf_counter() - started_at
+        self.samples.setdefault(method, deque(maxlen=self._max_samples)).append(elapsed)
+        metrics.observe_first_audio(method, elapsed)
+        logger.info(f"⏱️ {method}: RPC -> first TTS audio {elapsed * 1000:.0f} ms")
+
+    def summary(self) -> dict:
+        return {
+            method: {
+                "count": len(values),
+                "p50": percentile(list(values), 50),
+                "p90": percentile(list(values), 90),
+                "p99": percentile(list(values), 99),
+            }
+            for method, values in self.samples.items()
+        }
@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("metrics.py")
+
+# Off unless METRICS_ENABLED is set; prometheus_client is only imported when on.
+ENABLED = os.getenv("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+# Seconds; spans from sub-millisecond bookkeeping up to a slow LLM turn
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = nullcontext()
+_exporter_started = False
+
+if ENABLED:
+    try:
+        from prometheus_client import Counter, Histogram
+    except ImportError:
+        logger.error("METRICS_ENABLED is set but prometheus_client is not installed; metrics disabled")
+        ENABLED = False
+
+if ENABLED:
+    RPC_SECONDS = Histogram(
+        "interview_rpc_seconds", "RPC handler time, receipt to switch-back", ["method"], buckets=BUCKETS
+    )
+    STAGE_SECONDS = Histogram(
+        "interview_stage_seconds", "Time spent in one stage of an RPC turn", ["method", "stage"], buckets=BUCKETS
+    )
+    FIRST_AUDIO_SECONDS = Histogram(
+        "interview_first_audio_seconds", "RPC receipt to the agent starting to speak", ["method"], buckets=BUCKETS
+    )
+    MODEL_SECONDS = Histogram(
+        "interview_model_latency_seconds", "Plugin latency reported by the session (llm_ttft, tts_ttfb, stt)", ["kind"], buckets=BUCKETS
+    )
+    LOOKUP_SECONDS = Histogram(
+        "candidate_lookup_seconds", "Candidate resume lookup time by cache outcome", ["outcome"], buckets=BUCKETS
+    )
+    JOB_READY_SECONDS = Histogram(
+        "job_ready_seconds", "Job start to the agent-ready message", buckets=BUCKETS
+    )
+    STT_REFINEMENTS = Counter(
+        "stt_refinements", "Utterance refinements by path: the rules alone or the LLM, and why", ["path", "reason"]
+    )
+
+
+#----------------------------Per-turn traces--------------------------------
+class TurnTrace:
+    """
+    Stage timings of one RPC turn. `span` times a block, `mark` records the
+    time from RPC receipt to a point in the turn; `finish` exports everything
+    as histogram observations plus one structured log line.
+    """
+
+    __slots__ = ("method", "started_at", "stages")
+
+    def __init__(self, method: str):
+        self.method = method
+        self.started_at = time.perf_counter()
+        self.stages: dict[str, float] = {}
+
+    @contextmanager
+    def span(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[stage] = self.stages.get(stage, 0.0) + time.perf_counter() - start
+
+    def mark(self, stage: str):
+        self.stages[stage] = time.perf_counter() - self.started_at
+
+    def finish(self):
+        total = time.perf_counter() - self.started_at
+        RPC_SECONDS.labels(self.method).observe(total)
+        for stage, seconds in self.stages.items():
+            STAGE_SECONDS.labels(self.method, stage).observe(seconds)
+        logger.info(json.dumps({
+            "event": "turn_trace",
+            "method": self.method,
+            "total_ms": round(total * 1000, 1),
+            "stages_ms": {stage: round(seconds * 1000, 1) for stage, seconds in self.stages.items()},
+        }))
+
+
+class _NullTrace:
+    """Stand-in used when metrics are off: every call is a no-op."""
+
+    __slots__ = ()
+
+    def span(self, stage: str):
+        return _NOOP
+
+    def mark(self, stage: str):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+def start_turn(method: str):
+    return TurnTrace(method) if ENABLED else NULL_TRACE
+
+
+#----------------------------Single observations--------------------------------
+def observe_first_audio(method: str, seconds: float):
+    if ENABLED:
+        FIRST_AUDIO_SECONDS.labels(method).observe(seconds)
+
+def observe_lookup(outcome: str, seconds: float):
+    if ENABLED:
+        LOOKUP_SECONDS.labels(outcome).observe(seconds)
+
+def observe_job_ready(seconds: float):
+    if ENABLED:
+        JOB_READY_SECONDS.observe(seconds)
+
+def observe_refinement(used_llm: bool, reasons: list[str]):
+    if ENABLED:
+        STT_REFINEMENTS.labels("llm" if used_llm else "rules", reasons[0] if reasons else "").inc()
+
+def on_session_metrics(ev):
+    """metrics_collected listener: LLM time to first token, TTS time to first
+    byte and STT duration as reported by the plugins themselves."""
+    m = ev.metrics
+    ttft = getattr(m, "ttft", None)
+    if ttft is not None and ttft >= 0:
+        MODEL_SECONDS.labels("llm_ttft").observe(ttft)
+    ttfb = getattr(m, "ttfb", None)
+    if ttfb is not None and ttfb >= 0:
+        MODEL_SECONDS.labels("tts_ttfb").observe(ttfb)
+    if type(m).__name__ == "STTMetrics":
+        MODEL_SECONDS.labels("stt").observe(m.duration)
+
+def instrument_session(session):
+    if ENABLED:
+        session.on("metrics_collected", on_session_metrics)
+
+
+#----------------------------Exporter--------------------------------
+def start_exporter(port: int = METRICS_PORT):
+    """
+    Serve /metrics from this worker process, once. Job processes of the same
+    worker each have their own registry; set PROMETHEUS_MULTIPROC_DIR to have
+    whichever process owns the port serve the aggregate of all of them.
+    """
+    global _exporter_started
+    if not ENABLED or _exporter_started:
+        return
+    _exporter_started = True
+    from prometheus_client import CollectorRegistry, REGISTRY, start_http_server
+
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    try:
+        start_http_server(port, registry=registry)
+        logger.info(f"📈 Metrics exporter listening on :{port}/metrics")
+    except OSError as e:
+        logger.info(f"Metrics port {port} already served by another process: {e}")
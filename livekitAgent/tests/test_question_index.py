@@ -0,0 +1,64 @@
+"""
+Repeat detection between questions, and the question bank reload that
+embeds a changed bank off the event loop. Run from the livekitAgent folder:
+    python -m pytest -q tests
+"""
+import asyncio
+import json
+import os
+
+import pytest
+
+from data_class import question_bank
+from data_class.question_index import QuestionIndex
+
+SAME = [
+    ("What is hoisting in JavaScript?", "Explain hoisting."),
+    ("What's the difference between normal functions and arrow functions?", "How do arrow functions differ from regular functions?"),
+    ("What are promises in JS?", "What is a Promise in JavaScript?"),
+    ("What is closure in JavaScript?", "Explain closures in JS."),
+]
+DIFFERENT = [
+    ("What is virtual DOM?", "What is DOM?"),
+    ("What is useEffect?", "What is useState?"),
+    ("What are hooks in React?", "Difference between useMemo and useCallback hooks in React."),
+]
+
+
+@pytest.mark.parametrize("asked, candidate", SAME)
+def test_rephrased_question_is_a_repeat(asked, candidate):
+    index = QuestionIndex()
+    index.add([asked])
+    assert index.is_duplicate(candidate)
+
+
+@pytest.mark.parametrize("asked, candidate", DIFFERENT)
+def test_different_question_is_not_a_repeat(asked, candidate):
+    index = QuestionIndex()
+    index.add([asked])
+    assert not index.is_duplicate(candidate)
+
+
+def write_bank(path, texts, mtime):
+    with open(path, "w") as fp:
+        json.dump([{"question": text, "difficulty": "basic"} for text in texts], fp)
+    os.utime(path, (mtime, mtime))
+
+
+def test_reload_is_embedded_before_it_is_served(tmp_path, monkeypatch):
+    path = str(tmp_path / "questions.json")
+    write_bank(path, ["What is DOM?"], 1_000_000)
+    monkeypatch.setattr(question_bank, "_bank", None)
+    monkeypatch.setattr(question_bank, "_reload_task", None)
+    monkeypatch.setattr(question_bank, "QUESTION_BANK_RELOAD_INTERVAL", 0)
+
+    async def run():
+        old = question_bank.get_question_bank(path)
+        write_bank(path, ["What is DOM?", "What is virtual DOM?"], 2_000_000)
+        served_during_reload = question_bank.get_question_bank(path)
+        await question_bank._reload_task
+        return old, served_during_reload, question_bank.get_question_bank(path)
+
+    old, during, new = asyncio.run(run())
+    assert during is old
+    assert len(new) == 2 and new.vectors is not None and len(new.vectors) == 2
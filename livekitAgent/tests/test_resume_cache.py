@@ -0,0 +1,156 @@
+"""
+getCandidateData against fakeredis and an in-memory stand-in for the Mongo
+resume collection. Run from the livekitAgent folder:
+    python -m pytest -q tests
+"""
+import asyncio
+
+import pytest
+from bson.objectid import ObjectId
+from fakeredis import FakeAsyncRedis
+
+from mongo import mongo_client
+from redisLogic import redis_client
+from redisLogic.redis_client import MISSING, ResumeCache, getCandidateData
+
+CANDIDATE_ID = "686b60d2a6601148142a968b"
+UNKNOWN_ID = "000000000000000000000000"
+
+
+class FakeCollection:
+    """The part of an async pymongo collection getCandidateDBData uses."""
+
+    def __init__(self, docs: list[dict]):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.find_one_calls = 0
+
+    async def find_one(self, query: dict):
+        self.find_one_calls += 1
+        return self.docs.get(query["_id"])
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    fake = FakeCollection([{"_id": ObjectId(CANDIDATE_ID), "resume": "John Smith - Software Developer"}])
+    monkeypatch.setattr(mongo_client, "get_collection", lambda name="resume": fake)
+    return fake
+
+
+@pytest.fixture
+def cache(monkeypatch, collection):
+    cache = ResumeCache(FakeAsyncRedis(decode_responses=True), mongo_client.getCandidateDBData)
+    monkeypatch.setattr(redis_client, "resume_cache", cache)
+    return cache
+
+
+def test_cache_hit_skips_mongo(cache, collection):
+    async def run():
+        await cache._redis.hset(CANDIDATE_ID, mapping={"resume": "cached resume"})
+        return await getCandidateData(CANDIDATE_ID)
+
+    assert asyncio.run(run()) == "cached resume"
+    assert collection.find_one_calls == 0
+    assert cache.stats.redis_hits == 1
+
+
+def test_miss_fills_from_mongo_and_caches(cache, collection):
+    async def run():
+        first = await getCandidateData(CANDIDATE_ID)
+        cache.invalidate(CANDIDATE_ID)  # force the second lookup past the in-process cache
+        second = await getCandidateData(CANDIDATE_ID)
+        return first, second, await cache._redis.hget(CANDIDATE_ID, "resume"), await cache._redis.ttl(CANDIDATE_ID)
+
+    first, second, stored, ttl = asyncio.run(run())
+    assert first == second == stored == "John Smith - Software Developer"
+    assert 0 < ttl <= cache._ttl
+    assert collection.find_one_calls == 1
+    assert cache.stats.redis_hits == 1
+
+
+def test_awaitable_candidate_id(cache):
+    async def run():
+        async def resolve_id():
+            await asyncio.sleep(0)
+            return CANDIDATE_ID
+        return await getCandidateData(asyncio.create_task(resolve_id()))
+
+    assert asyncio.run(run()) == "John Smith - Software Developer"
+
+
+def test_unknown_id_is_negative_cached(cache, collection):
+    async def run():
+        first = await getCandidateData(UNKNOWN_ID)
+        cache.invalidate(UNKNOWN_ID)
+        second = await getCandidateData(UNKNOWN_ID)
+        return first, second, await cache._redis.hget(UNKNOWN_ID, "resume"), await cache._redis.ttl(UNKNOWN_ID)
+
+    first, second, stored, ttl = asyncio.run(run())
+    assert first is None and second is None
+    assert stored == MISSING
+    assert 0 < ttl <= cache._negative_ttl
+    assert collection.find_one_calls == 1
+
+
+def test_unknown_id_leaves_process_cache_with_negative_ttl(monkeypatch, collection):
+    cache = ResumeCache(FakeAsyncRedis(decode_responses=True), mongo_client.getCandidateDBData, negative_ttl=60, l1_ttl=300)
+    asyncio.run(cache.get(UNKNOWN_ID))
+    assert cache._l1_get(UNKNOWN_ID) == MISSING
+    later = redis_client.time.monotonic() + 61
+    monkeypatch.setattr(redis_client.time, "monotonic", lambda: later)
+    assert cache._l1_get(UNKNOWN_ID) is None
+
+
+def test_mongo_error_is_not_cached(cache, collection):
+    async def failing_find_one(query):
+        raise ConnectionError("mongo down")
+
+    async def run():
+        collection.find_one = failing_find_one
+        with pytest.raises(ConnectionError):
+            await getCandidateData(CANDIDATE_ID)
+        stored = await cache._redis.hget(CANDIDATE_ID, "resume")
+        del collection.find_one  # back to the working lookup
+        return stored, await getCandidateData(CANDIDATE_ID)
+
+    stored, resume = asyncio.run(run())
+    assert stored is None
+    assert resume == "John Smith - Software Developer"
+
+
+def slow_find_one(collection, seconds: float):
+    async def find_one(query):
+        collection.find_one_calls += 1
+        await asyncio.sleep(seconds)
+        return collection.docs.get(query["_id"])
+    return find_one
+
+
+def test_concurrent_misses_fetch_once(cache, collection):
+    # A second worker: its own process cache, the same Redis
+    other = ResumeCache(cache._redis, mongo_client.getCandidateDBData)
+    collection.find_one = slow_find_one(collection, 0.2)
+
+    async def run():
+        return await asyncio.gather(*(c.get(CANDIDATE_ID) for c in (cache, cache, cache, other, other)))
+
+    assert set(asyncio.run(run())) == {"John Smith - Software Developer"}
+    assert collection.find_one_calls == 1
+    assert cache.stats.coalesced == 2 and other.stats.coalesced == 1
+    # One worker filled from Mongo, the other waited on its lock and read Redis
+    assert cache.stats.db_fetches + other.stats.db_fetches == 1
+    assert cache.stats.redis_hits + other.stats.redis_hits == 1
+
+
+def test_fill_keeps_a_lock_taken_over_after_expiry(cache, collection, monkeypatch):
+    monkeypatch.setattr(redis_client, "LOCK_TIMEOUT", 0.05)
+    collection.find_one = slow_find_one(collection, 0.2)
+    lock_key = f"{CANDIDATE_ID}:fill-lock"
+
+    async def run():
+        fill = asyncio.create_task(cache.get(CANDIDATE_ID))
+        await asyncio.sleep(0.1)  # our lock has expired by now; another worker takes it
+        assert await cache._redis.set(lock_key, "other-worker", nx=True, px=5000)
+        await fill
+        return await cache._redis.get(lock_key)
+
+    assert asyncio.run(run()) == "other-worker"
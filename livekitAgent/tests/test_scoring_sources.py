@@ -0,0 +1,93 @@
+"""
+The scoring pipeline reads back what every transcript sink backend wrote.
+Run from the livekitAgent folder:
+    python -m pytest -q tests
+"""
+import asyncio
+
+from fakeredis import FakeAsyncRedis
+
+from scoring.pipeline import load_mongo_transcripts, load_redis_transcripts, load_transcript
+from transcript.transcript_sink import FileBackend, MongoBackend, RedisStreamBackend
+
+RECORDS = {
+    "room-done": [
+        {"ts": 1.0, "type": "message", "role": "assistant", "content": "What is DOM?"},
+        {"ts": 2.0, "type": "qna", "question": "What is DOM?", "answer": "A tree of the page."},
+        {"ts": 3.0, "type": "qna", "question": "What is hoisting?", "answer": "Declarations move up."},
+        {"ts": 4.0, "type": "end", "candidate_id": "candidate-1"},
+    ],
+    "room-open": [
+        {"ts": 1.5, "type": "qna", "question": "What is a closure?", "answer": "A function and its scope."},
+    ],
+}
+
+
+class FakeCursor:
+    def __init__(self, docs: list[dict]):
+        self.docs = docs
+
+    def sort(self, keys):
+        for key, direction in reversed(keys):
+            self.docs.sort(key=lambda doc: doc[key], reverse=direction < 0)
+        return self
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    """insert_many and find, as the transcript backend and the pipeline use them."""
+
+    def __init__(self):
+        self.docs: list[dict] = []
+
+    async def insert_many(self, docs, ordered=True):
+        self.docs.extend(dict(doc) for doc in docs)
+
+    def find(self, query: dict, projection: dict):
+        types = query["type"]["$in"]
+        return FakeCursor([dict(doc) for doc in self.docs if doc["type"] in types])
+
+
+async def write_all(backend):
+    # Interleaved, as sessions running side by side write them
+    await backend.write("room-done", RECORDS["room-done"][:2])
+    await backend.write("room-open", RECORDS["room-open"])
+    await backend.write("room-done", RECORDS["room-done"][2:])
+
+
+def check(interviews):
+    by_id = {i.session_id: i for i in interviews}
+    done, open_ = by_id["room-done"], by_id["room-open"]
+    assert done.complete and done.candidate_id == "candidate-1"
+    assert [t["question"] for t in done.turns] == ["What is DOM?", "What is hoisting?"]
+    assert not open_.complete and len(open_.turns) == 1
+
+
+def test_file_backend(tmp_path):
+    backend = FileBackend(str(tmp_path))
+    asyncio.run(write_all(backend))
+    check([load_transcript(backend.path_for(session_id)) for session_id in RECORDS])
+
+
+def test_redis_backend():
+    async def run():
+        client = FakeAsyncRedis(decode_responses=True)
+        await write_all(RedisStreamBackend(client))
+        return await load_redis_transcripts(client)
+
+    check(asyncio.run(run()))
+
+
+def test_mongo_backend():
+    async def run():
+        collection = FakeCollection()
+        await write_all(MongoBackend(collection))
+        return await load_mongo_transcripts(collection)
+
+    check(asyncio.run(run()))
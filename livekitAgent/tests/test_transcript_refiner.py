@@ -0,0 +1,28 @@
+from Agent.transcript_refiner import StreamingRefiner, clean, refine
+
+
+def stream(*segments: str):
+    refiner = StreamingRefiner()
+    for segment in segments:
+        refiner.feed(segment)
+    return refiner.finish(" ".join(segments))
+
+
+def test_filler_across_segments_leaves_no_comma():
+    result = stream("I deployed it with,", "uh, Docker and it worked.")
+    assert result.text == refine("I deployed it with, uh, Docker and it worked.").text == "I deployed it with Docker and it worked."
+    assert result.confident
+
+
+def test_streaming_matches_whole_transcript():
+    text = "So basically, a closure is a function that, uh, remembers the the variables. Um, it is it is useful."
+    words = text.split()
+    for cut in range(1, len(words)):
+        result = stream(" ".join(words[:cut]), " ".join(words[cut:]))
+        assert (result.text, result.confident) == (refine(text).text, refine(text).confident)
+
+
+def test_repeat_is_whole_tokens_only():
+    assert clean("I worked at at&t") == "I worked at at&t"
+    assert clean("we used node node.js") == "we used node node.js"
+    assert clean("the the cache, I think I think") == "the cache, I think"
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Optional, Protocol
+from config.config import (
+    TRANSCRIPT_BACKEND,
+    TRANSCRIPT_DIR,
+    TRANSCRIPT_BATCH_SIZE,
+    TRANSCRIPT_FLUSH_INTERVAL,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("transcript_sink.py")
+
+
+#----------------------------Backends--------------------------------
+class TranscriptBackend(Protocol):
+    async def write(self, session_id: str, records: list[dict]) -> None: ...
+
+
+class FileBackend:
+    """Appends records as JSON lines to <directory>/<session_id>.jsonl."""
+
+    def __init__(self, directory: str = TRANSCRIPT_DIR):
+        self.directory = directory
+
+    def path_for(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}.jsonl")
+
+    def _append(self, session_id: str, lines: str):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path_for(session_id), "a", encoding="utf-8") as fp:
+            fp.write(lines)
+
+    async def write(self, session_id: str, records: list[dict]):
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        await asyncio.to_thread(self._append, session_id, lines)
+
+
+class RedisStreamBackend:
+    """XADDs each record to the stream transcript:<session_id>."""
+
+    def __init__(self, client=None):
+        if client is None:
+            from redisLogic.redis_client import client
+        self.client = client
+
+    async def write(self, session_id: str, records: list[dict]):
+        async with self.client.pipeline(transaction=False) as pipe:
+            for record in records:
+                pipe.xadd(f"transcript:{session_id}", {"record": json.dumps(record, ensure_ascii=False)})
+            await pipe.execute()
+
+
+class MongoBackend:
+    """Bulk-inserts records into the transcripts collection."""
+
+    def __init__(self, collection=None):
+        if collection is None:
+            from mongo.mongo_client import get_collection
+            collection = get_collection("transcripts")
+        self.collection = collection
+
+    async def write(self, session_id: str, records: list[dict]):
+        await self.collection.insert_many(
+            [{"session_id": session_id, **record} for record in records],
+            ordered=False,
+        )
+
+
+BACKENDS = {
+    "file": FileBackend,
+    "redis": RedisStreamBackend,
+    "mongo": MongoBackend,
+}
+
+
+#----------------------------Sink--------------------------------
+class TranscriptSink:
+    """
+    Per-session transcript writer.
+
+    `append` only queues the record; a background task batches queued records
+    and hands them to the backend, off the turn's critical path. `aclose`
+    drains whatever is left, so register it as a shutdown callback.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        backend: Optional[TranscriptBackend] = None,
+        batch_size: int = TRANSCRIPT_BATCH_SIZE,
+        flush_interval: float = TRANSCRIPT_FLUSH_INTERVAL,
+    ):
+        self.session_id = session_id
+        self.backend = backend or BACKENDS[TRANSCRIPT_BACKEND]()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def start(self):
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+
+    def append(self, record: dict):
+        if self._closed:
+            logger.warning(f"Dropping transcript record for closed session {self.session_id}")
+            return
+        self._queue.put_nowait({"ts": time.time(), **record})
+
+    async def _write(self, batch: list[dict]):
+        try:
+            await self.backend.write(self.session_id, batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} transcript records: {e}")
+
+    async def _run(self):
+        while True:
+            record = await self._queue.get()
+            if record is None:
+                return
+            batch = [record]
+            deadline = asyncio.get_running_loop().time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if record is None:
+                    await self._write(batch)
+                    return
+                batch.append(record)
+            await self._write(batch)
+
+    async def aclose(self):
+        """Flush everything queued so far and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is None:
+            # Never started; write out anything appended anyway
+            batch = []
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if batch:
+                await self._write(batch)
+            return
+        self._queue.put_nowait(None)
+        await self._writer